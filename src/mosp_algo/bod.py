@@ -1,10 +1,13 @@
-from typing import Dict, List, Type
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+from mosp_algo.cost_provider import CostProvider, SliceCosts
 from mosp_algo.graph import Graph
+from mosp_algo.indexed_graph import IndexedGraph
 from mosp_algo.pareto_set import ParetoSet, BiObjSolution
 from mosp_algo.search_tree_pqd import SearchTreePQD, State
 from collections import defaultdict
 
-def bod(search_graph: Graph, start_node: int, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Dict[int, ParetoSet]:
+def bod(search_graph: Graph, start_node: int, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD,
+        pareto_set_cls: Type[ParetoSet] = ParetoSet) -> Dict[int, ParetoSet]:
     """
     Bi-objective Dijkstra algorithm to find Pareto-optimal solutions set for each node.
 
@@ -12,29 +15,197 @@ def bod(search_graph: Graph, start_node: int, search_tree_cls: Type[SearchTreePQ
         search_graph (Graph): Graph to search.
         start_node (int): Starting node for the search.
         search_tree_cls (Type): Type of search tree to use (default: SearchTreePQD).
+        pareto_set_cls (Type): Type of Pareto set collecting the solutions of every node (default: ParetoSet).
 
     Returns:
         Dict[int, ParetoSet]: Pareto-optimal solutions for all vertices of the search graph.
     """
-    solutions: Dict[int, ParetoSet] = defaultdict(ParetoSet)
+    solutions: Dict[int, ParetoSet] = defaultdict(pareto_set_cls)
+    for state in bod_settled_states(search_graph, start_node, search_tree_cls):
+        solutions[state.node].add_solution(BiObjSolution(state, (state.g1, state.g2)))
+
+    return solutions
+
+def bod_settled_states(search_graph: Graph, start_node: int, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Iterator[State]:
+    """
+    Bi-objective Dijkstra algorithm yielding states as soon as they are settled.
+
+    States are popped in lexicographical order, so every state that passes the g2_min check
+    is a final Pareto-optimal solution for its node. The search only advances when the
+    consumer asks for the next state, which gives natural backpressure.
+
+    Parameters:
+        search_graph (Graph): Graph to search.
+        start_node (int): Starting node for the search.
+        search_tree_cls (Type): Type of search tree to use (default: SearchTreePQD).
+
+    Yields:
+        State: Settled search state; the path can be restored with construct_path.
+    """
     g2_min: Dict[int, float] = defaultdict(lambda: float('inf'))
     start_state = State(node=start_node, g1=0, g2=0, parent=None)
-    search_tree = search_tree_cls()
-    search_tree.add_to_open(start_state)
+    with search_tree_cls() as search_tree:
+        search_tree.add_to_open(start_state)
 
-    while not search_tree.open_is_empty():
-        cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
-        if cur_state.g2 >= g2_min[cur_state.node]:
-            continue
-        g2_min[cur_state.node] = cur_state.g2
-        solutions[cur_state.node].add_solution(BiObjSolution(cur_state, (cur_state.g1, cur_state.g2)))
-        for neighbour_node, costs in search_graph.get_neighbors(cur_state.node):
-            for cost in costs:
-                neighbour_g1 = cur_state.g1 + cost[0]
-                neighbour_g2 = cur_state.g2 + cost[1]
-                y = State(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2, parent=cur_state)
-                if y.g2 >= g2_min[neighbour_node]:
+        while not search_tree.open_is_empty():
+            cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
+            if cur_state.g2 >= g2_min[cur_state.node]:
+                continue
+            g2_min[cur_state.node] = cur_state.g2
+            yield cur_state
+            for neighbour_node, costs in search_graph.get_neighbors(cur_state.node):
+                for cost in costs:
+                    neighbour_g1 = cur_state.g1 + cost[0]
+                    neighbour_g2 = cur_state.g2 + cost[1]
+                    y = State(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2, parent=cur_state)
+                    if y.g2 >= g2_min[neighbour_node]:
+                        continue
+                    search_tree.add_to_open(y)
+
+def bod_iter(search_graph: Graph, start_node: int, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Iterator[Tuple[Any, float, float, Optional[Any]]]:
+    """
+    Streaming version of bod: yields Pareto-optimal solutions one by one as they are settled.
+
+    Parameters:
+        search_graph (Graph): Graph to search.
+        start_node (int): Starting node for the search.
+        search_tree_cls (Type): Type of search tree to use (default: SearchTreePQD).
+
+    Yields:
+        Tuple: (node, g1, g2, parent) where parent is the previous node on the path (None for start_node).
+    """
+    for state in bod_settled_states(search_graph, start_node, search_tree_cls):
+        parent = state.parent
+        yield state.node, state.g1, state.g2, (parent.node if parent is not None else None)
+
+
+def start_only_solutions(start_node, pareto_set_cls: Type[ParetoSet] = ParetoSet) -> Dict[Any, ParetoSet]:
+    """
+    Result of a search from a vertex the graph does not contain: as with bod, only the start itself at (0, 0).
+    """
+    solutions: Dict[Any, ParetoSet] = defaultdict(pareto_set_cls)
+    solutions[start_node].add_solution(BiObjSolution(State(node=start_node, g1=0, g2=0, parent=None), (0, 0)))
+    return solutions
+
+
+def bod_indexed(search_graph: IndexedGraph, start_node, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD,
+                pareto_set_cls: Type[ParetoSet] = ParetoSet) -> Dict[Any, ParetoSet]:
+    """
+    Bi-objective Dijkstra algorithm over a frozen graph with dense vertex indices.
+
+    g2_min and the settled solutions are kept in preallocated per-index lists, so the inner loop
+    does no dict lookups. Search states in the open list hold vertex indices; the settled states
+    returned in the Pareto sets hold external vertex ids, so construct_path works as with bod.
+
+    Parameters:
+        search_graph (IndexedGraph): Frozen graph to search (see Graph.freeze).
+        start_node: External id of the starting node.
+        search_tree_cls (Type): Type of search tree to use (default: SearchTreePQD).
+        pareto_set_cls (Type): Type of Pareto set collecting the solutions of every node (default: ParetoSet).
+
+    Returns:
+        Dict[Any, ParetoSet]: Pareto-optimal solutions for all reached vertices, keyed by external id.
+    """
+    node_ids = search_graph.node_ids
+    offsets, targets = search_graph.offsets, search_graph.targets
+    costs1, costs2 = search_graph.costs1, search_graph.costs2
+    g2_min: List[float] = [float('inf')] * len(node_ids)
+    settled: List[Optional[List[State]]] = [None] * len(node_ids)
+    start_index = search_graph.node_index.get(start_node)
+    if start_index is None:
+        return start_only_solutions(start_node, pareto_set_cls)
+    with search_tree_cls() as search_tree:
+        search_tree.add_to_open(State(node=start_index, g1=0, g2=0, parent=None))
+
+        while not search_tree.open_is_empty():
+            cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
+            index = cur_state.node
+            if cur_state.g2 >= g2_min[index]:
+                continue
+            g2_min[index] = cur_state.g2
+            state = State(node=node_ids[index], g1=cur_state.g1, g2=cur_state.g2, parent=cur_state.parent)
+            if settled[index] is None:
+                settled[index] = [state]
+            else:
+                settled[index].append(state)
+            for edge in range(offsets[index], offsets[index + 1]):
+                neighbour_index = targets[edge]
+                neighbour_g2 = cur_state.g2 + costs2[edge]
+                if neighbour_g2 >= g2_min[neighbour_index]:
                     continue
-                search_tree.add_to_open(y)
+                search_tree.add_to_open(State(node=neighbour_index, g1=cur_state.g1 + costs1[edge], g2=neighbour_g2, parent=state))
+
+    solutions: Dict[Any, ParetoSet] = defaultdict(pareto_set_cls)
+    for index, states in enumerate(settled):
+        if states is None:
+            continue
+        pareto_set = solutions[node_ids[index]]
+        for state in states:
+            pareto_set.add_solution(BiObjSolution(state, (state.g1, state.g2)))
+    return solutions
+
+
+def bod_dynamic(search_graph: IndexedGraph, start_node, cost_provider: CostProvider, departure_time: float = 0.0,
+                search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Dict[Any, ParetoSet]:
+    """
+    Bi-objective Dijkstra algorithm with time-dependent edge costs (see mosp_algo.cost_provider).
 
+    g1 is the travel time: a state leaves its node at departure_time + g1 and edge costs are taken from
+    the time slice of that moment. Every waiting alternative of the provider (entering the edge when a
+    later slice starts) is pushed as a state of its own, unless entering the edge immediately dominates it.
+    Slice costs are fetched from the provider once per slice and cached for the search, so expanding
+    a state reads plain arrays instead of calling the provider per edge.
+
+    Parameters:
+        search_graph (IndexedGraph): Frozen graph to search (see Graph.freeze).
+        start_node: External id of the starting node.
+        cost_provider (CostProvider): Edge costs over the CSR edges of search_graph.
+        departure_time (float): Time of leaving start_node.
+        search_tree_cls (Type): Type of search tree to use (default: SearchTreePQD).
+
+    Returns:
+        Dict[Any, ParetoSet]: Pareto-optimal solutions for all reached vertices, keyed by external id.
+    """
+    node_ids = search_graph.node_ids
+    offsets, targets = search_graph.offsets, search_graph.targets
+    slices_cache: Dict[int, SliceCosts] = {}
+    g2_min: List[float] = [float('inf')] * len(node_ids)
+    solutions: Dict[Any, ParetoSet] = defaultdict(ParetoSet)
+    start_index = search_graph.node_index.get(start_node)
+    if start_index is None:
+        return start_only_solutions(start_node)
+    with search_tree_cls() as search_tree:
+        search_tree.add_to_open(State(node=start_index, g1=0, g2=0, parent=None))
+
+        while not search_tree.open_is_empty():
+            cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
+            index = cur_state.node
+            if cur_state.g2 >= g2_min[index]:
+                continue
+            g2_min[index] = cur_state.g2
+            state = State(node=node_ids[index], g1=cur_state.g1, g2=cur_state.g2, parent=cur_state.parent)
+            solutions[state.node].add_solution(BiObjSolution(state, (state.g1, state.g2)))
+
+            time = departure_time + cur_state.g1
+            time_slice = cost_provider.time_slice(time)
+            costs = slices_cache.get(time_slice)
+            if costs is None:
+                costs = slices_cache[time_slice] = cost_provider.slice_costs(time_slice)
+            costs1, costs2, wait_offsets, wait_arrivals, wait_costs2 = costs
+            for edge in range(offsets[index], offsets[index + 1]):
+                neighbour_index = targets[edge]
+                arrival, cost2 = time + costs1[edge], costs2[edge]
+                neighbour_g2 = cur_state.g2 + cost2
+                if neighbour_g2 < g2_min[neighbour_index]:
+                    search_tree.add_to_open(State(node=neighbour_index, g1=arrival - departure_time, g2=neighbour_g2, parent=state))
+                if wait_offsets is None:
+                    continue
+                for position in range(wait_offsets[edge], wait_offsets[edge + 1]):
+                    wait_arrival, wait_cost2 = wait_arrivals[position], wait_costs2[position]
+                    if wait_arrival >= arrival and wait_cost2 >= cost2:  # entering the edge immediately is at least as good
+                        continue
+                    neighbour_g2 = cur_state.g2 + wait_cost2
+                    if neighbour_g2 >= g2_min[neighbour_index]:
+                        continue
+                    search_tree.add_to_open(State(node=neighbour_index, g1=wait_arrival - departure_time, g2=neighbour_g2, parent=state))
     return solutions
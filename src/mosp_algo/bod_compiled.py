@@ -0,0 +1,142 @@
+import heapq
+import weakref
+from collections import defaultdict
+from typing import Any, Dict, Tuple, Type, Union
+
+from mosp_algo.bod import bod_indexed, start_only_solutions
+from mosp_algo.graph import Graph
+from mosp_algo.indexed_graph import IndexedGraph
+from mosp_algo.pareto_set import BiObjSolution, ParetoSet
+from mosp_algo.search_tree_pqd import SearchTreePQD, State
+
+# Compiled fast path of the bi-objective Dijkstra algorithm.
+# The search runs over the CSR arrays of an IndexedGraph in a Numba-compiled kernel; settled states come back
+# as flat arrays (node index, g1, g2, index of the parent settled state) and are turned into State chains.
+# Numba and NumPy are optional: without them bod_accelerated falls back to the pure-Python bod_indexed.
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+_CSR_ARRAYS: 'weakref.WeakKeyDictionary[IndexedGraph, Tuple]' = weakref.WeakKeyDictionary()
+
+
+def _bod_kernel(offsets, targets, costs1, costs2, start_index):
+    """
+    BOD over CSR arrays. Open states are (g1, g2, node index, parent settled index) tuples in a binary heap.
+
+    Returns:
+        Tuple of arrays: node index, g1, g2 and parent settled index (-1 for the start) of every settled state,
+        in the order the states were settled.
+    """
+    g2_min = np.full(offsets.shape[0] - 1, np.inf)
+    capacity = 64
+    settled_nodes = np.empty(capacity, np.int64)
+    settled_g1 = np.empty(capacity, np.float64)
+    settled_g2 = np.empty(capacity, np.float64)
+    settled_parents = np.empty(capacity, np.int64)
+    settled_count = 0
+    open_heap = [(0.0, 0.0, start_index, -1)]
+
+    while len(open_heap) > 0:
+        g1, g2, node, parent = heapq.heappop(open_heap)  # Retrieve nodes in lexicographical order
+        if g2 >= g2_min[node]:
+            continue
+        g2_min[node] = g2
+        if settled_count == capacity:
+            capacity *= 2
+            grown_nodes = np.empty(capacity, np.int64)
+            grown_g1 = np.empty(capacity, np.float64)
+            grown_g2 = np.empty(capacity, np.float64)
+            grown_parents = np.empty(capacity, np.int64)
+            grown_nodes[:settled_count] = settled_nodes
+            grown_g1[:settled_count] = settled_g1
+            grown_g2[:settled_count] = settled_g2
+            grown_parents[:settled_count] = settled_parents
+            settled_nodes, settled_g1, settled_g2, settled_parents = grown_nodes, grown_g1, grown_g2, grown_parents
+        settled_nodes[settled_count] = node
+        settled_g1[settled_count] = g1
+        settled_g2[settled_count] = g2
+        settled_parents[settled_count] = parent
+        settled = settled_count
+        settled_count += 1
+
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbour = targets[edge]
+            neighbour_g2 = g2 + costs2[edge]
+            if neighbour_g2 >= g2_min[neighbour]:
+                continue
+            heapq.heappush(open_heap, (g1 + costs1[edge], neighbour_g2, neighbour, settled))
+
+    return settled_nodes[:settled_count], settled_g1[:settled_count], settled_g2[:settled_count], settled_parents[:settled_count]
+
+
+_compiled_kernel = njit(cache=True)(_bod_kernel) if NUMBA_AVAILABLE else None
+
+
+def _csr_arrays(search_graph: IndexedGraph) -> Tuple:
+    """
+    NumPy copies of the CSR arrays of a frozen graph, built once per graph.
+    """
+    arrays = _CSR_ARRAYS.get(search_graph)
+    if arrays is None:
+        arrays = (np.asarray(search_graph.offsets, dtype=np.int64), np.asarray(search_graph.targets, dtype=np.int64),
+                  np.asarray(search_graph.costs1, dtype=np.float64), np.asarray(search_graph.costs2, dtype=np.float64))
+        _CSR_ARRAYS[search_graph] = arrays
+    return arrays
+
+
+def bod_compiled(search_graph: IndexedGraph, start_node, kernel=None) -> Dict[Any, ParetoSet]:
+    """
+    Bi-objective Dijkstra algorithm in a compiled kernel. Requires NumPy and Numba.
+
+    Parameters:
+        search_graph (IndexedGraph): Frozen graph to search (see Graph.freeze).
+        start_node: External id of the starting node.
+        kernel: Kernel to run (default: the Numba-compiled one).
+
+    Returns:
+        Dict[Any, ParetoSet]: Pareto-optimal solutions for all reached vertices, keyed by external id.
+        Solution states are State chains with external ids, as returned by bod_indexed.
+    """
+    if kernel is None:
+        if not NUMBA_AVAILABLE:
+            raise ImportError("bod_compiled requires numba; use bod_accelerated to fall back to the Python implementation")
+        kernel = _compiled_kernel
+    start_index = search_graph.node_index.get(start_node)
+    if start_index is None:
+        return start_only_solutions(start_node)
+    offsets, targets, costs1, costs2 = _csr_arrays(search_graph)
+    nodes, g1s, g2s, parents = kernel(offsets, targets, costs1, costs2, start_index)
+
+    node_ids = search_graph.node_ids
+    states = []
+    solutions: Dict[Any, ParetoSet] = defaultdict(ParetoSet)
+    for node, g1, g2, parent in zip(nodes.tolist(), g1s.tolist(), g2s.tolist(), parents.tolist()):
+        state = State(node=node_ids[node], g1=g1, g2=g2, parent=states[parent] if parent >= 0 else None)
+        states.append(state)
+        # Settled states are non-dominated by construction, so the dominance checks of add_solution are skipped
+        solutions[state.node].solutions.add(BiObjSolution(state, (g1, g2)))
+    return solutions
+
+
+def bod_accelerated(search_graph: Union[Graph, IndexedGraph], start_node, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Dict[Any, ParetoSet]:
+    """
+    Runs the compiled kernel if Numba is available, otherwise bod_indexed. The kernel has its own open list,
+    so a custom search_tree_cls also selects the Python implementation.
+
+    Parameters:
+        search_graph (Graph or IndexedGraph): Graph to search; a Graph is frozen first.
+        start_node: External id of the starting node.
+        search_tree_cls (Type): Type of search tree to use (default: SearchTreePQD).
+    """
+    if isinstance(search_graph, Graph):
+        search_graph = search_graph.freeze()
+    if NUMBA_AVAILABLE and search_tree_cls is SearchTreePQD:
+        return bod_compiled(search_graph, start_node)
+    return bod_indexed(search_graph, start_node, search_tree_cls)
@@ -0,0 +1,161 @@
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_right
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from mosp_algo.indexed_graph import IndexedGraph
+
+# Edge cost providers for searches with dynamic (time- or load-dependent) costs.
+# Costs are given per time slice as arrays over the CSR edge positions of an IndexedGraph, so a search
+# looks up the slice once per expanded state and then reads plain arrays for all outgoing edges.
+# Objective 1 is the travel time: the state of a dynamic search departs its node at departure_time + g1.
+# Besides entering an edge immediately, a state may wait at its node for a later slice; these waiting
+# alternatives are separate (arrival, second cost) options, as waiting usually trades time for the second cost.
+
+
+class SliceCosts(NamedTuple):
+    """
+    Costs of all edges for departures within one time slice.
+
+    Attributes:
+        costs1, costs2: Travel time and second cost of every edge when entering it immediately.
+        wait_offsets: Waiting alternatives in CSR form (None if waiting never helps, e.g. for static costs):
+            the alternatives of edge e are positions wait_offsets[e]..wait_offsets[e+1]-1 of wait_arrivals and wait_costs2.
+        wait_arrivals, wait_costs2: Arrival at the end of the edge and second cost when waiting for a later slice
+            and entering the edge when it starts. Only Pareto-optimal alternatives are kept, by increasing arrival.
+    """
+    costs1: Sequence[float]
+    costs2: Sequence[float]
+    wait_offsets: Optional[Sequence[int]] = None
+    wait_arrivals: Optional[Sequence[float]] = None
+    wait_costs2: Optional[Sequence[float]] = None
+
+
+def _non_dominated(options: Iterable[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """
+    Pareto front of (arrival, second cost) options by increasing arrival, one option per cost vector.
+    """
+    front = []
+    for arrival, cost2 in sorted(options):
+        if not front or cost2 < front[-1][1]:
+            front.append((arrival, cost2))
+    return front
+
+
+class CostProvider(ABC):
+    """
+    Edge costs of an IndexedGraph as functions of the departure time.
+
+    Searches call slice_costs at most once per slice and cache the result for the rest of the search.
+    Dominance pruning stays exact if leaving a node later never offers an option that leaving it earlier
+    doesn't: a state that is earlier and cheaper can then follow every continuation of a later one.
+    Costs that don't depend on the departure time meet this as they are; providers with costs that change
+    over time offer the costs of later slices as waiting alternatives (see TimeSlicedCostProvider).
+    """
+
+    def time_slice(self, time: float) -> int:
+        """
+        Index of the time slice containing the given time (costs of a single-slice provider don't depend on time).
+        """
+        return 0
+
+    @abstractmethod
+    def slice_costs(self, time_slice: int) -> SliceCosts:
+        pass
+
+    def edge_options(self, edge: int, time: float) -> List[Tuple[float, float]]:
+        """
+        Pareto-optimal (travel time, second cost) options of an edge reached at the given time: entering it
+        immediately or waiting for a later slice. Travel times include the waiting and are ordered increasingly.
+        """
+        costs = self.slice_costs(self.time_slice(time))
+        options = [(time + costs.costs1[edge], costs.costs2[edge])]
+        if costs.wait_offsets is not None:
+            for position in range(costs.wait_offsets[edge], costs.wait_offsets[edge + 1]):
+                options.append((costs.wait_arrivals[position], costs.wait_costs2[position]))
+        return [(arrival - time, cost2) for arrival, cost2 in _non_dominated(options)]
+
+
+class StaticCostProvider(CostProvider):
+    """
+    The static costs of the graph.
+    """
+
+    def __init__(self, search_graph: IndexedGraph):
+        self.costs = SliceCosts(array('d', search_graph.costs1), array('d', search_graph.costs2))
+
+    def slice_costs(self, time_slice: int) -> SliceCosts:
+        return self.costs
+
+
+class TimeSlicedCostProvider(CostProvider):
+    """
+    Piecewise-constant costs: slice k starts at slice_starts[k] and lasts until the next slice starts
+    (the first slice also covers all earlier times, the last one all later times).
+
+    Costs of a later slice may be better in either objective (a drop of the travel time at a slice boundary
+    even lets a later departure overtake an earlier one), so every edge may also be entered when a later slice
+    starts: waiting in slice k for slice j > k arrives at slice_starts[j] + costs1[j][e] with second cost
+    costs2[j][e]. The Pareto-optimal waiting alternatives of every edge are precomputed per slice, so second
+    costs may change over time in any direction.
+    """
+
+    def __init__(self, search_graph: IndexedGraph, slice_starts: Sequence[float], slices_costs1: Sequence[Sequence[float]],
+                 slices_costs2: Sequence[Sequence[float]]):
+        if not slice_starts or len(slice_starts) != len(slices_costs1) or len(slice_starts) != len(slices_costs2):
+            raise ValueError("Every time slice needs a start time and two cost arrays")
+        if any(start >= next_start for start, next_start in zip(slice_starts, slice_starts[1:])):
+            raise ValueError("Time slice starts must be strictly increasing")
+        edges_count = search_graph.edges_count
+        if any(len(costs) != edges_count for costs in (*slices_costs1, *slices_costs2)):
+            raise ValueError(f"Cost arrays must have one value per edge ({edges_count})")
+        self.slice_starts = list(slice_starts)
+
+        self.slices: list = [None] * len(slice_starts)
+        wait_fronts: List[List[Tuple[float, float]]] = [[] for _ in range(edges_count)] # alternatives of slices after the current one
+        for time_slice in range(len(slice_starts) - 1, -1, -1):
+            costs1, costs2 = array('d', slices_costs1[time_slice]), array('d', slices_costs2[time_slice])
+            wait_offsets, wait_arrivals, wait_costs2 = array('q', [0]), array('d'), array('d')
+            for front in wait_fronts:
+                for arrival, cost2 in front:
+                    wait_arrivals.append(arrival)
+                    wait_costs2.append(cost2)
+                wait_offsets.append(len(wait_arrivals))
+            self.slices[time_slice] = SliceCosts(costs1, costs2, wait_offsets, wait_arrivals, wait_costs2)
+            # alternatives for the previous slice: waiting until this slice starts or later
+            start = slice_starts[time_slice]
+            for edge in range(edges_count):
+                wait_fronts[edge] = _non_dominated(wait_fronts[edge] + [(start + costs1[edge], costs2[edge])])
+
+    def time_slice(self, time: float) -> int:
+        return max(bisect_right(self.slice_starts, time) - 1, 0)
+
+    def slice_costs(self, time_slice: int) -> SliceCosts:
+        return self.slices[time_slice]
+
+
+class LoadDependentCostProvider(CostProvider):
+    """
+    Travel times growing with link load (BPR function): costs1 = base1 * (1 + alpha * (load / capacity) ** beta).
+    Second costs are the static ones. Costs are re-evaluated for all edges at once when the loads change.
+    """
+
+    def __init__(self, search_graph: IndexedGraph, loads: Sequence[float], capacities: Sequence[float], alpha: float = 0.15, beta: float = 4.0):
+        self.base_costs1 = array('d', search_graph.costs1)
+        self.costs2 = array('d', search_graph.costs2)
+        self.capacities = array('d', capacities)
+        if len(self.capacities) != len(self.base_costs1):
+            raise ValueError(f"Capacities must have one value per edge ({len(self.base_costs1)})")
+        self.alpha, self.beta = alpha, beta
+        self.update_loads(loads)
+
+    def update_loads(self, loads: Sequence[float]) -> None:
+        if len(loads) != len(self.base_costs1):
+            raise ValueError(f"Loads must have one value per edge ({len(self.base_costs1)})")
+        alpha, beta = self.alpha, self.beta
+        costs1 = array('d', (base * (1 + alpha * (load / capacity) ** beta)
+                             for base, load, capacity in zip(self.base_costs1, loads, self.capacities)))
+        self.costs = SliceCosts(costs1, self.costs2)
+
+    def slice_costs(self, time_slice: int) -> SliceCosts:
+        return self.costs
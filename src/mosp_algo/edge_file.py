@@ -0,0 +1,50 @@
+import struct
+import sys
+from array import array
+from typing import Iterable, Tuple
+
+# Binary edge-list format: magic, little-endian uint64 number of edges, then four little-endian columns:
+# int64 vertex1[n], int64 vertex2[n], float64 cost1[n], float64 cost2[n].
+
+MAGIC = b'MOSPEDG1'
+_HEADER = struct.Struct('<8sQ')
+_COLUMN_TYPECODES = ('q', 'q', 'd', 'd')
+
+
+def write_binary_edges(file_path: str, vertices1: Iterable[int], vertices2: Iterable[int], costs1: Iterable[float], costs2: Iterable[float]) -> None:
+    """
+    Writes edge columns to a file in the binary edge-list format.
+    """
+    columns = [column if isinstance(column, array) and column.typecode == typecode else array(typecode, column)
+               for column, typecode in zip((vertices1, vertices2, costs1, costs2), _COLUMN_TYPECODES)]
+    edges_count = len(columns[0])
+    if any(len(column) != edges_count for column in columns):
+        raise ValueError("All edge columns must have the same length")
+    with open(file_path, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, edges_count))
+        for column in columns:
+            if sys.byteorder == 'big':
+                column = array(column.typecode, column)
+                column.byteswap()
+            column.tofile(file)
+
+
+def read_binary_edges(file_path: str) -> Tuple[array, array, array, array]:
+    """
+    Reads edge columns from a file in the binary edge-list format.
+
+    Returns:
+    - Tuple of arrays: vertex1, vertex2, cost1, cost2 columns.
+    """
+    with open(file_path, 'rb') as file:
+        magic, edges_count = _HEADER.unpack(file.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"File {file_path} is not a binary edge list")
+        columns = []
+        for typecode in _COLUMN_TYPECODES:
+            column = array(typecode)
+            column.fromfile(file, edges_count)
+            if sys.byteorder == 'big':
+                column.byteswap()
+            columns.append(column)
+    return tuple(columns)
@@ -1,5 +1,19 @@
 from collections import defaultdict
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
+from mosp_algo.edge_file import read_binary_edges
+
+
+def non_dominated_costs(costs: Iterable[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """
+    Keeps only the non-dominated cost pairs, without duplicates, in lexicographical order.
+    """
+    result = []
+    best_cost2 = float('inf')
+    for cost1, cost2 in sorted(costs):
+        if cost2 < best_cost2:
+            result.append((cost1, cost2))
+            best_cost2 = cost2
+    return result
 
 
 class Graph:
@@ -13,7 +27,7 @@ class Graph:
     def __init__(self):
         self.adjacency_list: Dict[Any, Dict[Any, List[Tuple[float, float]]]] = defaultdict(dict)
 
-    def add_edge(self, vertex1, vertex2, cost1, cost2) -> None:
+    def add_edge(self, vertex1, vertex2, cost1, cost2, prune_dominated: bool = False) -> None:
         """
         Adds an edge to the graph.
 
@@ -22,18 +36,37 @@ class Graph:
         - vertex2: second vertex of the edge.
         - cost1: cost of edge from vertex1 to vertex2.
         - cost2: cost of edge from vertex2 to vertex1.
+        - prune_dominated: If True, the edge is not added when a parallel edge is at least as good in both costs,
+          and parallel edges dominated by the new one are removed.
         """
         if vertex2 not in self.adjacency_list[vertex1]:
             self.adjacency_list[vertex1][vertex2] = []
-            
-        self.adjacency_list[vertex1][vertex2].append((cost1, cost2))
 
-    def read_from_file(self, file_path: str) -> None:
+        costs = self.adjacency_list[vertex1][vertex2]
+        if prune_dominated:
+            if any(c1 <= cost1 and c2 <= cost2 for c1, c2 in costs):
+                return
+            costs[:] = [(c1, c2) for c1, c2 in costs if not (cost1 <= c1 and cost2 <= c2)]
+        costs.append((cost1, cost2))
+
+    def remove_edge(self, vertex1, vertex2) -> None:
+        """
+        Removes all edges from vertex1 to vertex2.
+
+        Raises:
+        - KeyError: If there is no edge from vertex1 to vertex2.
+        """
+        if vertex1 not in self.adjacency_list or vertex2 not in self.adjacency_list[vertex1]:
+            raise KeyError(f"Graph has no edge {vertex1} -> {vertex2}")
+        del self.adjacency_list[vertex1][vertex2]
+
+    def read_from_file(self, file_path: str, prune_dominated: bool = False) -> None:
         """
         Reads graph data from a file and updates the graph.
 
         Parameters:
         - file_path: Path to the file containing graph data in the format: vertex1 vertex2 cost1 cost2.
+        - prune_dominated: If True, the graph is normalized after loading (see normalize).
         """
         self.reset()
         try:
@@ -48,6 +81,36 @@ class Graph:
             print(f"File {file_path} not found.")
         except Exception as e:
             print(f"Error reading from file {file_path}: {e}")
+        if prune_dominated:
+            self.normalize()
+
+    def read_from_binary_file(self, file_path: str, prune_dominated: bool = False) -> None:
+        """
+        Reads graph data from a file in the binary edge-list format (see mosp_algo.edge_file) and updates the graph.
+
+        Parameters:
+        - file_path: Path to the binary edge-list file.
+        - prune_dominated: If True, the graph is normalized after loading (see normalize).
+        """
+        self.reset()
+        try:
+            for vertex1, vertex2, cost1, cost2 in zip(*read_binary_edges(file_path)):
+                self.add_edge(vertex1, vertex2, cost1, cost2)
+        except FileNotFoundError:
+            print(f"File {file_path} not found.")
+        except Exception as e:
+            print(f"Error reading from file {file_path}: {e}")
+        if prune_dominated:
+            self.normalize()
+
+    def normalize(self) -> None:
+        """
+        Removes duplicate and dominated parallel edges: for every vertex pair only the
+        non-dominated (cost1, cost2) pairs are kept. Pareto fronts found by search are not affected.
+        """
+        for neighbors in self.adjacency_list.values():
+            for neighbor, costs in neighbors.items():
+                neighbors[neighbor] = non_dominated_costs(costs)
 
     def get_neighbors(self, node) -> List[Tuple[Any, List[Tuple[float, float]]]]:
         """
@@ -57,6 +120,13 @@ class Graph:
             return []
         return list(self.adjacency_list[node].items())
     
+    def freeze(self) -> 'IndexedGraph':
+        """
+        Returns a frozen copy of the graph with vertices interned to dense integer indices.
+        """
+        from mosp_algo.indexed_graph import IndexedGraph
+        return IndexedGraph(self)
+
     def reset(self):
         self.adjacency_list = defaultdict(dict)
         
@@ -0,0 +1,116 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from mosp_algo.graph import Graph, non_dominated_costs
+from mosp_algo.search_tree_pqd import State
+
+# Edge of the original graph: (vertex1, vertex2, cost1, cost2)
+Edge = Tuple[Any, Any, float, float]
+# Expansion mapping of contracted edges: (vertex1, vertex2) -> {(cost1, cost2): original edges of the contracted path}
+Expansions = Dict[Tuple[Any, Any], Dict[Tuple[float, float], List[Edge]]]
+
+
+def contract_chains(graph: Graph, keep: Iterable[Any] = ()) -> Tuple[Graph, Expansions]:
+    """
+    Shrinks the graph by contracting degree-2 chains into multi-cost edges.
+
+    A vertex is contracted when it has both incoming and outgoing edges and is adjacent (in either
+    direction) to exactly two other vertices.
+    Every path x -> v -> y with x != y is replaced by an edge x -> y whose costs are the Pareto front
+    of the combined costs; U-turns x -> v -> x are dropped. Contracted vertices disappear from the
+    graph, so vertices used as sources or targets of queries must be listed in keep.
+    The graph is normalized first (see Graph.normalize); the source graph is not modified.
+
+    Parameters:
+    - graph: Graph to contract.
+    - keep: Vertices that must not be contracted.
+
+    Returns:
+    - Tuple[Graph, Expansions]: Contracted graph and the original edges (with their own costs) of every contracted edge.
+    """
+    keep = set(keep)
+    contracted = Graph()
+    incoming: Dict[Any, Set[Any]] = defaultdict(set)
+    for vertex1, vertex2, costs in graph.get_edges():
+        contracted.adjacency_list[vertex1][vertex2] = non_dominated_costs(costs)
+        incoming[vertex2].add(vertex1)
+    adjacency = contracted.adjacency_list
+    expansions: Expansions = {}
+
+    def adjacent(vertex) -> Set[Any]:
+        return (set(adjacency.get(vertex, ())) | incoming.get(vertex, set())) - {vertex}
+
+    worklist = list(set(adjacency) | set(incoming))
+    while worklist:
+        vertex = worklist.pop()
+        if vertex in keep or not adjacency.get(vertex) or not incoming.get(vertex):
+            continue
+        neighbours = adjacent(vertex)
+        if len(neighbours) != 2 or vertex in adjacency.get(vertex, ()):
+            continue
+
+        outgoing = adjacency.pop(vertex, {})
+        for predecessor in incoming.pop(vertex, set()):
+            in_costs = adjacency[predecessor].pop(vertex)
+            in_expansions = expansions.pop((predecessor, vertex), {})
+            for successor, out_costs in outgoing.items():
+                if successor == predecessor:
+                    continue
+                out_expansions = expansions.get((vertex, successor), {})
+                pair_expansions = expansions.get((predecessor, successor), {})
+                candidates = {cost: pair_expansions.get(cost) for cost in adjacency[predecessor].get(successor, [])}
+                for in_cost in in_costs:
+                    for out_cost in out_costs:
+                        cost = (in_cost[0] + out_cost[0], in_cost[1] + out_cost[1])
+                        if cost not in candidates:
+                            candidates[cost] = (in_expansions.get(in_cost) or [(predecessor, vertex, *in_cost)]) + \
+                                               (out_expansions.get(out_cost) or [(vertex, successor, *out_cost)])
+                front = non_dominated_costs(candidates)
+                adjacency[predecessor][successor] = front
+                incoming[successor].add(predecessor)
+                pair_expansions = {cost: candidates[cost] for cost in front if candidates[cost] is not None}
+                if pair_expansions:
+                    expansions[(predecessor, successor)] = pair_expansions
+                else:
+                    expansions.pop((predecessor, successor), None)
+        for successor in outgoing:
+            incoming[successor].discard(vertex)
+            expansions.pop((vertex, successor), None)
+        worklist.extend(neighbours)
+
+    return contracted, expansions
+
+
+def _contracted_edges(prev_state: State, state: State, expansions: Expansions) -> Optional[List[Edge]]:
+    """
+    Original edges of the contracted edge a search took from prev_state to state (None for an edge of the original graph).
+
+    The contracted edge is the one whose cost pair, added to the g-values of prev_state, gives exactly the g-values
+    of state: searches compute the g-values of a state by that same addition, so no tolerance is needed.
+    """
+    for cost, edges in expansions.get((prev_state.node, state.node), {}).items():
+        if prev_state.g1 + cost[0] == state.g1 and prev_state.g2 + cost[1] == state.g2:
+            return edges
+    return None
+
+
+def expand_path(path: List[State], expansions: Expansions) -> List[Any]:
+    """
+    Restores the vertices of the original graph for a path found in a contracted graph.
+
+    Parameters:
+    - path: Search states from the root to the end of the path (see construct_path).
+    - expansions: Expansion mapping returned by contract_chains.
+
+    Returns:
+    - List[Any]: Vertices of the path in the original graph.
+    """
+    if not path:
+        return []
+    vertices = [path[0].node]
+    for prev_state, state in zip(path, path[1:]):
+        edges = _contracted_edges(prev_state, state, expansions)
+        if edges:
+            vertices.extend(vertex2 for _, vertex2, _, _ in edges[:-1])
+        vertices.append(state.node)
+    return vertices
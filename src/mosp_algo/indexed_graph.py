@@ -0,0 +1,78 @@
+from typing import Any, Dict, List, Tuple
+from mosp_algo.graph import Graph
+
+
+class IndexedGraph:
+    """
+    Frozen directed graph whose vertices are interned to dense 0..N-1 indices.
+
+    Edges are stored in CSR form: the edges of vertex i are positions offsets[i]..offsets[i+1]-1
+    of targets, costs1 and costs2. Every parallel (cost1, cost2) pair is a separate edge.
+    Search internals work on indices only; external vertex ids are translated at the API boundary.
+
+    Attributes:
+        node_ids: External vertex id of every index.
+        node_index: Index of every external vertex id.
+        offsets, targets, costs1, costs2: CSR edge arrays.
+    """
+
+    def __init__(self, graph: Graph):
+        self.node_ids: List[Any] = []
+        self.node_index: Dict[Any, int] = {}
+        for vertex, neighbors in graph.adjacency_list.items():
+            self._intern(vertex)
+            for neighbor in neighbors:
+                self._intern(neighbor)
+
+        self.offsets: List[int] = [0]
+        self.targets: List[int] = []
+        self.costs1: List[float] = []
+        self.costs2: List[float] = []
+        for vertex in self.node_ids:
+            for neighbor, costs in graph.adjacency_list.get(vertex, {}).items():
+                neighbor_index = self.node_index[neighbor]
+                for cost1, cost2 in costs:
+                    self.targets.append(neighbor_index)
+                    self.costs1.append(cost1)
+                    self.costs2.append(cost2)
+            self.offsets.append(len(self.targets))
+
+    def _intern(self, vertex) -> int:
+        index = self.node_index.get(vertex)
+        if index is None:
+            index = len(self.node_ids)
+            self.node_index[vertex] = index
+            self.node_ids.append(vertex)
+        return index
+
+    @classmethod
+    def read_from_file(cls, file_path: str) -> 'IndexedGraph':
+        """
+        Loads a graph in Graph.read_from_file format and freezes it.
+        """
+        graph = Graph()
+        graph.read_from_file(file_path)
+        return cls(graph)
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edges_count(self) -> int:
+        return len(self.targets)
+
+    def get_neighbors(self, node) -> List[Tuple[Any, List[Tuple[float, float]]]]:
+        """
+        Gets the neighbors and their costs of a given vertex, using external vertex ids (same as Graph.get_neighbors).
+        """
+        index = self.node_index.get(node)
+        if index is None:
+            return []
+        neighbors: Dict[Any, List[Tuple[float, float]]] = {}
+        for edge in range(self.offsets[index], self.offsets[index + 1]):
+            neighbors.setdefault(self.node_ids[self.targets[edge]], []).append((self.costs1[edge], self.costs2[edge]))
+        return list(neighbors.items())
+
+    @property
+    def vertices(self) -> List[Any]:
+        return self.node_ids
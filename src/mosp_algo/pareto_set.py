@@ -1,6 +1,5 @@
 from abc import ABC, abstractmethod
 from typing import List, Set, Tuple, Union
-import matplotlib.pyplot as plt
 
 class Solution(ABC):
     @abstractmethod
@@ -120,6 +119,8 @@ class ParetoSet:
         Returns:
             plt.Figure: The matplotlib figure object representing the plot.
         """
+        import matplotlib.pyplot as plt # plotting is optional; keeps matplotlib out of the search import path
+
         if not self.solutions:
             print("Empty Pareto set. Nothing to visualize.")
             return None
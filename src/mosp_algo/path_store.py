@@ -0,0 +1,128 @@
+from array import array
+from typing import Any, Iterator, List, Optional
+
+# Shared-prefix store of search paths.
+# All paths settled by a search from one source form a tree rooted at the source; the store keeps that tree
+# in flat arrays (one entry per settled state: node, parent entry, first hop entry, g1, g2), so memory is
+# linear in the number of settled states and paths are never copied.
+
+ROOT = 0 # entry of the source
+
+
+class PathStore:
+    """
+    Tree of settled paths from a single source.
+
+    Attributes:
+        nodes: Graph node of every entry.
+        parents: Parent entry of every entry (-1 for the root).
+        first_hops: Entry of the first node after the source on the path of every entry (-1 for the root).
+        g1, g2: Path costs of every entry.
+    """
+
+    def __init__(self, source):
+        self.nodes: List[Any] = [source]
+        self.parents = array('q', [-1])
+        self.first_hops = array('q', [-1])
+        self.g1 = array('d', [0.0])
+        self.g2 = array('d', [0.0])
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def source(self):
+        return self.nodes[ROOT]
+
+    def add(self, parent: int, node, g1: float, g2: float) -> int:
+        """
+        Adds a path that extends the path of the parent entry by node.
+
+        Returns:
+        - int: Entry of the new path.
+        """
+        entry = len(self.nodes)
+        self.nodes.append(node)
+        self.parents.append(parent)
+        self.first_hops.append(entry if parent == ROOT else self.first_hops[parent])
+        self.g1.append(g1)
+        self.g2.append(g2)
+        return entry
+
+    def first_hop(self, entry: int):
+        """
+        First node after the source on the path of the entry (None for the root).
+        """
+        first_hop = self.first_hops[entry]
+        return None if first_hop < 0 else self.nodes[first_hop]
+
+    def iter_reversed(self, entry: int) -> Iterator[Any]:
+        """
+        Lazily yields the nodes of the path from its end back to the source.
+        """
+        parents, nodes = self.parents, self.nodes
+        while entry >= 0:
+            yield nodes[entry]
+            entry = parents[entry]
+
+    def iter_path(self, entry: int) -> Iterator[Any]:
+        """
+        Yields the nodes of the path from the source to its end. Only the entries of the path are collected
+        (in a compact array), not the nodes themselves.
+        """
+        entries = array('q')
+        parents = self.parents
+        while entry >= 0:
+            entries.append(entry)
+            entry = parents[entry]
+        nodes = self.nodes
+        for position in range(len(entries) - 1, -1, -1):
+            yield nodes[entries[position]]
+
+    def path(self, entry: int) -> List[Any]:
+        return list(self.iter_path(entry))
+
+
+class PathEntry:
+    """
+    Reference to a PathStore entry that can stand in for a settled State: it has node, g1, g2 and parent
+    (the entry of the previous node), so construct_path works on it, and next_node_in_path is the O(1) first hop.
+    """
+    __slots__ = ('store', 'entry')
+
+    def __init__(self, store: PathStore, entry: int):
+        self.store = store
+        self.entry = entry
+
+    @property
+    def node(self):
+        return self.store.nodes[self.entry]
+
+    @property
+    def g1(self) -> float:
+        return self.store.g1[self.entry]
+
+    @property
+    def g2(self) -> float:
+        return self.store.g2[self.entry]
+
+    @property
+    def parent(self) -> Optional['PathEntry']:
+        parent = self.store.parents[self.entry]
+        return None if parent < 0 else PathEntry(self.store, parent)
+
+    @property
+    def next_node_in_path(self):
+        return self.store.first_hop(self.entry)
+
+    def iter_path(self) -> Iterator[Any]:
+        return self.store.iter_path(self.entry)
+
+    def path(self) -> List[Any]:
+        return self.store.path(self.entry)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PathEntry) and self.store is other.store and self.entry == other.entry
+
+    def __hash__(self) -> int:
+        return hash((id(self.store), self.entry))
@@ -44,8 +44,9 @@ class State:
         )
 
     def __hash__(self) -> int:
-
-        return hash((self.node, self.g1, self.g2, self.h1, self.h2, self.parent))
+        # The parent is left out on purpose: hashing it would walk the whole ancestor chain on every lookup.
+        # Equal states still get equal hashes, since __eq__ compares the parent in addition to these fields.
+        return hash((self.node, self.g1, self.g2, self.h1, self.h2))
 
     def __lt__(self, other: 'State'):
         """
@@ -97,6 +98,18 @@ class SearchTreePQD:
     def __len__(self) -> int:
         return len(self.open) + len(self.closed)
 
+    def __enter__(self) -> 'SearchTreePQD':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Releases resources held outside of memory (nothing for the in-memory tree). Searches close their
+        search tree when they finish or when their generator is closed.
+        """
+
     def open_is_empty(self) -> bool:
         return not self.open
 
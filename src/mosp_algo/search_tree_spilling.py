@@ -0,0 +1,326 @@
+import struct
+import tempfile
+from heapq import heappop, heappush, merge
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from mosp_algo.search_tree_pqd import SearchTreePQD, State
+
+# Search tree with a bounded in-memory open list.
+# When the states held in memory exceed max_states_in_memory, the worse part of the heap is sorted and
+# written to an anonymous temporary file as a run of fixed-size records; runs are merged back in (f1, f2)
+# order as states are taken. A record is (g1, g2, h1, h2, node reference, link reference, state class):
+# the link is the field that ties a state to the rest of its path (the parent of a State, the first hop of
+# a stage #1 state, ...; see SPILLABLE_STATES). Node ids and links are interned into a table of the search
+# tree, so spilled states cost 56 bytes on disk. Table entries are counted by the spilled records that refer
+# to them and dropped when the last of them is read back, so the table holds at most two entries per spilled
+# state (far fewer in practice: node ids repeat and siblings share their parent). The entries are not open
+# states and are not counted in resident_states; interned_values reports their number.
+#
+# Runs are read back in blocks, and buffered records count against the cap together with the heap:
+# a run holds no records until it is first read, and blocks are sized so that the buffers of all runs
+# (also while runs are merged) take at most half of the cap.
+
+_RECORD = struct.Struct('<ddddqqq')
+Record = Tuple[float, float, float, float, int, int, int]
+_BY_ID = object() # marks keys of the interning table that are ids of interned states
+
+# State classes that can be spilled, with the attribute holding their link (None if they have none).
+# A spilled state is restored by calling the class with node, g and h values and the link by keyword.
+# Links that are states are interned by identity, other links (node ids, path store entries) by value.
+SPILLABLE_STATES: Dict[Type[State], Optional[str]] = {State: "parent"}
+
+
+def register_spillable_state(state_cls: Type[State], link: Optional[str]) -> None:
+    """
+    Allows states of state_cls to be spilled; link is the constructor keyword and attribute of its link.
+    """
+    SPILLABLE_STATES[state_cls] = link
+
+
+def _record_key(record: Record) -> Tuple[float, float]:
+    return record[0] + record[2], record[1] + record[3]
+
+
+class _Run:
+    """
+    Sorted run of records in a temporary file, read back in blocks on demand.
+    """
+
+    def __init__(self, file, records_count: int, block_records: int, head_key: Tuple[float, float]):
+        self.file = file
+        self.unread = records_count
+        self.block_records = block_records
+        self.buffer: List[Record] = []
+        self.position = 0
+        self.head_key: Optional[Tuple[float, float]] = head_key if records_count else None
+
+    @property
+    def buffered(self) -> int:
+        return len(self.buffer) - self.position
+
+    def _fill(self) -> None:
+        count = min(self.block_records, self.unread)
+        self.buffer = list(_RECORD.iter_unpack(self.file.read(count * _RECORD.size)))
+        self.position = 0
+        self.unread -= count
+
+    def pop(self) -> Record:
+        if self.position == len(self.buffer):
+            self._fill()
+        record = self.buffer[self.position]
+        self.position += 1
+        if self.position == len(self.buffer):
+            self.buffer, self.position = [], 0
+            if self.unread: # the next head is needed to order the runs
+                self._fill()
+        self.head_key = _record_key(self.buffer[self.position]) if self.buffered else None
+        return record
+
+    def __len__(self) -> int:
+        return self.buffered + self.unread
+
+    def records(self) -> Iterator[Record]:
+        while self.head_key is not None:
+            yield self.pop()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class SpillingSearchTree(SearchTreePQD):
+    """
+    Priority queue-based search tree that keeps at most max_states_in_memory open states in memory
+    (heap and run buffers together) and spills the rest to sorted runs in temporary files. Spilled states are
+    restored as objects of their own class, which must be registered in SPILLABLE_STATES.
+
+    Use SpillingSearchTree.configured(...) to get a class that can be passed as search_tree_cls.
+    """
+    max_states_in_memory: int = 1_000_000
+    tmp_dir: Optional[str] = None
+    block_records: Optional[int] = None # records read from a run at once (default: derived from the cap)
+    max_runs: int = 64 # runs are merged into one when there are more
+
+    def __init__(self, max_states_in_memory: Optional[int] = None, tmp_dir: Optional[str] = None):
+        super().__init__()
+        if max_states_in_memory is not None:
+            self.max_states_in_memory = max_states_in_memory
+        if tmp_dir is not None:
+            self.tmp_dir = tmp_dir
+        cap = self.max_states_in_memory
+        if self.block_records is None:
+            self.block_records = max(1, cap // (2 * (self.max_runs + 1)))
+        if cap < 4 * self.block_records:
+            raise ValueError(f"max_states_in_memory must be at least {4 * self.block_records} (4 run blocks)")
+        # buffers of all runs, including the one added before a merge, fit into half of the cap
+        self.runs_limit = min(self.max_runs, cap // (2 * self.block_records) - 1)
+        self.runs: Dict[int, _Run] = {}
+        self._run_heads: List[Tuple[float, float, int]] = [] # (f1, f2, run id) of the first record of every run
+        self._next_run_id = 0
+        self._buffered = 0 # records held in run buffers
+        self._values: List[Any] = [] # interned node ids and parent states
+        self._keys: List[Any] = [] # key of every entry in _refs
+        self._counts: List[int] = [] # spilled records referring to every entry
+        self._free_refs: List[int] = [] # references of dropped entries, reused first
+        self._refs: Dict[Any, int] = {} # node id, link value or (_BY_ID, id(state)) -> reference
+        self._state_classes: List[Tuple[Type[State], Optional[str]]] = [] # state class and link of every record class
+        self._class_refs: Dict[Type[State], int] = {}
+        self._dominating: List[State] = [] # filters of remove_worse_states, applied to spilled states when read
+        self.spilled_states = 0
+
+    @classmethod
+    def configured(cls, max_states_in_memory: int, tmp_dir: Optional[str] = None, **settings) -> Type['SpillingSearchTree']:
+        """
+        Returns a subclass with the given settings, to be passed as search_tree_cls (e.g. to bod_limited).
+        Other class settings (block_records, max_runs) can be overridden by keyword.
+        """
+        unknown = settings.keys() - {"block_records", "max_runs"}
+        if unknown:
+            raise TypeError(f"Unknown settings: {', '.join(sorted(unknown))}")
+        return type(cls.__name__, (cls,), {"max_states_in_memory": max_states_in_memory, "tmp_dir": tmp_dir, **settings})
+
+    def __len__(self) -> int:
+        return len(self.open) + sum(len(run) for run in self.runs.values()) + len(self.closed)
+
+    @property
+    def resident_states(self) -> int:
+        """
+        Open states held in memory: the heap and the run buffers.
+        """
+        return len(self.open) + self._buffered
+
+    @property
+    def interned_values(self) -> int:
+        """
+        Node ids and parent states kept in memory for spilled states.
+        """
+        return len(self._refs)
+
+    def __del__(self):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes (and so deletes) the temporary files of all runs and drops the spilled states.
+        Searches close their search tree when they finish; __del__ only covers trees used directly.
+        """
+        for run in getattr(self, "runs", {}).values():
+            run.close()
+        self.runs = {}
+        self._run_heads = []
+        self._buffered = 0
+        self._values, self._keys, self._counts, self._free_refs = [], [], [], []
+        self._refs = {}
+        self._state_classes, self._class_refs = [], {}
+
+    def open_is_empty(self) -> bool:
+        return not self.open and not self._run_heads
+
+    def add_to_open(self, state: State):
+        heappush(self.open, state)
+        self._enforce_cap()
+
+    def get_best_node_from_open(self) -> Optional[State]:
+        while True:
+            if self._run_heads and (not self.open or self._run_heads[0][:2] < (self.open[0].f1, self.open[0].f2)):
+                state = self._pop_from_runs()
+                self._enforce_cap() # reading the next block of a run may take the place of heap states
+                if any(better_state.is_dominates(state) for better_state in self._dominating):
+                    continue
+            elif self.open:
+                state = heappop(self.open)
+            else:
+                return None
+            if not self.was_expanded(state):
+                return state
+
+    def remove_worse_states(self, f1: int, f2: int):
+        super().remove_worse_states(f1, f2)
+        if self.runs:
+            self._dominating.append(State(None, f1, f2))
+
+    def _intern(self, key, value) -> int:
+        """
+        Returns the reference of value in the table, counting one more spilled record that uses it.
+        """
+        reference = self._refs.get(key)
+        if reference is None:
+            if self._free_refs:
+                reference = self._free_refs.pop()
+                self._values[reference], self._keys[reference] = value, key
+            else:
+                reference = len(self._values)
+                self._values.append(value)
+                self._keys.append(key)
+                self._counts.append(0)
+            self._refs[key] = reference
+        self._counts[reference] += 1
+        return reference
+
+    def _release(self, reference: int) -> Any:
+        """
+        Returns the value of a reference of a record read back, dropping it after its last record.
+        """
+        if reference < 0:
+            return None
+        value = self._values[reference]
+        self._counts[reference] -= 1
+        if not self._counts[reference]:
+            del self._refs[self._keys[reference]]
+            self._values[reference] = self._keys[reference] = None
+            self._free_refs.append(reference)
+        return value
+
+    def _class_ref(self, state_cls: Type[State]) -> int:
+        reference = self._class_refs.get(state_cls)
+        if reference is None:
+            if state_cls not in SPILLABLE_STATES:
+                raise TypeError(f"{self.__class__.__name__} can't spill {state_cls.__name__} states; register the class with register_spillable_state")
+            reference = self._class_refs[state_cls] = len(self._state_classes)
+            self._state_classes.append((state_cls, SPILLABLE_STATES[state_cls]))
+        return reference
+
+    def _encode(self, state: State) -> bytes:
+        class_ref = self._class_ref(type(state))
+        link = self._state_classes[class_ref][1]
+        value = None if link is None else getattr(state, link)
+        if value is None:
+            link_ref = -1
+        elif isinstance(value, State): # the table keeps the state alive while it is referred to, so its id stays unique
+            link_ref = self._intern((_BY_ID, id(value)), value)
+        else:
+            link_ref = self._intern(value, value)
+        return _RECORD.pack(state.g1, state.g2, state.h1, state.h2, self._intern(state.node, state.node), link_ref, class_ref)
+
+    def _decode(self, record: Record) -> State:
+        g1, g2, h1, h2, node_ref, link_ref, class_ref = record
+        state_cls, link = self._state_classes[class_ref]
+        value = self._release(link_ref)
+        links = {} if link is None else {link: value}
+        return state_cls(node=self._release(node_ref), g1=g1, g2=g2, h1=h1, h2=h2, **links)
+
+    def _enforce_cap(self) -> None:
+        if self.resident_states > self.max_states_in_memory:
+            self._spill()
+
+    def _spill(self) -> None:
+        """
+        Writes the worse part of the in-memory heap to a new run (a sorted list is a valid heap).
+        At most half of the memory left by the run buffers stays in the heap, so spills are not too frequent.
+        """
+        self.open.sort()
+        keep = min(len(self.open) // 2, max(self.max_states_in_memory - self._buffered, 0) // 2)
+        spilled = self.open[keep:]
+        if not spilled:
+            return
+        del self.open[keep:]
+        run_file = tempfile.TemporaryFile(dir=self.tmp_dir)
+        run_file.write(b''.join(self._encode(state) for state in spilled))
+        run_file.seek(0)
+        self._add_run(_Run(run_file, len(spilled), self.block_records, (spilled[0].f1, spilled[0].f2)))
+        self.spilled_states += len(spilled)
+        if len(self.runs) > self.runs_limit:
+            self._merge_runs()
+
+    def _add_run(self, run: _Run) -> None:
+        run_id = self._next_run_id
+        self._next_run_id += 1
+        self.runs[run_id] = run
+        self._push_run_head(run_id)
+
+    def _push_run_head(self, run_id: int) -> None:
+        run = self.runs[run_id]
+        if run.head_key is None:
+            self.runs.pop(run_id).close()
+        else:
+            heappush(self._run_heads, (*run.head_key, run_id))
+
+    def _pop_from_runs(self) -> State:
+        _, _, run_id = heappop(self._run_heads)
+        run = self.runs[run_id]
+        buffered = run.buffered
+        record = run.pop()
+        self._buffered += run.buffered - buffered
+        self._push_run_head(run_id)
+        return self._decode(record)
+
+    def _merge_runs(self) -> None:
+        """
+        Merges all runs into one, keeping the number of open files bounded.
+        Every run buffers at most one block while it is merged.
+        """
+        runs = list(self.runs.values())
+        merged_file = tempfile.TemporaryFile(dir=self.tmp_dir)
+        records_count = 0
+        head_key = None
+        for record in merge(*(run.records() for run in runs), key=_record_key):
+            if head_key is None:
+                head_key = _record_key(record)
+            merged_file.write(_RECORD.pack(*record))
+            records_count += 1
+        merged_file.seek(0)
+        for run in runs:
+            run.close()
+        self.runs = {}
+        self._run_heads = []
+        self._buffered = 0
+        self._add_run(_Run(merged_file, records_count, self.block_records, head_key))
@@ -0,0 +1,50 @@
+import argparse
+import time
+
+from mosp_task_generator.builders import TestBuildDirector, TopologyTestBuilder
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Generate seeded test maps for bi-objective search.')
+    parser.add_argument('output_file', type=str, help='Path to the output map file')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed')
+    parser.add_argument('--max-cost', type=int, default=100, help='Maximum edge cost (costs are integers from 1)')
+    parser.add_argument('--solutions', type=int, default=0, help='Number of reference solutions to compute with bod')
+    parser.add_argument('--binary', action='store_true', help='Write the map in the binary edge-list format')
+    topologies = parser.add_subparsers(dest='topology', required=True)
+
+    ring = topologies.add_parser('ring', help='Concentric rings with radial links')
+    ring.add_argument('--rings', type=int, required=True)
+    ring.add_argument('--ring-size', type=int, required=True)
+
+    corridor = topologies.add_parser('corridor', help='Parallel corridors with cross links')
+    corridor.add_argument('--corridors', type=int, required=True)
+    corridor.add_argument('--length', type=int, required=True)
+    corridor.add_argument('--cross-step', type=int, default=1)
+
+    bridge = topologies.add_parser('bridge', help='Two random clusters joined by bridges')
+    bridge.add_argument('--cluster-size', type=int, required=True)
+    bridge.add_argument('--edges-per-node', type=int, required=True)
+    bridge.add_argument('--bridges', type=int, default=1)
+
+    random_map = topologies.add_parser('random', help='Random directed graph')
+    random_map.add_argument('--nodes-count', type=int, required=True)
+    random_map.add_argument('--edges-per-node', type=int, required=True)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    common = {'output_file', 'seed', 'max_cost', 'solutions', 'binary', 'topology'}
+    topology_params = {name: value for name, value in vars(args).items() if name not in common}
+    topology_params['max_cost'] = args.max_cost
+    builder = TopologyTestBuilder(args.output_file, args.topology, topology_params, solutions_count=args.solutions,
+                                  seed=args.seed, binary=args.binary)
+    started = time.perf_counter()
+    TestBuildDirector(builder).construct_test()
+    print(f"{args.topology} map with {len(builder.edges)} edges written to {args.output_file} "
+          f"in {time.perf_counter() - started:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+import random
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from mosp_algo.bod import bod
+from mosp_algo.graph import Graph
+from mosp_algo.pareto_set import ParetoSet
+from mosp_algo.search_tree_pqd import construct_path
+from mosp_task_generator.topologies import TOPOLOGIES, EdgeList
+
+
+def reference_pareto_set(graph: Graph, start, stop) -> ParetoSet:
+    """
+    Ground-truth Pareto set for a test computed with bod.
+    Solutions keep their search states, so paths can be restored with construct_path.
+    """
+    return bod(graph, start).get(stop, ParetoSet())
+
+
+def format_solutions(start, stop, pareto_set: ParetoSet) -> str:
+    """
+    Formats a reference Pareto set: first line "start stop solutions_count",
+    then one line per solution "cost1 cost2 path...".
+    """
+    lines = [f"{start} {stop} {len(pareto_set.solutions)}"]
+    for solution in sorted(pareto_set.get_solutions(), key=lambda solution: solution.solution_values):
+        path = ' '.join(str(state.node) for state in construct_path(solution.solution_state))
+        lines.append(f"{solution.g1:.17g} {solution.g2:.17g} {path}")
+    return '\n'.join(lines)
+
+
+class Node:
+    def __init__(self, id) -> None:
+        self.id = id
+        self.connections = defaultdict(list)
+
+    def get_edge_costs(self, other_node: 'Node'):
+        return self.connections[other_node]
+
+    def have_connection(self, other_node: 'Node'):
+        return len(self.connections[other_node]) != 0
+
+    def __str__(self) -> str:
+        return f"Node: id={self.id}"
+
+
+class NodesGroup:
+    def __init__(self) -> None:
+        self.nodes = {} # Node id: node object
+
+    def add_node(self, node: Node, replace=False):
+        if node.id in self.nodes and replace is False:
+            return False
+        self.nodes[node.id] = node
+
+    def add_edge(self, first_node: 'Node', second_node: 'Node', *costs):
+        if first_node.id not in self.nodes or second_node.id not in self.nodes:
+            raise ValueError(f"NodesGroup does not contain one of the nodes: {first_node} {second_node}")
+        self.nodes[first_node.id].connections[second_node.id] = costs
+
+    def add_nodes(self, *nodes, replace=False):
+        for node in nodes:
+            if not isinstance(node, Node):
+                raise TypeError(f"Object {node} of type {type(node)} can't be added to NodesGroup")
+            if node.id in self.nodes and replace is False:
+                continue
+            self.nodes[node.id] = node
+
+    def delete_node(self, node: Node):
+        self.nodes.pop(node.id)
+
+    def __getitem__(self, key: int):
+        if not isinstance(key, int):
+            raise TypeError("NodesGroup can only be indexed by node id (int)")
+        if key not in self.nodes:
+            raise KeyError(f"NodesGroup has no node with id: {key}")
+        return self.nodes[key]
+
+    def __iter__(self):
+        return iter(self.nodes.values())
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def extend(self, other_nodes_group: 'NodesGroup'):
+        for node_id in other_nodes_group.nodes:
+            if node_id not in self.nodes:
+                self.nodes[node_id] = other_nodes_group[node_id]
+
+    def get_nodes(self):
+        return list(self.nodes.values())
+
+    def to_graph(self) -> Graph:
+        graph = Graph()
+        for node in self:
+            for neighbour_node, (cost1, cost2) in node.connections.items():
+                graph.add_edge(node.id, neighbour_node, cost1, cost2)
+        return graph
+
+
+class TestBuilder(ABC):
+    __test__ = False # not a pytest test class
+
+    @abstractmethod
+    def build_map(self):
+        pass
+
+    @abstractmethod
+    def build_solution(self):
+        pass
+
+    @abstractmethod
+    def build_test(self):
+        pass
+
+
+class TestBuildDirector:
+    __test__ = False
+
+    def __init__(self, builder: TestBuilder) -> None:
+        self.builder = builder
+
+    def construct_test(self):
+        self.builder.build_map()
+        self.builder.build_solution()
+        return self.builder.build_test()
+
+    def change_builder(self, new_builder: TestBuilder) -> None:
+        self.builder = new_builder
+
+
+class SimpleTestBuilder(TestBuilder):
+    """
+    Builds a test from a hand-made NodesGroup map. The test text consists of the reference solutions
+    (see format_solutions) followed by "nodes_count edges_count" and the edges.
+    """
+
+    def __init__(self, output_file_name: Optional[str] = None) -> None:
+        self.nodes_group = NodesGroup()
+        self.output_file_name = output_file_name
+        self.test_full_text = ""
+        self.solution_info = ""
+
+    def build_map(self):
+        pass
+
+    def build_solution(self):
+        pass
+
+    def build_test(self):
+        edges_formated = []
+        for node in self.nodes_group:
+            for edge_and_cost in node.connections.items():
+                edges_formated.append(f"{node.id} {edge_and_cost[0]} {' '.join(map(str, edge_and_cost[1]))}")
+        test_info = f"{len(self.nodes_group)} {len(edges_formated)}"
+
+        test_nodes_and_edges_info = "\n".join([test_info, *edges_formated])
+
+        self.test_full_text = "\n".join([self.solution_info, test_nodes_and_edges_info])
+        if self.output_file_name is not None:
+            with open(self.output_file_name, 'w') as file:
+                file.write(self.test_full_text)
+        return self.test_full_text
+
+    def get_test(self):
+        if not self.test_full_text:
+            raise ValueError("The test has not been built yet")
+        return self.test_full_text
+
+    def reset(self):
+        self.nodes_group = NodesGroup()
+        self.test_full_text = ""
+        self.solution_info = ""
+
+
+class RandomTestsBuilder(SimpleTestBuilder):
+    """
+    Random map with a reference solution between two random nodes computed with bod.
+    """
+
+    def __init__(self, output_file_name: Optional[str], nodes_count: int, edges_per_node_count: int, seed: Optional[int] = None, max_cost: int = 100) -> None:
+        super().__init__(output_file_name)
+        if edges_per_node_count > nodes_count:
+            raise ValueError("Number of edges of one node can't exceed the number of nodes")
+        self.nodes_count = nodes_count
+        self.edges_per_node_count = edges_per_node_count
+        self.max_cost = max_cost
+        self.rng = random.Random(seed)
+
+    def build_map(self):
+        for node_id in range(self.nodes_count):
+            self.nodes_group.add_node(Node(node_id))
+
+        for cur_node in self.nodes_group:
+            connections_count = self.rng.randint(0, self.edges_per_node_count)
+            choosed_nodes = self.rng.sample(self.nodes_group.get_nodes(), connections_count)
+            for neighbour_node in choosed_nodes:
+                cost1 = self.rng.randint(1, self.max_cost)
+                cost2 = self.rng.randint(1, self.max_cost)
+                self.nodes_group.add_edge(cur_node, neighbour_node, cost1, cost2)
+
+    def build_solution(self):
+        graph = self.nodes_group.to_graph()
+        for _ in range(16):
+            start, stop = self.rng.sample(list(self.nodes_group.nodes.keys()), 2)
+            pareto_set = reference_pareto_set(graph, start, stop)
+            if pareto_set.solutions:
+                break
+        self.solution_info = format_solutions(start, stop, pareto_set)
+
+
+class TopologyTestBuilder(TestBuilder):
+    """
+    Large-scale test builder on top of the column-oriented topology generators.
+    The map is written in the Graph.read_from_file format (or the binary edge-list format),
+    and reference solutions for random node pairs are written to "<output_file_name>.solutions".
+    """
+
+    def __init__(self, output_file_name: str, topology: str, topology_params: Dict[str, Any], solutions_count: int = 1,
+                 seed: Optional[int] = None, binary: bool = False) -> None:
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown topology: {topology}. Available: {', '.join(TOPOLOGIES)}")
+        self.output_file_name = output_file_name
+        self.topology = topology
+        self.topology_params = topology_params
+        self.solutions_count = solutions_count
+        self.binary = binary
+        self.rng = random.Random(seed)
+        self.edges: Optional[EdgeList] = None
+        self.solutions: List[Tuple[Any, Any, ParetoSet]] = []
+
+    def build_map(self):
+        self.edges = TOPOLOGIES[self.topology](seed=self.rng.randrange(2 ** 32), **self.topology_params)
+
+    def build_solution(self):
+        self.solutions = []
+        if self.solutions_count == 0 or len(self.edges) == 0:
+            return
+        graph = self.edges.to_graph()
+        vertices = list(graph.vertices)
+        for _ in range(self.solutions_count):
+            start = self.rng.choice(vertices)
+            all_solutions = bod(graph, start)
+            stop = self.rng.choice([vertex for vertex in all_solutions if vertex != start] or [start])
+            self.solutions.append((start, stop, all_solutions[stop]))
+
+    def build_test(self):
+        if self.binary:
+            self.edges.write_binary(self.output_file_name)
+        else:
+            self.edges.write_text(self.output_file_name)
+        if self.solutions:
+            with open(f"{self.output_file_name}.solutions", 'w') as file:
+                file.write('\n'.join(format_solutions(start, stop, pareto_set) for start, stop, pareto_set in self.solutions))
+                file.write('\n')
+        return self.output_file_name
@@ -0,0 +1,148 @@
+import random
+from array import array
+from typing import Callable, Dict, Iterable, Optional
+
+from mosp_algo.edge_file import write_binary_edges
+from mosp_algo.graph import Graph
+
+# Seeded topology generators. Edges are produced column by column into typed arrays, so maps with
+# millions of edges are generated without creating a Python object per node or per edge.
+
+
+class EdgeList:
+    """
+    Column-oriented list of directed edges.
+
+    Attributes:
+        sources, targets: int64 columns of edge end vertices.
+        costs1, costs2: float64 columns of edge costs.
+    """
+
+    def __init__(self):
+        self.sources = array('q')
+        self.targets = array('q')
+        self.costs1 = array('d')
+        self.costs2 = array('d')
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def extend(self, sources: Iterable[int], targets: Iterable[int], costs1: Iterable[float], costs2: Iterable[float]) -> None:
+        self.sources.extend(sources)
+        self.targets.extend(targets)
+        self.costs1.extend(costs1)
+        self.costs2.extend(costs2)
+
+    def extend_undirected(self, sources: Iterable[int], targets: Iterable[int], costs1: Iterable[float], costs2: Iterable[float]) -> None:
+        """
+        Adds edges in both directions with the same costs.
+        """
+        sources, targets, costs1, costs2 = array('q', sources), array('q', targets), array('d', costs1), array('d', costs2)
+        self.extend(sources, targets, costs1, costs2)
+        self.extend(targets, sources, costs1, costs2)
+
+    @property
+    def nodes_count(self) -> int:
+        if not self.sources:
+            return 0
+        return max(max(self.sources), max(self.targets)) + 1
+
+    def to_graph(self) -> Graph:
+        graph = Graph()
+        for vertex1, vertex2, cost1, cost2 in zip(self.sources, self.targets, self.costs1, self.costs2):
+            graph.add_edge(vertex1, vertex2, cost1, cost2)
+        return graph
+
+    def write_text(self, file_path: str) -> None:
+        """
+        Writes edges in the Graph.read_from_file format: vertex1 vertex2 cost1 cost2.
+        """
+        with open(file_path, 'w') as file:
+            for vertex1, vertex2, cost1, cost2 in zip(self.sources, self.targets, self.costs1, self.costs2):
+                file.write(f"{vertex1} {vertex2} {cost1:.17g} {cost2:.17g}\n")
+
+    def write_binary(self, file_path: str) -> None:
+        """
+        Writes edges in the binary edge-list format (see Graph.read_from_binary_file).
+        """
+        write_binary_edges(file_path, self.sources, self.targets, self.costs1, self.costs2)
+
+
+def _random_costs(rng: random.Random, count: int, max_cost: int) -> array:
+    return array('d', rng.choices(range(1, max_cost + 1), k=count))
+
+
+def ring_topology(rings: int, ring_size: int, seed: Optional[int] = None, max_cost: int = 100) -> EdgeList:
+    """
+    Concentric rings: every node is linked with its neighbours on the ring and with the
+    node at the same position of the next ring. Links are bidirectional.
+    Node id = ring * ring_size + position.
+    """
+    rng = random.Random(seed)
+    edges = EdgeList()
+    nodes_count = rings * ring_size
+    sources = range(nodes_count)
+    ring_targets = [(node // ring_size) * ring_size + (node % ring_size + 1) % ring_size for node in sources]
+    edges.extend_undirected(sources, ring_targets, _random_costs(rng, nodes_count, max_cost), _random_costs(rng, nodes_count, max_cost))
+    radial_count = (rings - 1) * ring_size
+    edges.extend_undirected(range(radial_count), range(ring_size, nodes_count),
+                            _random_costs(rng, radial_count, max_cost), _random_costs(rng, radial_count, max_cost))
+    return edges
+
+
+def corridor_topology(corridors: int, length: int, cross_step: int = 1, seed: Optional[int] = None, max_cost: int = 100) -> EdgeList:
+    """
+    Parallel corridors of nodes connected along their length, with cross links between
+    neighbouring corridors at every cross_step position. Links are bidirectional.
+    Node id = corridor * length + position.
+    """
+    rng = random.Random(seed)
+    edges = EdgeList()
+    along = [corridor * length + position for corridor in range(corridors) for position in range(length - 1)]
+    edges.extend_undirected(along, [node + 1 for node in along],
+                            _random_costs(rng, len(along), max_cost), _random_costs(rng, len(along), max_cost))
+    across = [corridor * length + position for corridor in range(corridors - 1) for position in range(0, length, cross_step)]
+    edges.extend_undirected(across, [node + length for node in across],
+                            _random_costs(rng, len(across), max_cost), _random_costs(rng, len(across), max_cost))
+    return edges
+
+
+def random_topology(nodes_count: int, edges_per_node: int, seed: Optional[int] = None, max_cost: int = 100, first_node: int = 0) -> EdgeList:
+    """
+    Random directed graph: every node gets edges_per_node outgoing edges to uniformly chosen other nodes.
+    Node ids are first_node .. first_node + nodes_count - 1.
+    """
+    if nodes_count < 2 and edges_per_node > 0:
+        raise ValueError("A random topology with edges needs at least two nodes")
+    rng = random.Random(seed)
+    edges = EdgeList()
+    edges_count = nodes_count * edges_per_node
+    sources = array('q', (first_node + node for node in range(nodes_count) for _ in range(edges_per_node)))
+    # Shift by a random non-zero offset to avoid self loops
+    offsets = rng.choices(range(1, nodes_count), k=edges_count)
+    targets = array('q', (first_node + (source - first_node + offset) % nodes_count for source, offset in zip(sources, offsets)))
+    edges.extend(sources, targets, _random_costs(rng, edges_count, max_cost), _random_costs(rng, edges_count, max_cost))
+    return edges
+
+
+def bridge_topology(cluster_size: int, edges_per_node: int, bridges: int = 1, seed: Optional[int] = None, max_cost: int = 100) -> EdgeList:
+    """
+    Two random clusters joined by a few bidirectional bridge links.
+    Nodes 0 .. cluster_size - 1 form the first cluster, the rest form the second.
+    """
+    rng = random.Random(seed)
+    edges = random_topology(cluster_size, edges_per_node, seed=rng.randrange(2 ** 32), max_cost=max_cost)
+    second_cluster = random_topology(cluster_size, edges_per_node, seed=rng.randrange(2 ** 32), max_cost=max_cost, first_node=cluster_size)
+    edges.extend(second_cluster.sources, second_cluster.targets, second_cluster.costs1, second_cluster.costs2)
+    left = rng.choices(range(cluster_size), k=bridges)
+    right = rng.choices(range(cluster_size, 2 * cluster_size), k=bridges)
+    edges.extend_undirected(left, right, _random_costs(rng, bridges, max_cost), _random_costs(rng, bridges, max_cost))
+    return edges
+
+
+TOPOLOGIES: Dict[str, Callable[..., EdgeList]] = {
+    "ring": ring_topology,
+    "corridor": corridor_topology,
+    "bridge": bridge_topology,
+    "random": random_topology,
+}
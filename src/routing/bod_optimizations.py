@@ -1,39 +1,122 @@
-from typing import Dict, Optional, Type
+from typing import Any, Dict, Iterator, Optional, Tuple, Type
 from mosp_algo.graph import Graph
 from mosp_algo.pareto_set import BiObjSolution, ParetoSet
+from mosp_algo.path_store import ROOT, PathEntry, PathStore
 from mosp_algo.search_tree_pqd import SearchTreePQD, State
+from mosp_algo.search_tree_spilling import register_spillable_state
 from collections import defaultdict
 
 
-def bod_limited(search_graph: Graph, start_node: int, C1: float, C2: float, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Dict[int, ParetoSet]:
-    search_tree=SearchTreePQD
+def bod_limited(search_graph: Graph, start_node: int, C1: float, C2: float, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD,
+                pareto_set_cls: Type[ParetoSet] = ParetoSet) -> Dict[int, ParetoSet]:
+    solutions = defaultdict(pareto_set_cls)
+    for state in bod_limited_settled_states(search_graph, start_node, C1, C2, search_tree_cls):
+        solutions[state.node].add_solution(BiObjSolution(state, (state.g1, state.g2)))
+    return solutions
+
+def bod_limited_settled_states(search_graph: Graph, start_node: int, C1: float, C2: float, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Iterator[State]:
+    """
+    Yields states of the C1, C2 bounded search as soon as they are settled.
+    The search advances only when the consumer requests the next state.
+    """
+    g2_min = defaultdict(lambda: float('inf'))
+    start_state = State(node=start_node, g1=0, g2=0, parent=None)
+    with search_tree_cls() as search_tree:
+        search_tree.add_to_open(start_state)
+
+        while not search_tree.open_is_empty():
+            cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
+            if cur_state.g2 >= g2_min[cur_state.node]:
+                continue
+            g2_min[cur_state.node] = cur_state.g2
+            yield cur_state
+            for neighbour_node, costs in search_graph.get_neighbors(cur_state.node):
+                for cost in costs:
+                    neighbour_g1 = cur_state.g1 + cost[0]
+                    neighbour_g2 = cur_state.g2 + cost[1]
+                    if neighbour_g2 >= g2_min[neighbour_node]:
+                        continue
+                    if neighbour_g1 > C1 or neighbour_g2 > C2:
+                        continue
+                    y = State(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2, parent=cur_state)
+                    search_tree.add_to_open(y)
+
+def bod_limited_iter(search_graph: Graph, start_node: int, C1: float, C2: float, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Iterator[Tuple[Any, float, float, Optional[Any]]]:
+    """
+    Streaming version of bod_limited.
+
+    Yields:
+        Tuple: (node, g1, g2, parent) where parent is the previous node on the path (None for start_node).
+    """
+    for state in bod_limited_settled_states(search_graph, start_node, C1, C2, search_tree_cls):
+        parent = state.parent
+        yield state.node, state.g1, state.g2, (parent.node if parent is not None else None)
+
+# Optimization - open states refer to their parent by an entry of a shared PathStore instead of keeping the ancestor chain
+class StatePathStore(State):
+    parent = None # no ancestor chain is kept; keeps State.__eq__ / __hash__ working
+
+    def __init__(self, node, g1, g2, h1=0, h2=0, parent_entry = -1):
+        self.node = node
+        self.g1, self.g2 = g1, g2
+        self.h1, self.h2 = h1, h2
+        self.f1, self.f2 = self.g1 + self.h1, self.g2 + self.h2
+        self.parent_entry = parent_entry
+
+register_spillable_state(StatePathStore, "parent_entry")
+
+def bod_limited_path_store(search_graph: Graph, start_node: int, C1: float, C2: float, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Tuple[Dict[int, ParetoSet], PathStore]:
+    """
+    Version of bod_limited that keeps all paths in one PathStore.
+    The solution_state of every solution is a PathEntry, not a State: it has node, g1, g2 and parent,
+    so construct_path works on it, next_node_in_path is the O(1) first hop and entry.path() restores the path.
+
+    Returns:
+        Tuple: (solutions, store)
+    """
     solutions = defaultdict(ParetoSet)
+    store = PathStore(start_node)
+    for path_entry in bod_limited_path_store_settled_states(search_graph, start_node, C1, C2, store, search_tree_cls):
+        solutions[path_entry.node].add_solution(BiObjSolution(path_entry, (path_entry.g1, path_entry.g2)))
+    return solutions, store
+
+def bod_limited_path_store_settled_states(search_graph: Graph, start_node: int, C1: float, C2: float, store: PathStore,
+                                          search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Iterator[PathEntry]:
+    """
+    Yields the settled states of the C1, C2 bounded search as entries of store, a PathStore for start_node.
+    """
+    if store.source != start_node or len(store) != 1:
+        raise ValueError("store must be an empty PathStore for start_node")
     g2_min = defaultdict(lambda: float('inf'))
-    start_node = State(node=start_node, g1=0, g2=0, parent=None)
-    search_tree = search_tree()
-    search_tree.add_to_open(start_node)
-
-    while not search_tree.open_is_empty():
-        cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
-        if cur_state.g2 >= g2_min[cur_state.node]:
-            continue
-        g2_min[cur_state.node] = cur_state.g2
-        solutions[cur_state.node].add_solution(BiObjSolution(cur_state, (cur_state.g1, cur_state.g2)))
-        for neighbour_node, costs in search_graph.get_neighbors(cur_state.node):
-            for cost in costs:
-                neighbour_g1 = cur_state.g1 + cost[0]
-                neighbour_g2 = cur_state.g2 + cost[1]
-                if neighbour_g2 >= g2_min[neighbour_node]:
-                    continue
-                if neighbour_g1 > C1 or neighbour_g2 > C2:
-                    continue
-                y = State(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2, parent=cur_state)
-                search_tree.add_to_open(y)
-    return solutions
+    with search_tree_cls() as search_tree:
+        search_tree.add_to_open(StatePathStore(node=start_node, g1=0, g2=0))
+
+        while not search_tree.open_is_empty():
+            cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
+            if cur_state.g2 >= g2_min[cur_state.node]:
+                continue
+            g2_min[cur_state.node] = cur_state.g2
+            if cur_state.parent_entry < 0:
+                entry = ROOT
+            else:
+                entry = store.add(cur_state.parent_entry, cur_state.node, cur_state.g1, cur_state.g2)
+            yield PathEntry(store, entry)
+
+            for neighbour_node, costs in search_graph.get_neighbors(cur_state.node):
+                for cost in costs:
+                    neighbour_g1 = cur_state.g1 + cost[0]
+                    neighbour_g2 = cur_state.g2 + cost[1]
+                    if neighbour_g2 >= g2_min[neighbour_node]:
+                        continue
+                    if neighbour_g1 > C1 or neighbour_g2 > C2:
+                        continue
+                    search_tree.add_to_open(StatePathStore(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2, parent_entry=entry))
 
 # Stage #1: Reacheble_nodes - find all vertices reachable from start_node with total path cost less than given C_1, C_2
 # Optimization - state store only first node in a path, not parent 
 class StateStage_1(State):
+    parent = None # no ancestor chain is kept; keeps State.__eq__ / __hash__ working
+
     def __init__(self, node, g1, g2, h1=0, h2=0, next_node_in_path = None):
         """
         Initializes a node in the search tree.
@@ -51,41 +134,58 @@ class StateStage_1(State):
         self.next_node_in_path = next_node_in_path
         
 
+register_spillable_state(StateStage_1, "next_node_in_path")
+
 def bod_stage_1(search_graph: Graph, start_node: int, C1: float, C2: float, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Dict[int, ParetoSet]:
-    search_tree=SearchTreePQD
     solutions = defaultdict(ParetoSet)
-    g2_min = defaultdict(lambda: float('inf'))
-    start_node = StateStage_1(node=start_node, g1=0, g2=0, next_node_in_path=None)
-    search_tree = search_tree()
-    search_tree.add_to_open(start_node)
-
-    while not search_tree.open_is_empty():
-        cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
-        if cur_state.g2 >= g2_min[cur_state.node]:
-            continue
-        g2_min[cur_state.node] = cur_state.g2
-        solutions[cur_state.node].add_solution(BiObjSolution(cur_state, (cur_state.g1, cur_state.g2)))
-        
-        for neighbour_node, costs in search_graph.get_neighbors(cur_state.node):
-            for cost in costs:
-                neighbour_g1 = cur_state.g1 + cost[0]
-                neighbour_g2 = cur_state.g2 + cost[1]
-                if neighbour_g2 >= g2_min[neighbour_node]:
-                    continue
-                if neighbour_g1 > C1 or neighbour_g2 > C2:
-                    continue
-                if cur_state == start_node:
-                    next_node_in_path = neighbour_node
-                else:
-                    next_node_in_path = cur_state.next_node_in_path
-                y = StateStage_1(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2, next_node_in_path=cur_state)
-                search_tree.add_to_open(y)
+    for state in bod_stage_1_settled_states(search_graph, start_node, C1, C2, search_tree_cls):
+        solutions[state.node].add_solution(BiObjSolution(state, (state.g1, state.g2)))
     return solutions
 
+def bod_stage_1_settled_states(search_graph: Graph, start_node: int, C1: float, C2: float, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Iterator[StateStage_1]:
+    g2_min = defaultdict(lambda: float('inf'))
+    start_state = StateStage_1(node=start_node, g1=0, g2=0, next_node_in_path=None)
+    with search_tree_cls() as search_tree:
+        search_tree.add_to_open(start_state)
+
+        while not search_tree.open_is_empty():
+            cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
+            if cur_state.g2 >= g2_min[cur_state.node]:
+                continue
+            g2_min[cur_state.node] = cur_state.g2
+            yield cur_state
+
+            for neighbour_node, costs in search_graph.get_neighbors(cur_state.node):
+                for cost in costs:
+                    neighbour_g1 = cur_state.g1 + cost[0]
+                    neighbour_g2 = cur_state.g2 + cost[1]
+                    if neighbour_g2 >= g2_min[neighbour_node]:
+                        continue
+                    if neighbour_g1 > C1 or neighbour_g2 > C2:
+                        continue
+                    if cur_state is start_state:
+                        next_node_in_path = neighbour_node
+                    else:
+                        next_node_in_path = cur_state.next_node_in_path
+                    y = StateStage_1(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2, next_node_in_path=next_node_in_path)
+                    search_tree.add_to_open(y)
+
+def bod_stage_1_iter(search_graph: Graph, start_node: int, C1: float, C2: float, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Iterator[Tuple[Any, float, float, Optional[Any]]]:
+    """
+    Streaming version of bod_stage_1.
+
+    Yields:
+        Tuple: (node, g1, g2, next_hop) where next_hop is the first node after start_node on the path.
+    """
+    for state in bod_stage_1_settled_states(search_graph, start_node, C1, C2, search_tree_cls):
+        yield state.node, state.g1, state.g2, state.next_node_in_path
+
 
 # Stage #2: Possible senders - find all nodes from where packets can come to us given the constraints.
 # Optimization - don't keep a record of the state's ancestor in state
 class StateStage_2(State):
+    parent = None # no ancestor chain is kept; keeps State.__eq__ / __hash__ working
+
     def __init__(self, node, g1, g2, h1=0, h2=0):
         """
         Initializes a node in the search tree.
@@ -101,37 +201,54 @@ class StateStage_2(State):
         self.h1, self.h2 = h1, h2
         self.f1, self.f2 = self.g1 + self.h1, self.g2 + self.h2
 
+register_spillable_state(StateStage_2, None)
+
 def bod_stage_2(search_graph: Graph, start_node: int, C1: float, C2: float, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Dict[int, ParetoSet]:
-    search_tree=SearchTreePQD
     solutions = defaultdict(ParetoSet)
-    g2_min = defaultdict(lambda: float('inf'))
-    start_node = StateStage_2(node=start_node, g1=0, g2=0)
-    search_tree = search_tree()
-    search_tree.add_to_open(start_node)
-
-    while not search_tree.open_is_empty():
-        cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
-        if cur_state.g2 >= g2_min[cur_state.node]:
-            continue
-        g2_min[cur_state.node] = cur_state.g2
-        solutions[cur_state.node].add_solution(BiObjSolution(cur_state, (cur_state.g1, cur_state.g2)))
-        
-        for neighbour_node, costs in search_graph.get_neighbors(cur_state.node):
-            for cost in costs:
-                neighbour_g1 = cur_state.g1 + cost[0]
-                neighbour_g2 = cur_state.g2 + cost[1]
-                if neighbour_g2 >= g2_min[neighbour_node]:
-                    continue
-                if neighbour_g1 > C1 or neighbour_g2 > C2:
-                    continue
-                y = StateStage_2(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2)
-                search_tree.add_to_open(y)
+    for state in bod_stage_2_settled_states(search_graph, start_node, C1, C2, search_tree_cls):
+        solutions[state.node].add_solution(BiObjSolution(state, (state.g1, state.g2)))
     return solutions
 
+def bod_stage_2_settled_states(search_graph: Graph, start_node: int, C1: float, C2: float, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Iterator[StateStage_2]:
+    g2_min = defaultdict(lambda: float('inf'))
+    start_state = StateStage_2(node=start_node, g1=0, g2=0)
+    with search_tree_cls() as search_tree:
+        search_tree.add_to_open(start_state)
+
+        while not search_tree.open_is_empty():
+            cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
+            if cur_state.g2 >= g2_min[cur_state.node]:
+                continue
+            g2_min[cur_state.node] = cur_state.g2
+            yield cur_state
+
+            for neighbour_node, costs in search_graph.get_neighbors(cur_state.node):
+                for cost in costs:
+                    neighbour_g1 = cur_state.g1 + cost[0]
+                    neighbour_g2 = cur_state.g2 + cost[1]
+                    if neighbour_g2 >= g2_min[neighbour_node]:
+                        continue
+                    if neighbour_g1 > C1 or neighbour_g2 > C2:
+                        continue
+                    y = StateStage_2(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2)
+                    search_tree.add_to_open(y)
+
+def bod_stage_2_iter(search_graph: Graph, start_node: int, C1: float, C2: float, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Iterator[Tuple[Any, float, float, None]]:
+    """
+    Streaming version of bod_stage_2. Stage 2 states keep no ancestors, so the last element is always None.
+
+    Yields:
+        Tuple: (node, g1, g2, None)
+    """
+    for state in bod_stage_2_settled_states(search_graph, start_node, C1, C2, search_tree_cls):
+        yield state.node, state.g1, state.g2, None
+
 
 # Stage #3: Modeling - model the operation of each node from the possible senders 
 # Optimization - store in each state not the ancestor, but the vertex following the cur node, if we have traversed the cur node.
 class StateStage_3(State):
+    parent = None # no ancestor chain is kept; keeps State.__eq__ / __hash__ working
+
     def __init__(self, node, g1, g2, h1=0, h2=0, next_node = None):
         """
         Initializes a node in the search tree.
@@ -148,33 +265,48 @@ class StateStage_3(State):
         self.f1, self.f2 = self.g1 + self.h1, self.g2 + self.h2
         self.next_node = next_node
 
+register_spillable_state(StateStage_3, "next_node")
+
 def bod_stage_3(search_graph: Graph, start_node: int, C1: float, C2: float, target_node:int, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Dict[int, ParetoSet]:
-    search_tree=SearchTreePQD
     solutions = defaultdict(ParetoSet)
+    for state in bod_stage_3_settled_states(search_graph, start_node, C1, C2, target_node, search_tree_cls):
+        solutions[state.node].add_solution(BiObjSolution(state, (state.g1, state.g2)))
+    return solutions
+
+def bod_stage_3_settled_states(search_graph: Graph, start_node: int, C1: float, C2: float, target_node:int, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Iterator[StateStage_3]:
     g2_min = defaultdict(lambda: float('inf'))
-    start_node = StateStage_3(node=start_node, g1=0, g2=0, next_node_in_path=None)
-    search_tree = search_tree()
-    search_tree.add_to_open(start_node)
-
-    while not search_tree.open_is_empty():
-        cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
-        if cur_state.g2 >= g2_min[cur_state.node]:
-            continue
-        g2_min[cur_state.node] = cur_state.g2
-        solutions[cur_state.node].add_solution(BiObjSolution(cur_state, (cur_state.g1, cur_state.g2)))
+    start_state = StateStage_3(node=start_node, g1=0, g2=0, next_node=None)
+    with search_tree_cls() as search_tree:
+        search_tree.add_to_open(start_state)
+
+        while not search_tree.open_is_empty():
+            cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
+            if cur_state.g2 >= g2_min[cur_state.node]:
+                continue
+            g2_min[cur_state.node] = cur_state.g2
+            yield cur_state
         
-        for neighbour_node, costs in search_graph.get_neighbors(cur_state.node):
-            for cost in costs:
-                neighbour_g1 = cur_state.g1 + cost[0]
-                neighbour_g2 = cur_state.g2 + cost[1]
-                if neighbour_g2 >= g2_min[neighbour_node]:
-                    continue
-                if neighbour_g1 > C1 or neighbour_g2 > C2:
-                    continue
-                if cur_state.node == target_node:
-                    next_node = neighbour_node
-                else:
-                    next_node = cur_state.next_node
-                y = StateStage_3(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2, next_node=next_node)
-                search_tree.add_to_open(y)
-    return solutions
+            for neighbour_node, costs in search_graph.get_neighbors(cur_state.node):
+                for cost in costs:
+                    neighbour_g1 = cur_state.g1 + cost[0]
+                    neighbour_g2 = cur_state.g2 + cost[1]
+                    if neighbour_g2 >= g2_min[neighbour_node]:
+                        continue
+                    if neighbour_g1 > C1 or neighbour_g2 > C2:
+                        continue
+                    if cur_state.node == target_node:
+                        next_node = neighbour_node
+                    else:
+                        next_node = cur_state.next_node
+                    y = StateStage_3(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2, next_node=next_node)
+                    search_tree.add_to_open(y)
+
+def bod_stage_3_iter(search_graph: Graph, start_node: int, C1: float, C2: float, target_node:int, search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Iterator[Tuple[Any, float, float, Optional[Any]]]:
+    """
+    Streaming version of bod_stage_3.
+
+    Yields:
+        Tuple: (node, g1, g2, next_node) where next_node is the vertex following target_node on the path.
+    """
+    for state in bod_stage_3_settled_states(search_graph, start_node, C1, C2, target_node, search_tree_cls):
+        yield state.node, state.g1, state.g2, state.next_node
@@ -0,0 +1,203 @@
+import os
+import pickle
+import struct
+import zlib
+from collections import defaultdict
+from heapq import heapify
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from mosp_algo.graph import Graph
+from mosp_algo.pareto_set import BiObjSolution, ParetoSet
+from mosp_algo.search_tree_pqd import SearchTreePQD
+from routing.bod_optimizations import StateStage_1
+from routing.greedy_routing import make_routing_table, routing_table_from_solutions
+
+# Checkpointing of long routing table builds.
+# Completed per-source tables are appended to a log of length-prefixed, checksummed, zlib-compressed
+# pickle records; a torn record at the end of the log (crash during a write) is dropped on resume.
+# Optionally the state of the search in progress (open list, g2_min, settled fronts) is saved too.
+
+_RECORD_HEADER = struct.Struct('<II') # payload length, crc32 of payload
+
+
+class TableLog:
+    """
+    Append-only on-disk log of completed routing tables.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def load(self) -> Dict[Any, Dict[Any, Any]]:
+        """
+        Reads all complete records and truncates a torn record at the end of the log, if any.
+
+        Returns:
+        - Dict[Any, Dict[Any, Any]]: Routing table of every completed source.
+        """
+        tables = {}
+        if not os.path.exists(self.file_path):
+            return tables
+        valid_size = 0
+        with open(self.file_path, 'rb') as file:
+            while True:
+                header = file.read(_RECORD_HEADER.size)
+                if len(header) < _RECORD_HEADER.size:
+                    break
+                length, checksum = _RECORD_HEADER.unpack(header)
+                payload = file.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    break
+                source, table = pickle.loads(zlib.decompress(payload))
+                tables[source] = table
+                valid_size = file.tell()
+        if valid_size != os.path.getsize(self.file_path):
+            with open(self.file_path, 'r+b') as file:
+                file.truncate(valid_size)
+        return tables
+
+    def append(self, source, table: Dict[Any, Any], sync: bool = True) -> None:
+        payload = zlib.compress(pickle.dumps((source, table), protocol=pickle.HIGHEST_PROTOCOL))
+        with open(self.file_path, 'ab') as file:
+            file.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)))
+            file.write(payload)
+            file.flush()
+            if sync:
+                os.fsync(file.fileno())
+
+
+class ResumableStage1Search:
+    """
+    Stage #1 search (see bod_stage_1) that can be interrupted, saved to disk and resumed.
+    States keep only the first hop of their paths, so a snapshot is a flat list of records.
+    """
+
+    def __init__(self, search_graph: Graph, start_node, C1: float, C2: float, search_tree_cls=SearchTreePQD):
+        self.search_graph = search_graph
+        self.start_node = start_node
+        self.C1, self.C2 = C1, C2
+        self.solutions: Dict[Any, ParetoSet] = defaultdict(ParetoSet)
+        self.g2_min = defaultdict(lambda: float('inf'))
+        self.search_tree = search_tree_cls()
+        self.search_tree.add_to_open(StateStage_1(node=start_node, g1=0, g2=0, next_node_in_path=None))
+
+    @property
+    def finished(self) -> bool:
+        return self.search_tree.open_is_empty()
+
+    def run(self, max_steps: Optional[int] = None) -> bool:
+        """
+        Expands at most max_steps states from the open list (all of them if max_steps is None).
+
+        Returns:
+        - bool: True if the search is finished.
+        """
+        steps = 0
+        search_tree, g2_min = self.search_tree, self.g2_min
+        while not search_tree.open_is_empty() and (max_steps is None or steps < max_steps):
+            steps += 1
+            cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
+            if cur_state.g2 >= g2_min[cur_state.node]:
+                continue
+            g2_min[cur_state.node] = cur_state.g2
+            self.solutions[cur_state.node].add_solution(BiObjSolution(cur_state, (cur_state.g1, cur_state.g2)))
+
+            for neighbour_node, costs in self.search_graph.get_neighbors(cur_state.node):
+                for cost in costs:
+                    neighbour_g1 = cur_state.g1 + cost[0]
+                    neighbour_g2 = cur_state.g2 + cost[1]
+                    if neighbour_g2 >= g2_min[neighbour_node]:
+                        continue
+                    if neighbour_g1 > self.C1 or neighbour_g2 > self.C2:
+                        continue
+                    if cur_state.next_node_in_path is None: # start state
+                        next_node_in_path = neighbour_node
+                    else:
+                        next_node_in_path = cur_state.next_node_in_path
+                    search_tree.add_to_open(StateStage_1(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2, next_node_in_path=next_node_in_path))
+        return self.finished
+
+    def save(self, file_path: str) -> None:
+        """
+        Atomically writes the search state (open list, g2_min and settled fronts) to file_path.
+        """
+        snapshot = {
+            "start_node": self.start_node,
+            "bounds": (self.C1, self.C2),
+            "open": [(state.node, state.g1, state.g2, state.next_node_in_path) for state in self.search_tree.open],
+            "settled": [(node, solution.g1, solution.g2, solution.solution_state.next_node_in_path)
+                        for node, pareto_set in self.solutions.items() for solution in pareto_set.get_solutions()],
+            "g2_min": dict(self.g2_min),
+        }
+        temporary_path = f"{file_path}.tmp"
+        with open(temporary_path, 'wb') as file:
+            file.write(zlib.compress(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, file_path)
+
+    @classmethod
+    def load(cls, file_path: str, search_graph: Graph, search_tree_cls=SearchTreePQD) -> 'ResumableStage1Search':
+        with open(file_path, 'rb') as file:
+            snapshot = pickle.loads(zlib.decompress(file.read()))
+        search = cls(search_graph, snapshot["start_node"], *snapshot["bounds"], search_tree_cls=search_tree_cls)
+        search.g2_min.update(snapshot["g2_min"])
+        for node, g1, g2, next_node_in_path in snapshot["settled"]:
+            state = StateStage_1(node=node, g1=g1, g2=g2, next_node_in_path=next_node_in_path)
+            search.solutions[node].add_solution(BiObjSolution(state, (g1, g2)))
+        search.search_tree.open = [StateStage_1(node=node, g1=g1, g2=g2, next_node_in_path=next_node_in_path)
+                                   for node, g1, g2, next_node_in_path in snapshot["open"]]
+        heapify(search.search_tree.open)
+        return search
+
+
+def build_routing_tables(network_graph: Graph, C1: float, C2: float, checkpoint_path: str, routers: Optional[Iterable[Any]] = None,
+                         table_builder: Callable[[Graph, Any, float, float], Dict[Any, Any]] = make_routing_table,
+                         search_checkpoint_steps: Optional[int] = None, sync_every: int = 1) -> Dict[Any, Dict[Any, Any]]:
+    """
+    Builds routing tables for all routers with checkpointing, resuming from checkpoint_path if it exists.
+
+    Parameters:
+    - network_graph: Network to build tables for.
+    - C1, C2: Cost bounds of the routes.
+    - checkpoint_path: Log of completed tables. Sources already in the log are skipped.
+    - routers: Sources to build tables for (default: all vertices of the graph).
+    - table_builder: Per-source table function (default: greedy make_routing_table).
+    - search_checkpoint_steps: If set, the greedy table of every source is built with a resumable search whose
+      state is saved to "<checkpoint_path>.search" every search_checkpoint_steps expanded states.
+      Only the default greedy table_builder can be combined with it.
+    - sync_every: fsync the log every sync_every tables.
+
+    Returns:
+    - Dict[Any, Dict[Any, Any]]: Routing table of every router.
+    """
+    if search_checkpoint_steps is not None and table_builder is not make_routing_table:
+        raise ValueError("search_checkpoint_steps resumes the greedy stage #1 search; it can't be combined with a custom table_builder")
+    table_log = TableLog(checkpoint_path)
+    tables = table_log.load()
+    search_path = f"{checkpoint_path}.search"
+    routers = list(network_graph.vertices) if routers is None else list(routers)
+
+    built = 0
+    for router in routers:
+        if router in tables:
+            continue
+        if search_checkpoint_steps is None:
+            table = table_builder(network_graph, router, C1, C2)
+        else:
+            search = None
+            if os.path.exists(search_path):
+                search = ResumableStage1Search.load(search_path, network_graph)
+                if search.start_node != router or (search.C1, search.C2) != (C1, C2):
+                    search = None
+            if search is None:
+                search = ResumableStage1Search(network_graph, router, C1, C2)
+            while not search.run(search_checkpoint_steps):
+                search.save(search_path)
+            table = routing_table_from_solutions(network_graph, router, search.solutions, C1, C2)
+        built += 1
+        table_log.append(router, table, sync=built % sync_every == 0)
+        tables[router] = table
+        if os.path.exists(search_path):
+            os.remove(search_path)
+    return tables
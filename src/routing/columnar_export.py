@@ -0,0 +1,240 @@
+import glob
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from mosp_algo.pareto_set import BiObjSolution, ParetoSet
+
+# Columnar export of search results and routing tables.
+# A dataset is a directory of chunk files "part-<n>.mcol", each holding up to chunk_rows rows:
+# magic, little-endian uint64 number of rows, then six little-endian columns of 8-byte values:
+# int64 source[n], int64 target[n], float64 g1[n], float64 g2[n], int64 next_hop[n], int64 rank[n].
+# Chunks are memory-mapped on load, so columns are read without copying.
+#
+# Pareto results: one row per solution, rank is the position of the solution in its front sorted by g1.
+# Routing tables: one row per entry, g1 = g2 = NaN and rank = 0. Missing next hops are stored as -1.
+
+MAGIC = b'MOSPCOL1'
+_HEADER = struct.Struct('<8sQ')
+_ROW = struct.Struct('<qqddqq')
+_CHUNK_NAME = re.compile(r'part-(\d+)\.mcol$')
+COLUMNS = ('source', 'target', 'g1', 'g2', 'next_hop', 'rank')
+_COLUMN_TYPECODES = ('q', 'q', 'd', 'd', 'q', 'q')
+NO_NEXT_HOP = -1
+
+
+def solution_next_hop(solution: BiObjSolution) -> Optional[Any]:
+    """
+    Default next hop of a solution: next_node_in_path of stage #1 states, otherwise the second node
+    of the path restored from the parent chain.
+    """
+    state = solution.solution_state
+    if hasattr(state, 'next_node_in_path'):
+        return state.next_node_in_path
+    next_hop = None
+    while getattr(state, 'parent', None) is not None:
+        next_hop = state.node
+        state = state.parent
+    return next_hop
+
+
+class ColumnarWriter:
+    """
+    Writes rows to chunk files of a dataset directory. Use as a context manager or call close().
+    """
+
+    def __init__(self, directory: str, chunk_rows: int = 1 << 20):
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        # continue after the highest existing chunk number, so no chunk is overwritten even if numbers have gaps
+        chunk_numbers = [int(match.group(1)) for match in map(_CHUNK_NAME.search, glob.glob(os.path.join(directory, 'part-*.mcol'))) if match]
+        self.chunks_count = max(chunk_numbers) + 1 if chunk_numbers else 0
+        self._columns = self._empty_columns()
+
+    @staticmethod
+    def _empty_columns() -> List[array]:
+        return [array(typecode) for typecode in _COLUMN_TYPECODES]
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None: # rows buffered before an error are not written
+            self.close()
+
+    def add_row(self, source: int, target: int, g1: float, g2: float, next_hop: Optional[int], rank: int) -> None:
+        """
+        Adds a row. The whole row is validated before any column is changed.
+
+        Raises:
+            ValueError: If a vertex id is not an int64 (or is NO_NEXT_HOP), or a cost is not a number.
+        """
+        if NO_NEXT_HOP in (source, target, next_hop):
+            raise ValueError(f"Vertex id {NO_NEXT_HOP} is reserved for missing next hops")
+        row = (source, target, g1, g2, NO_NEXT_HOP if next_hop is None else next_hop, rank)
+        try:
+            _ROW.pack(*row)
+        except struct.error as e:
+            raise ValueError(f"Row {row} does not fit the int64/float64 columns: {e}") from e
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        if len(self._columns[0]) >= self.chunk_rows:
+            self.flush()
+
+    def add_pareto_results(self, source: int, solutions: Dict[int, ParetoSet],
+                           next_hop: Callable[[BiObjSolution], Optional[int]] = solution_next_hop) -> None:
+        """
+        Adds the result of a search from source (Dict[target, ParetoSet], e.g. from bod or bod_stage_1).
+
+        Parameters:
+        - next_hop: Extracts the next hop of a solution (default: solution_next_hop, which also handles
+          the PathEntry states of bod_limited_path_store).
+        """
+        for target, pareto_set in solutions.items():
+            for rank, solution in enumerate(sorted(pareto_set.solutions, key=lambda solution: solution.solution_values)):
+                self.add_row(source, target, solution.g1, solution.g2, next_hop(solution), rank)
+
+    def add_routing_table(self, source: int, table: Dict[int, int]) -> None:
+        """
+        Adds the routing table (target -> next hop) of router source.
+        """
+        for target, next_hop in table.items():
+            if isinstance(next_hop, dict):
+                raise ValueError(f"Entry for target {target} depends on the sender; only flat routing tables can be exported")
+            self.add_row(source, target, float('nan'), float('nan'), next_hop, 0)
+
+    def flush(self) -> None:
+        """
+        Writes the buffered rows to a new chunk file.
+        """
+        rows_count = len(self._columns[0])
+        if any(len(column) != rows_count for column in self._columns):
+            raise ValueError(f"Column lengths differ: {[len(column) for column in self._columns]}")
+        if rows_count == 0:
+            return
+        chunk_path = os.path.join(self.directory, f"part-{self.chunks_count:05d}.mcol")
+        with open(chunk_path, 'wb') as file:
+            file.write(_HEADER.pack(MAGIC, rows_count))
+            for column in self._columns:
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                column.tofile(file)
+        self.chunks_count += 1
+        self._columns = self._empty_columns()
+
+    def close(self) -> None:
+        self.flush()
+
+
+class ColumnarChunk:
+    """
+    One memory-mapped chunk. Columns are memoryviews (or arrays on big-endian machines) named as in COLUMNS.
+    The file stays mapped until close() (or the end of a with block); columns can't be used afterwards.
+    """
+
+    def __init__(self, file_path: str):
+        with open(file_path, 'rb') as file:
+            magic, rows_count = _HEADER.unpack(file.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"File {file_path} is not a columnar chunk")
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if rows_count else None
+        self.file_path = file_path
+        self.rows_count = rows_count
+        self.columns = {}
+        self._views: List[memoryview] = []
+        offset = _HEADER.size
+        for name, typecode in zip(COLUMNS, _COLUMN_TYPECODES):
+            size = rows_count * 8
+            if self._mmap is None:
+                column = array(typecode)
+            elif sys.byteorder == 'big':
+                column = array(typecode, self._mmap[offset:offset + size])
+                column.byteswap()
+            else:
+                column = memoryview(self._mmap)[offset:offset + size].cast(typecode)
+                self._views.append(column)
+            self.columns[name] = column
+            offset += size
+
+    def __enter__(self) -> 'ColumnarChunk':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Releases the columns and unmaps the file.
+        """
+        self.columns = {}
+        for view in self._views:
+            view.release()
+        self._views = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __len__(self) -> int:
+        return self.rows_count
+
+    def __getattr__(self, name: str):
+        columns = self.__dict__.get('columns', {})
+        if name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def rows(self) -> Iterator[Tuple[int, int, float, float, int, int]]:
+        return zip(*(self.columns[name] for name in COLUMNS))
+
+
+def _chunk_paths(directory: str) -> List[str]:
+    """
+    Chunk files of a dataset in the order they were written (by chunk number, not by name).
+    """
+    numbered = []
+    for chunk_path in glob.glob(os.path.join(directory, 'part-*.mcol')):
+        match = _CHUNK_NAME.search(chunk_path)
+        if match:
+            numbered.append((int(match.group(1)), chunk_path))
+    return [chunk_path for _, chunk_path in sorted(numbered)]
+
+
+def open_chunks(directory: str) -> Iterator[ColumnarChunk]:
+    """
+    Yields the chunks of a dataset in the order they were written. The caller closes every chunk
+    (e.g. with a with block); load_pareto_fronts and load_routing_tables do that themselves.
+    """
+    for chunk_path in _chunk_paths(directory):
+        yield ColumnarChunk(chunk_path)
+
+
+def load_pareto_fronts(directory: str) -> Dict[int, Dict[int, Set[Tuple[float, float]]]]:
+    """
+    Loads exported Pareto results as source -> target -> set of (g1, g2).
+    """
+    fronts = defaultdict(lambda: defaultdict(set))
+    for chunk in open_chunks(directory):
+        with chunk:
+            for source, target, g1, g2 in zip(chunk.source, chunk.target, chunk.g1, chunk.g2):
+                fronts[source][target].add((g1, g2))
+    return {source: dict(targets) for source, targets in fronts.items()}
+
+
+def load_routing_tables(directory: str) -> Dict[int, Dict[int, Optional[int]]]:
+    """
+    Loads exported routing tables as router -> target -> next hop.
+    """
+    tables = defaultdict(dict)
+    for chunk in open_chunks(directory):
+        with chunk:
+            for source, target, next_hop in zip(chunk.source, chunk.target, chunk.next_hop):
+                tables[source][target] = None if next_hop == NO_NEXT_HOP else next_hop
+    return dict(tables)
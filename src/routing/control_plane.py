@@ -0,0 +1,266 @@
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from mosp_algo.graph import Graph
+from mosp_algo.path_store import PathStore
+from routing.bod_optimizations import bod_limited_path_store_settled_states
+
+# Routing control-plane service.
+# The graph lives in the service process; workers of the process pool receive it once (pool initializer).
+# Topology updates don't restart the pool: route queries ship (source, target, C1, C2) together with the
+# topology version and the updates applied since the pool was started, and every worker applies the updates
+# it hasn't seen yet to its own copy of the graph. Each update copies the graph once per worker (see
+# apply_topology_update), and the update log travels with every query, so after max_pending_updates updates
+# the pool is restarted with the current graph (which pickles the whole graph to every new worker).
+
+RouteKey = Tuple[int, Any, Any, float, float]
+Route = Tuple[float, float, List[Any]]
+TopologyUpdate = Tuple[List[Tuple[Any, Any, float, float]], List[Tuple[Any, Any]]]
+
+_worker_base: Optional[Tuple[int, Graph]] = None # version and graph the pool was started with
+_worker_graph: Optional[Tuple[int, Graph]] = None # newest version built by the worker
+
+
+def _init_worker(graph: Graph, version: int) -> None:
+    global _worker_base, _worker_graph
+    _worker_base = _worker_graph = (version, graph)
+
+
+def _graph_version(version: int, updates: Tuple[TopologyUpdate, ...]) -> Graph:
+    """
+    Runs in a worker process: returns the graph of a topology version, applying the updates
+    (all updates since the pool was started) the worker hasn't applied yet.
+    """
+    global _worker_graph
+    base_version = _worker_base[0]
+    graph_version, graph = _worker_graph
+    if graph_version > version: # a query submitted before a newer version reached this worker
+        graph_version, graph = _worker_base
+    for add_edges, remove_edges in updates[graph_version - base_version:version - base_version]:
+        graph = apply_topology_update(graph, add_edges, remove_edges)
+    if version > _worker_graph[0]:
+        _worker_graph = (version, graph)
+    return graph
+
+
+def _search_routes(version: int, updates: Tuple[TopologyUpdate, ...], source, target, C1: float, C2: float) -> List[Route]:
+    """
+    Runs in a worker process: finds Pareto-optimal routes from source to target within C1, C2
+    on the given topology version.
+    """
+    store = PathStore(source)
+    return [(path_entry.g1, path_entry.g2, path_entry.path())
+            for path_entry in bod_limited_path_store_settled_states(_graph_version(version, updates), source, C1, C2, store)
+            if path_entry.node == target]
+
+
+def apply_topology_update(graph: Graph, add_edges: Iterable[Tuple[Any, Any, float, float]] = (), remove_edges: Iterable[Tuple[Any, Any]] = ()) -> Graph:
+    """
+    Builds a new graph with the update applied. The source graph is left untouched,
+    so searches running on the previous version are not affected.
+
+    Parameters:
+    - add_edges: (vertex1, vertex2, cost1, cost2) edges to add.
+    - remove_edges: (vertex1, vertex2) pairs whose edges should be removed.
+    """
+    new_graph = Graph()
+    for vertex1, vertex2, costs in graph.get_edges():
+        for cost1, cost2 in costs:
+            new_graph.add_edge(vertex1, vertex2, cost1, cost2)
+    for vertex1, vertex2 in remove_edges:
+        new_graph.remove_edge(vertex1, vertex2)
+    for vertex1, vertex2, cost1, cost2 in add_edges:
+        new_graph.add_edge(vertex1, vertex2, cost1, cost2)
+    return new_graph
+
+
+class ServiceMetrics:
+    """
+    Counters and latency window of the routing service.
+    """
+
+    def __init__(self, latency_window: int = 1000):
+        self.queries = 0
+        self.coalesced_queries = 0
+        self.topology_updates = 0
+        self.queue_depth = 0
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+
+    def observe_latency(self, seconds: float) -> None:
+        self.latencies.append(seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        latencies = sorted(self.latencies)
+        result = {
+            "queries": self.queries,
+            "coalesced_queries": self.coalesced_queries,
+            "topology_updates": self.topology_updates,
+            "queue_depth": self.queue_depth,
+        }
+        if latencies:
+            result["latency_mean"] = sum(latencies) / len(latencies)
+            result["latency_p50"] = latencies[len(latencies) // 2]
+            result["latency_p95"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            result["latency_max"] = latencies[-1]
+        return result
+
+
+class RoutingService:
+    """
+    Long-running asyncio routing service.
+
+    Route queries are executed in a process pool; identical in-flight queries for the same
+    topology version are coalesced into a single search. Topology updates build a new graph
+    and swap it in atomically together with a new version number; workers receive the update with
+    the next queries, and the pool is restarted after max_pending_updates updates or if it breaks.
+    """
+
+    def __init__(self, graph: Graph, max_workers: Optional[int] = None, max_pending_updates: int = 32):
+        self.graph = graph
+        self.version = 0
+        self.max_workers = max_workers
+        self.max_pending_updates = max_pending_updates
+        self.metrics = ServiceMetrics()
+        self._executor = self._make_executor()
+        self._in_flight: Dict[RouteKey, asyncio.Future] = {}
+        self._update_lock = asyncio.Lock()
+
+    def _make_executor(self) -> ProcessPoolExecutor:
+        self._pending_updates: Tuple[TopologyUpdate, ...] = () # updates since the pool was started
+        return ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker, initargs=(self.graph, self.version))
+
+    def _restart_executor(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Replaces the pool with a new one started with the current graph, unless that already happened.
+        """
+        if self._executor is executor:
+            self._executor = self._make_executor()
+            executor.shutdown(wait=False)
+
+    async def route(self, source, target, C1: float, C2: float) -> Tuple[int, List[Route]]:
+        """
+        Finds Pareto-optimal routes from source to target within C1, C2 on the current topology.
+
+        Returns:
+        - Tuple[int, List[Route]]: topology version used and list of (g1, g2, path) routes.
+        """
+        started = time.perf_counter()
+        self.metrics.queries += 1
+        version = self.version
+        key = (version, source, target, C1, C2)
+        executor = self._executor
+        future = self._in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            try:
+                future = loop.run_in_executor(executor, _search_routes, version, self._pending_updates, source, target, C1, C2)
+            except BrokenProcessPool:
+                self._restart_executor(executor)
+                raise
+            self._in_flight[key] = future
+            self.metrics.queue_depth += 1
+            future.add_done_callback(lambda _: self._search_done(key))
+        else:
+            self.metrics.coalesced_queries += 1
+            executor = None # the pool of the first query restarts it if broken
+        try:
+            routes = await asyncio.shield(future)
+        except BrokenProcessPool: # a worker died; later queries get a new pool
+            self._restart_executor(executor)
+            raise
+        self.metrics.observe_latency(time.perf_counter() - started)
+        return version, routes
+
+    def _search_done(self, key: RouteKey) -> None:
+        self._in_flight.pop(key, None)
+        self.metrics.queue_depth -= 1
+
+    async def update_topology(self, add_edges: Iterable[Tuple[Any, Any, float, float]] = (), remove_edges: Iterable[Tuple[Any, Any]] = ()) -> int:
+        """
+        Applies a topology update atomically. Queries started before the update finish on the old version.
+
+        Returns:
+        - int: New topology version.
+        """
+        async with self._update_lock:
+            loop = asyncio.get_running_loop()
+            update = (list(add_edges), list(remove_edges))
+            new_graph = await loop.run_in_executor(None, apply_topology_update, self.graph, *update)
+            self.graph = new_graph
+            self.version += 1
+            self.metrics.topology_updates += 1
+            if len(self._pending_updates) < self.max_pending_updates:
+                self._pending_updates += (update,)
+            else:
+                self._restart_executor(self._executor)
+            return self.version
+
+    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Dispatches a decoded JSON request. Supported ops: route, update, metrics.
+        """
+        op = request.get("op")
+        if op == "route":
+            version, routes = await self.route(request["source"], request["target"], request["C1"], request["C2"])
+            return {"version": version, "routes": [[g1, g2, path] for g1, g2, path in routes]}
+        if op == "update":
+            version = await self.update_topology(request.get("add", ()), request.get("remove", ()))
+            return {"version": version}
+        if op == "metrics":
+            return {"version": self.version, "metrics": self.metrics.snapshot()}
+        raise ValueError(f"Unknown operation: {op}")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self.handle_request(json.loads(line))
+                except Exception as e: # bad requests and failed searches (e.g. a broken worker pool) get an error reply
+                    response = {"error": str(e) or e.__class__.__name__}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        """
+        Starts a TCP server speaking newline-delimited JSON. Each connection may send many requests;
+        requests from different connections are handled concurrently.
+        """
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+async def _main(graph_file: str, host: str, port: int, max_workers: Optional[int]) -> None:
+    graph = Graph()
+    graph.read_from_file(graph_file)
+    service = RoutingService(graph, max_workers=max_workers)
+    server = await service.serve(host, port)
+    print(f"Routing service listening on {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Bi-objective routing control-plane service.')
+    parser.add_argument('graph_file', type=str, help='Path to the graph file')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8470, help='Port to listen on')
+    parser.add_argument('--workers', type=int, default=None, help='Number of search worker processes')
+    args = parser.parse_args()
+    asyncio.run(_main(args.graph_file, args.host, args.port, args.workers))
@@ -18,7 +18,8 @@ def select_solution_from_pareto_set_mid(solutions_Pareto_set: ParetoSet, C1, C2)
     solution_number = len(solutions) // 2
     if len(solutions) == 0:
         solutions = solutions_Pareto_set.solutions
-    return sorted(sorted(solutions, key=lambda sol: distance_to_line(sol.solution_values, (1,0))))[solution_number]
+    # Solution values break ties, so every router picks the same solution from the same set
+    return sorted(solutions, key=lambda sol: (distance_to_line(sol.solution_values, (1,0)), sol.solution_values))[solution_number]
 
 def select_solution_from_pareto_set_min_g1(solutions_Pareto_set: ParetoSet, C1, C2) -> BiObjSolution:
     solutions = []
@@ -39,17 +40,23 @@ def select_solution_from_pareto_set_min_g2(solutions_Pareto_set: ParetoSet, C1,
     return solution
 
 def make_routing_table(network_graph: Graph, start_node, C1, C2):
+    # Stage #1: Reacheble_nodes - find all vertices reachable from start_node with total path cost less than given C_1, C_2.
+    return routing_table_from_solutions(network_graph, start_node, bod_stage_1(network_graph, start_node, C1, C2), C1, C2)
+
+def routing_table_from_solutions(network_graph: Graph, start_node, solutions, C1, C2):
+    """
+    Builds the next hop table of start_node from stage #1 solutions (states must keep next_node_in_path).
+    """
     next_hop_table = {}
     start_node_neighbours = network_graph.get_neighbors(start_node)
     if len(start_node_neighbours) == 0:
         return next_hop_table # selected node has no output ports => no need to create a routing table
     for target in network_graph.adjacency_list:
-        next_hop_table[target] = start_node_neighbours[0] # dummy plug
-    
-    # Stage #1: Reacheble_nodes - find all vertices reachable from start_node with total path cost less than given C_1, C_2.
-    reacheble_nodes = bod_stage_1(network_graph, start_node, C1, C2).keys() ^ {start_node}
+        next_hop_table[target] = start_node_neighbours[0][0] # dummy plug
+
+    reacheble_nodes = solutions.keys() - {start_node}
     for target in reacheble_nodes:
-        solution = select_solution_from_pareto_set_mid(reacheble_nodes[target], C1, C2).solution_state
-        next_hop_table[target][start_node] = solution.next_node_in_path
+        solution = select_solution_from_pareto_set_mid(solutions[target], C1, C2).solution_state
+        next_hop_table[target] = solution.next_node_in_path
     
     return next_hop_table
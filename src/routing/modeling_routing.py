@@ -1,7 +1,10 @@
 import math
+from collections import defaultdict
+from typing import Optional
 
 from mosp_algo.graph import Graph
-from bod_optimizations import bod_limited, bod_stage_1, bod_stage_2, bod_stage_3
+from routing.bod_optimizations import bod_limited, bod_stage_1, bod_stage_2, bod_stage_3
+from routing.reachability import ReachabilityIndex
 from mosp_algo.pareto_set import BiObjSolution, ParetoSet, Solution
 from mosp_algo.search_tree_pqd import SearchTreePQD, State
 
@@ -14,7 +17,8 @@ def reverse_graph(graph: Graph, costs_matter=True):
                     reverse_graph.add_edge(end_node, start_node, cost[0], cost[1])
             else:
                 reverse_graph.add_edge(end_node, start_node, 1, 1)
-   
+    return reverse_graph
+
 def distance_to_line(point, line):
     x, y = point
     a, b = line
@@ -29,45 +33,53 @@ def select_solution_from_pareto_set(solutions_Pareto_set: ParetoSet, C1, C2) ->
     solution_number = len(solutions) // 2
     if len(solutions) == 0:
         solutions = solutions_Pareto_set.solutions
-    return sorted(sorted(solutions, key=lambda sol: distance_to_line(sol.solution_values, (1,0))))[solution_number]
+    # Solution values break ties, so every router picks the same solution from the same set
+    return sorted(solutions, key=lambda sol: (distance_to_line(sol.solution_values, (1,0)), sol.solution_values))[solution_number]
+
+def make_routing_table(network_graph: Graph, start_node, C1, C2, reachability_index: Optional[ReachabilityIndex] = None):
+    """
+    Builds the routing table of start_node: target -> next hop, or target -> {sender: next hop}
+    when the next hop depends on the router the packet came from.
 
-def make_routing_table(network_graph: Graph, start_node, C1, C2):
-    next_hop_table = {}
+    Parameters:
+    - reachability_index: Precomputed index for the same C1, C2. If given, possible senders (stage #2)
+      are looked up in it instead of being found with a search on the reversed graph.
+    """
+    next_hop_table = defaultdict(dict)
     start_node_neighbours = network_graph.get_neighbors(start_node)
     if len(start_node_neighbours) == 0:
-        return next_hop_table # selected node has no output ports => no need to create a routing table
-    for target in network_graph.adjacency_list:
-        next_hop_table[target] = start_node_neighbours[0] # dummy plug
-    
+        return {} # selected node has no output ports => no need to create a routing table
+    if reachability_index is not None and not reachability_index.matches(C1, C2):
+        raise ValueError(f"Reachability index is built for bounds ({reachability_index.C1}, {reachability_index.C2}), not ({C1}, {C2})")
+
     # Stage #1: Reacheble_nodes - find all vertices reachable from start_node with total path cost less than given C_1, C_2.
-    reacheble_nodes = bod_stage_1(network_graph, start_node, C1, C2).keys() ^ {start_node}
-    for target in reacheble_nodes:
+    reacheble_nodes = bod_stage_1(network_graph, start_node, C1, C2)
+    for target in reacheble_nodes.keys() - {start_node}:
         solution = select_solution_from_pareto_set(reacheble_nodes[target], C1, C2).solution_state
         next_hop_table[target][start_node] = solution.next_node_in_path
-    
+
     # Stage #2: Possible senders - find all nodes from where packets can come to us given the constraints.
-    reverse_network_graph = reverse_graph(network_graph, costs_matter=False)
-    possible_predecessors = list(bod_stage_2(reverse_network_graph, start_node).keys())
+    if reachability_index is not None:
+        possible_predecessors = reachability_index.senders_to(start_node)
+    else:
+        reverse_network_graph = reverse_graph(network_graph)
+        possible_predecessors = list(bod_stage_2(reverse_network_graph, start_node, C1, C2).keys())
+    possible_predecessors = [sender for sender in possible_predecessors if sender != start_node]
 
     # Stage #3: Modeling - model the operation of each node from the possible senders 
     for sender in possible_predecessors:
-        sender_reacheble_nodes = bod_stage_3(network_graph, sender, C1, C2)
+        sender_reacheble_nodes = bod_stage_3(network_graph, sender, C1, C2, start_node)
         for target in sender_reacheble_nodes:
-            if target == start_node:
+            if target == start_node or target == sender:
                 continue
-            solution_state = select_solution_from_pareto_set(reacheble_nodes[target], C1, C2).solution_state
-            next_hop_table[target][sender] = solution_state.next_node
-    
-    # Stage #4: Route table optimization
-    if len(possible_predecessors) == 0:
-        return next_hop_table
-    
+            solution_state = select_solution_from_pareto_set(sender_reacheble_nodes[target], C1, C2).solution_state
+            if solution_state.next_node is not None: # the sender's route to target goes through start_node
+                next_hop_table[target][sender] = solution_state.next_node
+
+    # Stage #4: Route table optimization - a single next hop for all senders replaces the per-sender table
     for target in next_hop_table:
-        next_hops = set()
-        for sender in possible_predecessors[1:]:
-            next_hops.add(next_hop_table[target][sender])
-        next_hops = next_hops.discard(None)
+        next_hops = set(next_hop_table[target].values())
         if len(next_hops) == 1:
             next_hop_table[target] = next_hops.pop()
-    
-    return next_hop_table
+
+    return dict(next_hop_table)
@@ -0,0 +1,283 @@
+from collections import defaultdict, deque
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Set, Tuple, Type
+
+from mosp_algo.bod import bod
+from mosp_algo.graph import Graph
+from mosp_algo.pareto_set import BiObjSolution, ParetoSet
+from mosp_algo.search_tree_pqd import SearchTreePQD
+from routing.bod_optimizations import StateStage_1
+
+# Hierarchical routing for large networks.
+# The network is split into regions. For every region the Pareto fronts between its boundary nodes
+# (nodes with edges to other regions) and from its boundary nodes to all of its nodes are precomputed.
+# A query from a source then searches only the overlay graph of boundary nodes plus the source region,
+# and fronts to nodes of other regions are obtained by extending the fronts of their boundary nodes.
+# That extension is lazy (see NextHopFronts), so a query costs the overlay search plus the source region,
+# and only the remote vertices actually looked up are expanded.
+
+# Edge of the query graph: (neighbour, cost1, cost2, first physical hop when leaving the edge's start node)
+QueryEdge = Tuple[Any, float, float, Any]
+
+
+def bfs_partition(graph: Graph, region_size: int) -> Dict[Any, int]:
+    """
+    Splits graph vertices into connected regions of at most region_size vertices.
+    Regions are grown by BFS over the graph with edge directions ignored.
+
+    Returns:
+    - Dict[Any, int]: Region number of every vertex.
+    """
+    if region_size < 1:
+        raise ValueError("Region size must be positive")
+    undirected: Dict[Any, List[Any]] = defaultdict(list)
+    for vertex1, vertex2, _ in graph.get_edges():
+        undirected[vertex1].append(vertex2)
+        undirected[vertex2].append(vertex1)
+
+    partition: Dict[Any, int] = {}
+    region = 0
+    for seed in undirected:
+        if seed in partition:
+            continue
+        size = 0
+        queue = deque([seed])
+        partition[seed] = region
+        while queue and size < region_size:
+            vertex = queue.popleft()
+            size += 1
+            for neighbour in undirected[vertex]:
+                if neighbour not in partition and size + len(queue) < region_size:
+                    partition[neighbour] = region
+                    queue.append(neighbour)
+        region += 1
+    return partition
+
+
+def _non_dominated(candidates: List[Tuple[float, float, Any]]) -> List[Tuple[float, float, Any]]:
+    """
+    Returns the Pareto front of (g1, g2, payload) candidates in lexicographical order, one entry per cost vector.
+    """
+    front = []
+    best_g2 = float('inf')
+    for candidate in sorted(candidates, key=lambda candidate: (candidate[0], candidate[1])):
+        if candidate[1] < best_g2:
+            front.append(candidate)
+            best_g2 = candidate[1]
+    return front
+
+
+class RegionOverlay:
+    """
+    Partitioned representation of a network with precomputed boundary Pareto fronts.
+
+    Attributes:
+        partition: Region number of every vertex.
+        boundary: Boundary vertices of every region.
+        local_fronts: For every boundary vertex, Pareto fronts (lists of (g1, g2)) of paths to the
+            vertices of its region that stay inside the region.
+        overlay: Edges of the overlay graph between boundary vertices: inter-region edges and
+            intra-region Pareto-optimal paths compressed into multi-cost edges.
+    """
+
+    def __init__(self, graph: Graph, partition: Dict[Any, int]):
+        self.partition = partition
+        self.region_graphs: Dict[int, Graph] = defaultdict(Graph)
+        self.boundary: Dict[int, Set[Any]] = defaultdict(set)
+        self.overlay: Dict[Any, List[QueryEdge]] = defaultdict(list)
+        self.region_edges: Dict[Any, List[QueryEdge]] = defaultdict(list)
+
+        for vertex1, vertex2, costs in graph.get_edges():
+            region1, region2 = partition[vertex1], partition[vertex2]
+            for cost1, cost2 in costs:
+                if region1 == region2:
+                    self.region_graphs[region1].add_edge(vertex1, vertex2, cost1, cost2)
+                    self.region_edges[vertex1].append((vertex2, cost1, cost2, vertex2))
+                else:
+                    self.overlay[vertex1].append((vertex2, cost1, cost2, vertex2))
+            if region1 != region2:
+                self.boundary[region1].add(vertex1)
+                self.boundary[region2].add(vertex2)
+
+        self.local_fronts: Dict[Any, Dict[Any, List[Tuple[float, float]]]] = {}
+        for region, boundary_vertices in self.boundary.items():
+            for boundary_vertex in boundary_vertices:
+                self._add_local_fronts(region, boundary_vertex)
+
+    @classmethod
+    def build(cls, graph: Graph, region_size: int) -> 'RegionOverlay':
+        return cls(graph, bfs_partition(graph, region_size))
+
+    def _add_local_fronts(self, region: int, boundary_vertex) -> None:
+        fronts = {}
+        first_hops = {}
+        for vertex, pareto_set in bod(self.region_graphs[region], boundary_vertex).items():
+            fronts[vertex] = sorted(pareto_set.get_solutions(values=True))
+            if vertex in self.boundary[region] and vertex != boundary_vertex:
+                for solution in pareto_set.get_solutions():
+                    state = solution.solution_state
+                    while state.parent.parent is not None:
+                        state = state.parent
+                    first_hops[(vertex, solution.g1, solution.g2)] = state.node
+        fronts.setdefault(boundary_vertex, [(0, 0)])
+        self.local_fronts[boundary_vertex] = fronts
+        for (vertex, g1, g2), first_hop in first_hops.items():
+            self.overlay[boundary_vertex].append((vertex, g1, g2, first_hop))
+
+    def _search(self, source, C1: float, C2: float, search_tree_cls: Type[SearchTreePQD]) -> Dict[Any, List[Tuple[float, float, Any]]]:
+        """
+        Bounded BOD over the overlay graph plus the source region. States keep only the first hop.
+        """
+        source_region = self.partition.get(source)
+        fronts: Dict[Any, List[Tuple[float, float, Any]]] = defaultdict(list)
+        g2_min = defaultdict(lambda: float('inf'))
+        start_state = StateStage_1(node=source, g1=0, g2=0, next_node_in_path=None)
+        with search_tree_cls() as search_tree:
+            search_tree.add_to_open(start_state)
+
+            while not search_tree.open_is_empty():
+                cur_state = search_tree.get_best_node_from_open()  # Retrieve nodes in lexicographical order
+                if cur_state.g2 >= g2_min[cur_state.node]:
+                    continue
+                g2_min[cur_state.node] = cur_state.g2
+                fronts[cur_state.node].append((cur_state.g1, cur_state.g2, cur_state.next_node_in_path))
+
+                edges = self.overlay.get(cur_state.node, [])
+                if self.partition.get(cur_state.node) == source_region:
+                    edges = edges + self.region_edges.get(cur_state.node, [])
+                for neighbour_node, cost1, cost2, hop in edges:
+                    neighbour_g1 = cur_state.g1 + cost1
+                    neighbour_g2 = cur_state.g2 + cost2
+                    if neighbour_g2 >= g2_min[neighbour_node]:
+                        continue
+                    if neighbour_g1 > C1 or neighbour_g2 > C2:
+                        continue
+                    next_node_in_path = hop if cur_state is start_state else cur_state.next_node_in_path
+                    search_tree.add_to_open(StateStage_1(node=neighbour_node, g1=neighbour_g1, g2=neighbour_g2, next_node_in_path=next_node_in_path))
+        return fronts
+
+    def next_hop_fronts(self, source, C1: float = float('inf'), C2: float = float('inf'), search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> Dict[Any, ParetoSet]:
+        """
+        Finds Pareto-optimal solutions from source to every vertex within C1, C2.
+
+        Only the overlay graph and the source region are searched; fronts for vertices of other regions
+        are combined from the fronts of their boundary vertices and the precomputed local fronts when
+        they are looked up.
+
+        Returns:
+        - NextHopFronts: Mapping of every reachable vertex to its Pareto set. The solution_state of every
+          solution is the next hop from source (None for the source itself).
+        """
+        return NextHopFronts(self, source, self._search(source, C1, C2, search_tree_cls), C1, C2)
+
+    def next_hop_front(self, source, target, C1: float = float('inf'), C2: float = float('inf'), search_tree_cls: Type[SearchTreePQD] = SearchTreePQD) -> ParetoSet:
+        """
+        Finds Pareto-optimal solutions from source to a single target within C1, C2.
+        Only the overlay graph, the source region and the precomputed fronts of the target region are used.
+
+        Returns:
+        - ParetoSet: Solutions whose solution_state is the next hop from source.
+        """
+        fronts = self._search(source, C1, C2, search_tree_cls)
+        pareto_set = ParetoSet()
+        region = self.partition.get(target)
+        if target in fronts:
+            front = fronts[target]
+        elif region is not None and region != self.partition.get(source):
+            front = self._extend_fronts(fronts, region, target, C1, C2)
+        else:
+            front = []
+        for g1, g2, hop in front:
+            pareto_set.add_solution(BiObjSolution(hop, (g1, g2)))
+        return pareto_set
+
+    def _extend_fronts(self, fronts: Dict[Any, List[Tuple[float, float, Any]]], region: int, vertex, C1: float, C2: float) -> List[Tuple[float, float, Any]]:
+        """
+        Front of an interior vertex of a non-source region: boundary fronts extended by local fronts.
+        """
+        candidates = []
+        for boundary_vertex in self.boundary[region]:
+            local_front = self.local_fronts[boundary_vertex].get(vertex)
+            if boundary_vertex not in fronts or local_front is None:
+                continue
+            for g1, g2, hop in fronts[boundary_vertex]:
+                for local_g1, local_g2 in local_front:
+                    if g1 + local_g1 <= C1 and g2 + local_g2 <= C2:
+                        candidates.append((g1 + local_g1, g2 + local_g2, hop))
+        return _non_dominated(candidates)
+
+    @property
+    def overlay_edges_count(self) -> int:
+        return sum(len(edges) for edges in self.overlay.values())
+
+
+def _pareto_set(front: List[Tuple[float, float, Any]]) -> ParetoSet:
+    pareto_set = ParetoSet()
+    for g1, g2, hop in front:
+        pareto_set.add_solution(BiObjSolution(hop, (g1, g2)))
+    return pareto_set
+
+
+class NextHopFronts(Mapping):
+    """
+    Result of RegionOverlay.next_hop_fronts: vertex -> ParetoSet of (g1, g2) with next hops.
+
+    Vertices reached by the overlay search (the source region and boundary vertices) are stored as searched.
+    Interior vertices of other regions are overlay entries: their fronts are combined from the fronts of the
+    region's boundary vertices and the local fronts on first lookup, and cached. Iterating over the whole
+    mapping expands every reached region, which costs as much as the eager combination.
+    """
+
+    def __init__(self, overlay: RegionOverlay, source, fronts: Dict[Any, List[Tuple[float, float, Any]]], C1: float, C2: float):
+        self.overlay = overlay
+        self.fronts = fronts
+        self.C1, self.C2 = C1, C2
+        self._source_region = overlay.partition.get(source)
+        self._solutions: Dict[Any, ParetoSet] = {vertex: _pareto_set(front) for vertex, front in fronts.items()}
+        self._expanded_regions: Set[int] = set()
+
+    def _remote_region(self, vertex):
+        """
+        Region of an interior vertex of another region that has a reached boundary vertex, otherwise None.
+        """
+        region = self.overlay.partition.get(vertex)
+        if region is None or region == self._source_region or vertex in self.overlay.boundary[region]:
+            return None
+        if not any(boundary_vertex in self.fronts for boundary_vertex in self.overlay.boundary[region]):
+            return None
+        return region
+
+    def _expand(self, vertex) -> ParetoSet:
+        if vertex in self._solutions:
+            return self._solutions[vertex]
+        region = self._remote_region(vertex)
+        front = self.overlay._extend_fronts(self.fronts, region, vertex, self.C1, self.C2) if region is not None else []
+        pareto_set = self._solutions[vertex] = _pareto_set(front) if front else None
+        return pareto_set
+
+    def __getitem__(self, vertex) -> ParetoSet:
+        pareto_set = self._expand(vertex)
+        if pareto_set is None:
+            raise KeyError(vertex)
+        return pareto_set
+
+    def __contains__(self, vertex) -> bool:
+        return self._expand(vertex) is not None
+
+    def _expand_all(self) -> None:
+        for region, boundary_vertices in self.overlay.boundary.items():
+            if region == self._source_region or region in self._expanded_regions:
+                continue
+            self._expanded_regions.add(region)
+            for boundary_vertex in boundary_vertices:
+                if boundary_vertex in self.fronts:
+                    for vertex in self.overlay.local_fronts[boundary_vertex]:
+                        self._expand(vertex)
+
+    def __iter__(self) -> Iterator[Any]:
+        self._expand_all()
+        return (vertex for vertex, pareto_set in list(self._solutions.items()) if pareto_set is not None)
+
+    def __len__(self) -> int:
+        self._expand_all()
+        return sum(1 for pareto_set in self._solutions.values() if pareto_set is not None)
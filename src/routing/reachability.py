@@ -0,0 +1,181 @@
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from mosp_algo.graph import Graph
+from routing.bod_optimizations import bod_stage_2_settled_states
+
+# Cost-bounded reachability index.
+# For fixed bounds (C1, C2) it stores, for every node, the sorted indices of the nodes it can reach (forward)
+# and of the nodes that can reach it (backward) by a path with total costs within C1 and C2.
+# Rows are kept in CSR form (offsets + one int64 column), so the index takes 8 bytes per reachable
+# (source, target) pair: small for bounds that keep searches local, but quadratic in the number of nodes
+# when the bounds let every node reach most others. A membership query is a binary search in one row.
+# Building runs one bounded search per node.
+#
+# File format: magic, <QQQQdd> nodes_count, node ids blob length, forward and backward pair counts, C1, C2,
+# pickled node ids, zero padding to a multiple of 8 bytes, then forward offsets[nodes_count + 1],
+# forward columns, backward offsets[nodes_count + 1], backward columns as little-endian int64.
+
+_MAGIC = b'MOSPREACH2'
+_HEADER = struct.Struct('<10sQQQQdd')
+
+Rows = Tuple[Sequence[int], Sequence[int]] # (offsets, columns)
+
+
+class ReachabilityIndex:
+    """
+    Forward and backward (C1, C2)-bounded reachability of every node.
+    A loaded index keeps its file memory-mapped until close() (or the end of a with block).
+
+    Attributes:
+        node_ids: Node id of every row/column index.
+        C1, C2: Cost bounds the index was built for.
+    """
+
+    def __init__(self, node_ids: List[Any], C1: float, C2: float, forward: Rows, backward: Rows):
+        self.node_ids = node_ids
+        self.node_index: Dict[Any, int] = {node: index for index, node in enumerate(node_ids)}
+        self.C1, self.C2 = C1, C2
+        self._forward = forward
+        self._backward = backward
+        self._mmap: Optional[mmap.mmap] = None
+        self._views: List[memoryview] = []
+
+    @classmethod
+    def build(cls, network_graph: Graph, C1: float, C2: float) -> 'ReachabilityIndex':
+        """
+        Builds the index with one bounded search per node; backward rows are obtained by
+        transposing the forward ones, so no searches on the reversed graph are needed.
+        """
+        node_ids = network_graph.freeze().node_ids
+        node_index = {node: index for index, node in enumerate(node_ids)}
+        forward_offsets, forward_columns = array('q', [0]), array('q')
+        for source in node_ids:
+            forward_columns.extend(sorted(node_index[state.node] for state in bod_stage_2_settled_states(network_graph, source, C1, C2)))
+            forward_offsets.append(len(forward_columns))
+
+        # transpose by counting sort: sources are visited in increasing order, so backward rows come out sorted
+        backward_offsets = array('q', [0]) * (len(node_ids) + 1)
+        for target_index in forward_columns:
+            backward_offsets[target_index + 1] += 1
+        for index in range(len(node_ids)):
+            backward_offsets[index + 1] += backward_offsets[index]
+        backward_columns = array('q', [0]) * len(forward_columns)
+        positions = array('q', backward_offsets[:-1])
+        for source_index in range(len(node_ids)):
+            for position in range(forward_offsets[source_index], forward_offsets[source_index + 1]):
+                target_index = forward_columns[position]
+                backward_columns[positions[target_index]] = source_index
+                positions[target_index] += 1
+        return cls(node_ids, C1, C2, (forward_offsets, forward_columns), (backward_offsets, backward_columns))
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __enter__(self) -> 'ReachabilityIndex':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmaps the file of a loaded index; the index can't be queried afterwards. Does nothing for a built index.
+        """
+        if self._mmap is None:
+            return
+        empty = (array('q', [0]) * (len(self.node_ids) + 1), array('q'))
+        self._forward = self._backward = empty
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+        self._mmap = None
+
+    @property
+    def pairs_count(self) -> int:
+        """
+        Number of stored (source, target) pairs in each direction.
+        """
+        return len(self._forward[1])
+
+    def _row(self, rows: Rows, row: int) -> Sequence[int]:
+        offsets, columns = rows
+        return columns[offsets[row]:offsets[row + 1]]
+
+    def can_reach(self, source, target) -> bool:
+        """
+        True if target is reachable from source within C1, C2. Unknown nodes reach nothing.
+        """
+        source_index, target_index = self.node_index.get(source), self.node_index.get(target)
+        if source_index is None or target_index is None:
+            return False
+        offsets, columns = self._forward
+        end = offsets[source_index + 1]
+        position = bisect_left(columns, target_index, offsets[source_index], end)
+        return position < end and columns[position] == target_index
+
+    def reachable_from(self, source) -> List[Any]:
+        """
+        All nodes reachable from source within C1, C2 (source included).
+        """
+        source_index = self.node_index.get(source)
+        return [] if source_index is None else [self.node_ids[index] for index in self._row(self._forward, source_index)]
+
+    def senders_to(self, target) -> List[Any]:
+        """
+        All nodes from which target can be reached within C1, C2 (target included).
+        """
+        target_index = self.node_index.get(target)
+        return [] if target_index is None else [self.node_ids[index] for index in self._row(self._backward, target_index)]
+
+    def save(self, file_path: str) -> None:
+        node_ids_blob = pickle.dumps(self.node_ids, protocol=pickle.HIGHEST_PROTOCOL)
+        header = _HEADER.pack(_MAGIC, len(self.node_ids), len(node_ids_blob), len(self._forward[1]), len(self._backward[1]), self.C1, self.C2)
+        with open(file_path, 'wb') as file:
+            file.write(header)
+            file.write(node_ids_blob)
+            file.write(b'\0' * (-(len(header) + len(node_ids_blob)) % 8))
+            for column in (*self._forward, *self._backward):
+                column = array('q', column)
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                column.tofile(file)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'ReachabilityIndex':
+        """
+        Loads an index. Rows are memory-mapped, so loading does not read them into memory.
+        """
+        with open(file_path, 'rb') as file:
+            magic, nodes_count, node_ids_size, forward_count, backward_count, C1, C2 = _HEADER.unpack(file.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"File {file_path} is not a reachability index")
+            node_ids = pickle.loads(file.read(node_ids_size))
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = _HEADER.size + node_ids_size
+        offset += -offset % 8
+        view = memoryview(mapped)
+        views = [view]
+        columns = []
+        for count in (nodes_count + 1, forward_count, nodes_count + 1, backward_count):
+            if sys.byteorder == 'big':
+                column = array('q', view[offset:offset + count * 8])
+                column.byteswap()
+            else:
+                column = view[offset:offset + count * 8].cast('q')
+                views.append(column)
+            columns.append(column)
+            offset += count * 8
+        index = cls(node_ids, C1, C2, (columns[0], columns[1]), (columns[2], columns[3]))
+        index._mmap = mapped
+        index._views = views
+        return index
+
+    def matches(self, C1: float, C2: float) -> bool:
+        return (self.C1, self.C2) == (C1, C2)
@@ -0,0 +1,23 @@
+import os
+import pytest
+from mosp_algo.graph import Graph
+
+@pytest.fixture
+def simple_graph():
+    test_graph = Graph()
+    test_graph.add_edge(0, 2, 1, 5)
+    test_graph.add_edge(0, 4, 5, 1)
+    test_graph.add_edge(2, 3, 1, 4)
+    test_graph.add_edge(2, 5, 1, 2)
+    test_graph.add_edge(2, 5, 2, 1)
+    test_graph.add_edge(4, 3, 1, 3)
+    test_graph.add_edge(3, 1, 9, 3)
+    test_graph.add_edge(4, 1, 2, 1)
+    test_graph.add_edge(5, 1, 1, 1)
+    return test_graph
+
+@pytest.fixture
+def test_graph():
+    test_graph = Graph()
+    test_graph.read_from_file(os.path.join(os.path.dirname(__file__), 'test_graph_dbr.txt'))
+    return test_graph
@@ -0,0 +1,263 @@
+import logging
+import random
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from mosp_algo.bod import bod, bod_indexed, bod_iter
+from mosp_algo.bod_compiled import bod_accelerated
+from mosp_algo.graph import Graph
+from mosp_algo.pareto_set import ParetoSet
+from mosp_algo.search_tree_pqd import SearchTreePQD
+from mosp_algo.search_tree_spilling import SpillingSearchTree
+from mosp_task_generator.topologies import TOPOLOGIES
+from routing.bod_optimizations import bod_limited
+from routing.partitioned_routing import RegionOverlay
+
+# Differential testing harness: every registered engine is run with every registered search tree and
+# Pareto set class on seeded random graphs and its per-node Pareto fronts are compared with the reference bod.
+# Failing cases are shrunk to minimal graphs; per-engine speed ratios against bod are logged.
+#
+# Run: python -m tests.differential --seeds 200
+
+logger = logging.getLogger(__name__)
+
+Fronts = Dict[Any, Set[Tuple[float, float]]]
+Engine = Callable[[Graph, Any, Type[SearchTreePQD], Type[ParetoSet]], Dict[Any, ParetoSet]]
+Combination = Tuple[str, str, str] # engine, search tree, Pareto set
+
+REFERENCE_ENGINE = "bod"
+ENGINES: Dict[str, Engine] = {}
+SEARCH_TREES: Dict[str, Type[SearchTreePQD]] = {}
+SEARCH_TREE_ENGINES: Dict[str, Optional[Set[str]]] = {} # engines a search tree supports (None: all)
+REFERENCE_PARETO_SET = "pareto_set"
+PARETO_SETS: Dict[str, Type[ParetoSet]] = {}
+PARETO_SET_ENGINES: Dict[str, Optional[Set[str]]] = {} # engines that collect results in a given Pareto set class (None: all)
+# engines that pass pareto_set_cls on to the search; the others always collect into ParetoSet
+PARETO_SET_CLS_ENGINES = [REFERENCE_ENGINE, "bod_indexed", "bod_limited"]
+
+
+def register_engine(name: str, engine: Engine) -> None:
+    """
+    Registers a search engine: a callable (graph, start_node, search_tree_cls, pareto_set_cls) -> Dict[node, ParetoSet].
+    """
+    ENGINES[name] = engine
+
+
+def register_search_tree(name: str, search_tree_cls: Type[SearchTreePQD], engines: Optional[Iterable[str]] = None) -> None:
+    """
+    Registers a search tree class. engines limits it to the engines whose state classes it can hold (default: all).
+    """
+    SEARCH_TREES[name] = search_tree_cls
+    SEARCH_TREE_ENGINES[name] = set(engines) if engines is not None else None
+
+
+def register_pareto_set(name: str, pareto_set_cls: Type[ParetoSet], engines: Optional[Iterable[str]] = PARETO_SET_CLS_ENGINES) -> None:
+    """
+    Registers a Pareto set class. engines limits it to the engines that collect their results in it
+    (default: PARETO_SET_CLS_ENGINES; None: all).
+    """
+    PARETO_SETS[name] = pareto_set_cls
+    PARETO_SET_ENGINES[name] = set(engines) if engines is not None else None
+
+
+def supports(search_tree: str, engine: str, pareto_set: str = REFERENCE_PARETO_SET) -> bool:
+    return all(engines is None or engine in engines
+               for engines in (SEARCH_TREE_ENGINES.get(search_tree), PARETO_SET_ENGINES.get(pareto_set)))
+
+
+def _bod_iter_engine(graph: Graph, start_node, search_tree_cls: Type[SearchTreePQD], pareto_set_cls: Type[ParetoSet]) -> Fronts:
+    fronts: Fronts = defaultdict(set)
+    for node, g1, g2, _ in bod_iter(graph, start_node, search_tree_cls):
+        fronts[node].add((g1, g2))
+    return fronts
+
+
+register_engine(REFERENCE_ENGINE, bod)
+register_engine("bod_iter", _bod_iter_engine)
+register_engine("bod_indexed", lambda graph, start_node, search_tree_cls, pareto_set_cls: bod_indexed(graph.freeze(), start_node, search_tree_cls, pareto_set_cls))
+register_engine("bod_accelerated", lambda graph, start_node, search_tree_cls, pareto_set_cls: bod_accelerated(graph, start_node, search_tree_cls))
+register_engine("bod_limited", lambda graph, start_node, search_tree_cls, pareto_set_cls: bod_limited(graph, start_node, float('inf'), float('inf'), search_tree_cls, pareto_set_cls))
+register_engine("partitioned", lambda graph, start_node, search_tree_cls, pareto_set_cls: RegionOverlay.build(graph, 4).next_hop_fronts(start_node, search_tree_cls=search_tree_cls))
+register_pareto_set(REFERENCE_PARETO_SET, ParetoSet, engines=None)
+register_search_tree("pqd", SearchTreePQD)
+# a tiny cap makes every case spill and merge runs
+register_search_tree("spilling", SpillingSearchTree.configured(8, block_records=1))
+
+
+def to_fronts(solutions) -> Fronts:
+    """
+    Normalizes engine output (Dict[node, ParetoSet] or Dict[node, set of values]) to sets of cost vectors.
+    """
+    fronts = {}
+    for node, front in solutions.items():
+        values = front.get_solutions(values=True) if hasattr(front, 'get_solutions') else set(front)
+        if values:
+            fronts[node] = values
+    return fronts
+
+
+def compare_fronts(expected: Fronts, actual: Fronts) -> Optional[str]:
+    """
+    Returns a description of the first difference between two sets of fronts, or None if they are identical.
+    """
+    for node in sorted(expected.keys() | actual.keys(), key=repr):
+        expected_front, actual_front = expected.get(node, set()), actual.get(node, set())
+        if expected_front != actual_front:
+            return (f"node {node}: missing {sorted(expected_front - actual_front)}, "
+                    f"unexpected {sorted(actual_front - expected_front)}")
+    return None
+
+
+def random_case(seed: int, max_nodes: int = 24, max_cost: int = 6) -> Tuple[Graph, Any]:
+    """
+    Seeded random test case: a small graph of a random topology with low integer costs
+    (to provoke ties) and a random start node.
+    """
+    rng = random.Random(seed)
+    topology = rng.choice(sorted(TOPOLOGIES))
+    if topology == "ring":
+        edges = TOPOLOGIES[topology](rings=rng.randint(1, 3), ring_size=rng.randint(3, max_nodes // 3), seed=seed, max_cost=max_cost)
+    elif topology == "corridor":
+        edges = TOPOLOGIES[topology](corridors=rng.randint(1, 3), length=rng.randint(2, max_nodes // 3), cross_step=rng.randint(1, 3), seed=seed, max_cost=max_cost)
+    elif topology == "bridge":
+        edges = TOPOLOGIES[topology](cluster_size=rng.randint(2, max_nodes // 2), edges_per_node=rng.randint(1, 3), bridges=rng.randint(1, 2), seed=seed, max_cost=max_cost)
+    else:
+        edges = TOPOLOGIES[topology](nodes_count=rng.randint(2, max_nodes), edges_per_node=rng.randint(1, 4), seed=seed, max_cost=max_cost)
+    graph = edges.to_graph()
+    return graph, rng.choice(sorted(graph.vertices))
+
+
+def _graph_from_edges(edges: List[Tuple[Any, Any, float, float]]) -> Graph:
+    graph = Graph()
+    for vertex1, vertex2, cost1, cost2 in edges:
+        graph.add_edge(vertex1, vertex2, cost1, cost2)
+    return graph
+
+
+def shrink(graph: Graph, start_node, is_failing: Callable[[Graph, Any], bool]) -> Graph:
+    """
+    Greedily removes single edges while the case keeps failing, until no edge can be removed.
+    """
+    edges = [(vertex1, vertex2, cost1, cost2) for vertex1, vertex2, costs in graph.get_edges() for cost1, cost2 in costs]
+    removed = True
+    while removed:
+        removed = False
+        for position in range(len(edges) - 1, -1, -1):
+            candidate = edges[:position] + edges[position + 1:]
+            if is_failing(_graph_from_edges(candidate), start_node):
+                edges = candidate
+                removed = True
+    return _graph_from_edges(edges)
+
+
+class Mismatch:
+    """
+    A failing case: engine output differs from the reference on the (shrunk) graph.
+    """
+
+    def __init__(self, seed: int, engine: str, search_tree: str, pareto_set: str, start_node, graph: Graph, difference: str):
+        self.seed = seed
+        self.engine = engine
+        self.search_tree = search_tree
+        self.pareto_set = pareto_set
+        self.start_node = start_node
+        self.graph = graph
+        self.difference = difference
+
+    def __str__(self) -> str:
+        return (f"seed {self.seed}: {self.engine}/{self.search_tree}/{self.pareto_set} from {self.start_node}: {self.difference}\n"
+                f"{self.graph}")
+
+
+class FuzzReport:
+    def __init__(self):
+        self.cases = 0
+        self.mismatches: List[Mismatch] = []
+        self.timings: Dict[Combination, float] = defaultdict(float)
+
+    @property
+    def speed_ratios(self) -> Dict[Combination, float]:
+        """
+        Total engine time divided by total reference time for every engine/search tree/Pareto set combination.
+        """
+        reference = (REFERENCE_ENGINE, "pqd", REFERENCE_PARETO_SET)
+        reference_time = self.timings.get(reference, 0)
+        return {combination: seconds / reference_time if reference_time else float('inf')
+                for combination, seconds in self.timings.items()}
+
+
+def _run(engine: Engine, graph: Graph, start_node, search_tree_cls: Type[SearchTreePQD], pareto_set_cls: Type[ParetoSet]) -> Tuple[Fronts, Optional[str]]:
+    try:
+        return to_fronts(engine(graph, start_node, search_tree_cls, pareto_set_cls)), None
+    except Exception as e:
+        return {}, f"raised {e.__class__.__name__}: {e}"
+
+
+def _reference_fronts(graph: Graph, start_node) -> Fronts:
+    return to_fronts(ENGINES[REFERENCE_ENGINE](graph, start_node, SearchTreePQD, ParetoSet))
+
+
+def fuzz(seeds: Iterable[int], engines: Optional[Iterable[str]] = None, search_trees: Optional[Iterable[str]] = None,
+         pareto_sets: Optional[Iterable[str]] = None) -> FuzzReport:
+    """
+    Runs the selected engine/search tree/Pareto set combinations against the reference bod on seeded random cases.
+    The reference engine itself is also run with the other search trees and Pareto sets unless engines are given.
+    """
+    engines = list(engines) if engines is not None else list(ENGINES)
+    search_trees = list(search_trees) if search_trees is not None else list(SEARCH_TREES)
+    pareto_sets = list(pareto_sets) if pareto_sets is not None else list(PARETO_SETS)
+    reference = (REFERENCE_ENGINE, "pqd", REFERENCE_PARETO_SET)
+    combinations = [(engine_name, tree_name, pareto_set_name)
+                    for engine_name in engines for tree_name in search_trees for pareto_set_name in pareto_sets
+                    if supports(tree_name, engine_name, pareto_set_name) and (engine_name, tree_name, pareto_set_name) != reference]
+    report = FuzzReport()
+
+    for seed in seeds:
+        graph, start_node = random_case(seed)
+        report.cases += 1
+        started = time.perf_counter()
+        expected = _reference_fronts(graph, start_node)
+        report.timings[reference] += time.perf_counter() - started
+
+        for combination in combinations:
+            engine_name, tree_name, pareto_set_name = combination
+            engine, search_tree_cls, pareto_set_cls = ENGINES[engine_name], SEARCH_TREES[tree_name], PARETO_SETS[pareto_set_name]
+            started = time.perf_counter()
+            actual, error = _run(engine, graph, start_node, search_tree_cls, pareto_set_cls)
+            report.timings[combination] += time.perf_counter() - started
+            difference = error or compare_fronts(expected, actual)
+            if difference is None:
+                continue
+
+            def is_failing(candidate: Graph, candidate_start) -> bool:
+                candidate_actual, candidate_error = _run(engine, candidate, candidate_start, search_tree_cls, pareto_set_cls)
+                return candidate_error is not None or compare_fronts(_reference_fronts(candidate, candidate_start), candidate_actual) is not None
+
+            shrunk = shrink(graph, start_node, is_failing)
+            shrunk_actual, shrunk_error = _run(engine, shrunk, start_node, search_tree_cls, pareto_set_cls)
+            shrunk_difference = shrunk_error or compare_fronts(_reference_fronts(shrunk, start_node), shrunk_actual)
+            report.mismatches.append(Mismatch(seed, engine_name, tree_name, pareto_set_name, start_node, shrunk, shrunk_difference))
+
+    for (engine_name, tree_name, pareto_set_name), ratio in sorted(report.speed_ratios.items()):
+        logger.info("%s/%s/%s: %.2fx reference time", engine_name, tree_name, pareto_set_name, ratio)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Differential testing of search engines against the reference bod.')
+    parser.add_argument('--seeds', type=int, default=100, help='Number of random cases')
+    parser.add_argument('--first-seed', type=int, default=0, help='Seed of the first case')
+    parser.add_argument('--engine', action='append', help='Engine to test (default: all registered)')
+    parser.add_argument('--search-tree', action='append', help='Search tree to test (default: all registered)')
+    parser.add_argument('--pareto-set', action='append', help='Pareto set class to test (default: all registered)')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    fuzz_report = fuzz(range(args.first_seed, args.first_seed + args.seeds), engines=args.engine,
+                       search_trees=args.search_tree, pareto_sets=args.pareto_set)
+    print(f"{fuzz_report.cases} cases, {len(fuzz_report.mismatches)} mismatches")
+    for mismatch in fuzz_report.mismatches:
+        print(mismatch)
@@ -0,0 +1,8 @@
+# Helpers shared by the test modules.
+
+
+def fronts(solutions):
+    """
+    Pareto fronts of a search result as node -> set of (g1, g2).
+    """
+    return {node: pareto_set.get_solutions(values=True) for node, pareto_set in solutions.items()}
@@ -1,6 +1,8 @@
 import pytest
-from mosp_algo.bod import bod
+from mosp_algo.bod import bod, bod_dynamic, bod_indexed, bod_iter
+from mosp_algo.cost_provider import StaticCostProvider
 from mosp_algo.graph import Graph
+from mosp_algo.search_tree_pqd import construct_path
 
 @pytest.fixture
 def cycle_graph():
@@ -13,20 +15,6 @@ def cycle_graph():
     test_graph.add_edge(4, 3, 1, 1)
     return test_graph
 
-@pytest.fixture
-def simple_graph():
-    test_graph = Graph()
-    test_graph.add_edge(0, 2, 1, 5)
-    test_graph.add_edge(0, 4, 5, 1)
-    test_graph.add_edge(2, 3, 1, 4)
-    test_graph.add_edge(2, 5, 1, 2)
-    test_graph.add_edge(2, 5, 2, 1)
-    test_graph.add_edge(4, 3, 1, 3)
-    test_graph.add_edge(3, 1, 9, 3)
-    test_graph.add_edge(4, 1, 2, 1)
-    test_graph.add_edge(5, 1, 1, 1)
-    return test_graph
-
 def test_dijkstra_base_case(simple_graph):
     start_state = 0
     solutions = bod(simple_graph, start_state)
@@ -49,4 +37,45 @@ def test_dijkstra_cycle_graph(cycle_graph):
     start_state = 1
     solutions = bod(cycle_graph, start_state)
     assert len(solutions) == 4
-    assert solutions[3].get_solutions(values=True) == {(2, 9), (7, 7)}
\ No newline at end of file
+    assert solutions[3].get_solutions(values=True) == {(2, 9), (7, 7)}
+
+def test_bod_iter_matches_bod(simple_graph):
+    solutions = bod(simple_graph, 0)
+    streamed = {}
+    for node, g1, g2, parent in bod_iter(simple_graph, 0):
+        streamed.setdefault(node, set()).add((g1, g2))
+    assert streamed == {node: solutions[node].get_solutions(values=True) for node in solutions}
+
+def test_bod_iter_parents(simple_graph):
+    parents = {(node, g1, g2): parent for node, g1, g2, parent in bod_iter(simple_graph, 0)}
+    assert parents[(0, 0, 0)] is None
+    assert parents[(1, 7, 2)] == 4
+    assert parents[(5, 3, 6)] == 2
+
+def test_bod_iter_is_lazy(simple_graph):
+    stream = bod_iter(simple_graph, 0)
+    assert next(stream) == (0, 0, 0, None)
+    assert next(stream) == (2, 1, 5, 0)
+
+
+@pytest.mark.parametrize("graph_fixture, start_state", [("simple_graph", 0), ("simple_graph", 1), ("cycle_graph", 1)])
+def test_bod_indexed_matches_bod(request, graph_fixture, start_state):
+    graph = request.getfixturevalue(graph_fixture)
+    solutions = bod(graph, start_state)
+    indexed_solutions = bod_indexed(graph.freeze(), start_state)
+    assert indexed_solutions.keys() == solutions.keys()
+    for node in solutions:
+        assert indexed_solutions[node].get_solutions(values=True) == solutions[node].get_solutions(values=True)
+
+def test_bod_indexed_paths_use_external_ids(simple_graph):
+    solutions = bod_indexed(simple_graph.freeze(), 0)
+    paths = {sol.solution_values: [state.node for state in construct_path(sol.solution_state)] for sol in solutions[1].get_solutions()}
+    assert paths == {(3, 8): [0, 2, 5, 1], (4, 7): [0, 2, 5, 1], (7, 2): [0, 4, 1]}
+
+def test_start_node_outside_graph(simple_graph):
+    frozen = simple_graph.freeze()
+    expected = {"missing": {(0, 0)}}
+    assert {node: front.get_solutions(values=True) for node, front in bod(simple_graph, "missing").items()} == expected
+    assert {node: front.get_solutions(values=True) for node, front in bod_indexed(frozen, "missing").items()} == expected
+    solutions = bod_dynamic(frozen, "missing", StaticCostProvider(frozen))
+    assert {node: front.get_solutions(values=True) for node, front in solutions.items()} == expected
@@ -0,0 +1,52 @@
+import pytest
+from mosp_algo import bod_compiled as compiled
+from mosp_algo.bod import bod
+from mosp_algo.search_tree_pqd import SearchTreePQD, construct_path
+from tests.helpers import fronts
+
+def check_paths(graph, solutions):
+    for node, pareto_set in solutions.items():
+        for solution in pareto_set.solutions:
+            path = construct_path(solution.solution_state)
+            assert path[-1].node == node
+            for previous, state in zip(path, path[1:]):
+                costs = dict(graph.get_neighbors(previous.node))[state.node]
+                assert (state.g1 - previous.g1, state.g2 - previous.g2) in costs
+
+def test_python_kernel_matches_bod(test_graph):
+    pytest.importorskip("numpy")
+    frozen = test_graph.freeze()
+    for start in test_graph.vertices:
+        solutions = compiled.bod_compiled(frozen, start, kernel=compiled._bod_kernel)
+        assert fronts(solutions) == fronts(bod(test_graph, start))
+        check_paths(test_graph, solutions)
+
+@pytest.mark.skipif(not compiled.NUMBA_AVAILABLE, reason="numba is not installed")
+def test_compiled_kernel_matches_bod(test_graph):
+    frozen = test_graph.freeze()
+    for start in test_graph.vertices:
+        solutions = compiled.bod_compiled(frozen, start)
+        assert fronts(solutions) == fronts(bod(test_graph, start))
+        check_paths(test_graph, solutions)
+
+def test_accelerated_falls_back_without_numba(test_graph, monkeypatch):
+    monkeypatch.setattr(compiled, "NUMBA_AVAILABLE", False)
+    with pytest.raises(ImportError):
+        compiled.bod_compiled(test_graph.freeze(), 0)
+    assert fronts(compiled.bod_accelerated(test_graph, 0)) == fronts(bod(test_graph, 0))
+
+def test_accelerated_custom_search_tree(test_graph):
+    class CountingSearchTree(SearchTreePQD):
+        created = 0
+
+        def __init__(self):
+            super().__init__()
+            CountingSearchTree.created += 1
+
+    assert fronts(compiled.bod_accelerated(test_graph, 0, CountingSearchTree)) == fronts(bod(test_graph, 0))
+    assert CountingSearchTree.created == 1
+
+def test_start_node_outside_graph(test_graph):
+    frozen = test_graph.freeze()
+    assert fronts(compiled.bod_compiled(frozen, "missing", kernel=compiled._bod_kernel)) == {"missing": {(0, 0)}}
+    assert fronts(compiled.bod_accelerated(frozen, "missing")) == {"missing": {(0, 0)}}
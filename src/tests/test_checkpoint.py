@@ -0,0 +1,89 @@
+import os
+import pytest
+from routing.bod_optimizations import bod_stage_1
+from routing.checkpoint import ResumableStage1Search, TableLog, build_routing_tables
+from routing.greedy_routing import make_routing_table
+from routing.modeling_routing import make_routing_table as make_modeling_routing_table
+
+def test_make_routing_table_next_hops(test_graph):
+    table = make_routing_table(test_graph, 0, 10, 10)
+    neighbours = {neighbour for neighbour, _ in test_graph.get_neighbors(0)}
+    assert table.keys() == set(test_graph.vertices)
+    assert set(table.values()) <= neighbours
+    assert table[9] == 8
+
+def test_table_log_roundtrip(tmp_path):
+    table_log = TableLog(str(tmp_path / "tables.log"))
+    assert table_log.load() == {}
+    table_log.append(0, {1: 1, 2: 1})
+    table_log.append(1, {0: 0})
+    assert TableLog(table_log.file_path).load() == {0: {1: 1, 2: 1}, 1: {0: 0}}
+
+def test_table_log_drops_torn_record(tmp_path):
+    table_log = TableLog(str(tmp_path / "tables.log"))
+    table_log.append(0, {1: 1})
+    size = os.path.getsize(table_log.file_path)
+    table_log.append(1, {0: 0})
+    with open(table_log.file_path, 'r+b') as file:
+        file.truncate(os.path.getsize(table_log.file_path) - 3)
+    assert table_log.load() == {0: {1: 1}}
+    assert os.path.getsize(table_log.file_path) == size
+    table_log.append(2, {0: 1})
+    assert table_log.load() == {0: {1: 1}, 2: {0: 1}}
+
+def test_build_resumes_after_crash(test_graph, tmp_path):
+    checkpoint_path = str(tmp_path / "tables.log")
+    expected = {router: make_routing_table(test_graph, router, 6, 6) for router in test_graph.vertices}
+    calls = []
+
+    def crashing_builder(network_graph, router, C1, C2):
+        if len(calls) == 4:
+            raise RuntimeError("crash")
+        calls.append(router)
+        return make_routing_table(network_graph, router, C1, C2)
+
+    with pytest.raises(RuntimeError):
+        build_routing_tables(test_graph, 6, 6, checkpoint_path, table_builder=crashing_builder)
+    finished = list(calls)
+    calls.clear()
+    tables = build_routing_tables(test_graph, 6, 6, checkpoint_path, table_builder=lambda *args: calls.append(args[1]) or make_routing_table(*args))
+    assert tables == expected
+    assert not set(calls) & set(finished)
+    assert len(calls) == len(expected) - len(finished)
+
+def test_resumable_search_matches_stage_1(test_graph, tmp_path):
+    search_path = str(tmp_path / "search")
+    search = ResumableStage1Search(test_graph, 0, 8, 8)
+    steps = 0
+    while not search.run(3):
+        search.save(search_path)
+        search = ResumableStage1Search.load(search_path, test_graph)
+        steps += 1
+    assert steps > 1
+    expected = bod_stage_1(test_graph, 0, 8, 8)
+    assert search.solutions.keys() == expected.keys()
+    for node in expected:
+        assert {(solution.solution_values, solution.solution_state.next_node_in_path) for solution in search.solutions[node].get_solutions()} == \
+            {(solution.solution_values, solution.solution_state.next_node_in_path) for solution in expected[node].get_solutions()}
+
+def test_build_with_search_checkpoints(test_graph, tmp_path):
+    checkpoint_path = str(tmp_path / "tables.log")
+    tables = build_routing_tables(test_graph, 6, 6, checkpoint_path, search_checkpoint_steps=2)
+    assert tables == {router: make_routing_table(test_graph, router, 6, 6) for router in test_graph.vertices}
+    assert not os.path.exists(f"{checkpoint_path}.search")
+
+def test_build_resumes_saved_search(test_graph, tmp_path):
+    checkpoint_path = str(tmp_path / "tables.log")
+    search = ResumableStage1Search(test_graph, 0, 6, 6)
+    search.run(4)
+    search.save(f"{checkpoint_path}.search")
+    tables = build_routing_tables(test_graph, 6, 6, checkpoint_path, routers=[0], search_checkpoint_steps=100)
+    assert tables == {0: make_routing_table(test_graph, 0, 6, 6)}
+
+def test_search_checkpoints_reject_custom_table_builder(test_graph, tmp_path):
+    checkpoint_path = str(tmp_path / "tables.log")
+    with pytest.raises(ValueError):
+        build_routing_tables(test_graph, 10, 10, checkpoint_path, table_builder=make_modeling_routing_table, search_checkpoint_steps=5)
+    assert not os.path.exists(checkpoint_path)
+    tables = build_routing_tables(test_graph, 10, 10, checkpoint_path, table_builder=make_modeling_routing_table)
+    assert tables == {router: make_modeling_routing_table(test_graph, router, 10, 10) for router in test_graph.vertices}
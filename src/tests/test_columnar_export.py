@@ -0,0 +1,109 @@
+import math
+import os
+import pytest
+from mosp_algo.bod import bod
+from mosp_algo.graph import Graph
+from routing.bod_optimizations import bod_limited_path_store, bod_stage_1
+from routing.columnar_export import ColumnarWriter, load_pareto_fronts, load_routing_tables, open_chunks
+from routing.greedy_routing import make_routing_table
+
+def test_pareto_results_roundtrip(test_graph, tmp_path):
+    results = {source: bod(test_graph, source) for source in test_graph.vertices}
+    with ColumnarWriter(str(tmp_path), chunk_rows=50) as writer:
+        for source, solutions in results.items():
+            writer.add_pareto_results(source, solutions)
+    chunks = list(open_chunks(str(tmp_path)))
+    assert len(chunks) > 1 and all(len(chunk) <= 50 for chunk in chunks)
+    assert load_pareto_fronts(str(tmp_path)) == {source: {target: front.get_solutions(values=True) for target, front in solutions.items()}
+                                                 for source, solutions in results.items()}
+
+def test_next_hops_and_ranks(test_graph, tmp_path):
+    stage_1 = bod_stage_1(test_graph, 0, 10, 10)
+    solutions, _ = bod_limited_path_store(test_graph, 0, 10, 10)
+    with ColumnarWriter(str(tmp_path / "stage_1")) as writer:
+        writer.add_pareto_results(0, stage_1)
+    with ColumnarWriter(str(tmp_path / "store")) as writer:
+        writer.add_pareto_results(0, solutions)
+    rows_stage_1 = sorted(next(open_chunks(str(tmp_path / "stage_1"))).rows())
+    rows_store = sorted(next(open_chunks(str(tmp_path / "store"))).rows())
+    assert rows_stage_1 == rows_store
+    for source, target, g1, g2, next_hop, rank in rows_stage_1:
+        front = sorted(stage_1[target].get_solutions(values=True))
+        assert front[rank] == (g1, g2)
+        expected_next_hop = {solution.solution_values: solution.solution_state.next_node_in_path for solution in stage_1[target].solutions}[(g1, g2)]
+        assert next_hop == (-1 if expected_next_hop is None else expected_next_hop)
+
+def test_chunk_columns_are_memory_mapped(test_graph, tmp_path):
+    with ColumnarWriter(str(tmp_path)) as writer:
+        writer.add_pareto_results(0, bod(test_graph, 0))
+    chunk = next(open_chunks(str(tmp_path)))
+    assert isinstance(chunk.g1, memoryview) and chunk.g1.format == 'd'
+    assert list(chunk.source) == [0] * len(chunk)
+
+def test_routing_tables_roundtrip(test_graph, tmp_path):
+    tables = {router: make_routing_table(test_graph, router, 10, 10) for router in test_graph.vertices}
+    with ColumnarWriter(str(tmp_path)) as writer:
+        for router, table in tables.items():
+            writer.add_routing_table(router, table)
+    assert load_routing_tables(str(tmp_path)) == {router: table for router, table in tables.items() if table}
+    chunk = next(open_chunks(str(tmp_path)))
+    assert all(math.isnan(g1) for g1 in chunk.g1)
+
+def test_rejects_per_sender_tables(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarWriter(str(tmp_path)).add_routing_table(0, {1: {2: 3}})
+
+def test_rejects_rows_that_do_not_fit(tmp_path):
+    writer = ColumnarWriter(str(tmp_path))
+    writer.add_row(0, 1, 1.0, 2.0, 1, 0)
+    with pytest.raises(ValueError):
+        writer.add_row(0, "a", 1.0, 2.0, None, 0)
+    with pytest.raises(ValueError):
+        writer.add_row(-1, 1, 1.0, 2.0, None, 0)
+    with pytest.raises(ValueError):
+        writer.add_row(0, 1, "x", 2.0, None, 0)
+    writer.close()
+    assert list(next(open_chunks(str(tmp_path))).rows()) == [(0, 1, 1.0, 2.0, 1, 0)]
+
+def test_no_chunk_written_on_error(tmp_path):
+    graph = Graph()
+    graph.add_edge(0, "a", 1, 1)
+    with pytest.raises(ValueError):
+        with ColumnarWriter(str(tmp_path)) as writer:
+            writer.add_pareto_results(0, bod(graph, 0))
+    assert list(open_chunks(str(tmp_path))) == []
+
+def test_chunk_numbers_continue_after_gaps(tmp_path):
+    for rows in ([(0, 1)], [(0, 2)], [(0, 3)]):
+        with ColumnarWriter(str(tmp_path)) as writer:
+            for source, target in rows:
+                writer.add_row(source, target, 1.0, 1.0, target, 0)
+    os.remove(str(tmp_path / "part-00001.mcol"))
+    with ColumnarWriter(str(tmp_path)) as writer:
+        writer.add_row(0, 4, 1.0, 1.0, 4, 0)
+    assert sorted(os.listdir(str(tmp_path))) == ["part-00000.mcol", "part-00002.mcol", "part-00003.mcol"]
+    assert load_routing_tables(str(tmp_path)) == {0: {1: 1, 3: 3, 4: 4}}
+
+def test_chunks_are_ordered_by_number(tmp_path):
+    with ColumnarWriter(str(tmp_path), chunk_rows=1) as writer:
+        writer.add_row(0, 1, 1.0, 1.0, 1, 0)
+        writer.add_row(0, 1, 2.0, 2.0, 1, 0)
+    os.rename(str(tmp_path / "part-00000.mcol"), str(tmp_path / "part-99999.mcol"))
+    os.rename(str(tmp_path / "part-00001.mcol"), str(tmp_path / "part-100000.mcol"))
+    with ColumnarWriter(str(tmp_path)) as writer:
+        writer.add_row(0, 1, 3.0, 3.0, 1, 0)
+    assert os.path.exists(str(tmp_path / "part-100001.mcol"))
+    g1_values = []
+    for chunk in open_chunks(str(tmp_path)):
+        with chunk:
+            g1_values.extend(chunk.g1)
+    assert g1_values == [1.0, 2.0, 3.0]
+
+def test_chunk_close_unmaps_file(tmp_path):
+    with ColumnarWriter(str(tmp_path)) as writer:
+        writer.add_row(0, 1, 1.0, 2.0, 1, 0)
+    with next(open_chunks(str(tmp_path))) as chunk:
+        assert list(chunk.rows()) == [(0, 1, 1.0, 2.0, 1, 0)]
+    assert chunk._mmap is None
+    with pytest.raises(AttributeError):
+        chunk.source
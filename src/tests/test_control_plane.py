@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from routing.control_plane import RoutingService, apply_topology_update
+
+def test_apply_topology_update_keeps_old_graph(simple_graph):
+    new_graph = apply_topology_update(simple_graph, add_edges=[(0, 1, 1, 1)], remove_edges=[(4, 1)])
+    assert (1, 1) in new_graph.adjacency_list[0][1]
+    assert 1 not in new_graph.adjacency_list[4]
+    assert 1 not in simple_graph.adjacency_list[0]
+    assert 1 in simple_graph.adjacency_list[4]
+
+def test_route_and_coalescing(simple_graph):
+    async def scenario():
+        service = RoutingService(simple_graph, max_workers=1)
+        try:
+            results = await asyncio.gather(*(service.route(0, 1, 10, 10) for _ in range(3)))
+            return results, service.metrics.snapshot()
+        finally:
+            service.close()
+
+    results, metrics = asyncio.run(scenario())
+    version, routes = results[0]
+    assert version == 0
+    assert {(g1, g2) for g1, g2, _ in routes} == {(3, 8), (4, 7), (7, 2)}
+    assert [0, 4, 1] in [path for _, _, path in routes]
+    assert all(result == results[0] for result in results)
+    assert metrics["queries"] == 3
+    assert metrics["coalesced_queries"] == 2
+    assert metrics["queue_depth"] == 0
+
+def test_topology_update_versions(simple_graph):
+    async def scenario():
+        service = RoutingService(simple_graph, max_workers=1)
+        try:
+            version = await service.update_topology(add_edges=[(0, 1, 1, 1)])
+            return version, await service.route(0, 1, 10, 10)
+        finally:
+            service.close()
+
+    version, (route_version, routes) = asyncio.run(scenario())
+    assert version == route_version == 1
+    assert routes == [(1, 1, [0, 1])]
+
+def test_tcp_protocol(simple_graph):
+    async def scenario():
+        service = RoutingService(simple_graph, max_workers=1)
+        server = await service.serve()
+        try:
+            host, port = server.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            responses = []
+            for request in ({"op": "route", "source": 0, "target": 5, "C1": 10, "C2": 10}, {"op": "metrics"}, {"op": "unknown"}):
+                writer.write(json.dumps(request).encode() + b"\n")
+                await writer.drain()
+                responses.append(json.loads(await reader.readline()))
+            writer.close()
+            return responses
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+    route_response, metrics_response, error_response = asyncio.run(scenario())
+    assert sorted(route_response["routes"]) == [[2, 7, [0, 2, 5]], [3, 6, [0, 2, 5]]]
+    assert metrics_response["metrics"]["queries"] == 1
+    assert "error" in error_response
+
+def test_topology_updates_reuse_workers(simple_graph):
+    async def scenario():
+        service = RoutingService(simple_graph, max_workers=1, max_pending_updates=2)
+        try:
+            executor = service._executor
+            results = [await service.route(0, 1, 10, 10)]
+            await service.update_topology(add_edges=[(0, 1, 1, 1)])
+            results.append(await service.route(0, 1, 10, 10))
+            await service.update_topology(remove_edges=[(0, 1)])
+            results.append(await service.route(0, 1, 10, 10))
+            reused = service._executor is executor
+            await service.update_topology(add_edges=[(0, 1, 2, 2)]) # third pending update: the pool is restarted
+            results.append(await service.route(0, 1, 10, 10))
+            return results, reused, service._executor is executor
+        finally:
+            service.close()
+
+    results, reused, reused_after_limit = asyncio.run(scenario())
+    assert [version for version, _ in results] == [0, 1, 2, 3]
+    assert results[1][1] == [(1, 1, [0, 1])]
+    assert results[2][1] == results[0][1]
+    assert results[3][1] == [(2, 2, [0, 1])]
+    assert reused and not reused_after_limit
+
+def test_broken_pool_is_replaced(simple_graph):
+    async def scenario():
+        service = RoutingService(simple_graph, max_workers=1)
+        server = await service.serve()
+        try:
+            loop = asyncio.get_running_loop()
+            with pytest.raises(BrokenProcessPool):
+                await loop.run_in_executor(service._executor, os._exit, 1) # kill the worker
+            host, port = server.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            responses = []
+            for _ in range(2):
+                writer.write(json.dumps({"op": "route", "source": 0, "target": 5, "C1": 10, "C2": 10}).encode() + b"\n")
+                await writer.drain()
+                responses.append(json.loads(await reader.readline()))
+            writer.close()
+            return responses
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+    error_response, route_response = asyncio.run(scenario())
+    assert "error" in error_response
+    assert sorted(route_response["routes"]) == [[2, 7, [0, 2, 5]], [3, 6, [0, 2, 5]]]
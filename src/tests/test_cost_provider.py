@@ -0,0 +1,134 @@
+import random
+from bisect import bisect_right
+import pytest
+from mosp_algo.bod import bod, bod_dynamic
+from mosp_algo.cost_provider import CostProvider, LoadDependentCostProvider, StaticCostProvider, TimeSlicedCostProvider
+from mosp_algo.graph import Graph
+from mosp_task_generator.topologies import random_topology
+from tests.helpers import fronts
+
+def random_slices(frozen, slices_count, seed):
+    rng = random.Random(seed)
+    starts = [0] + sorted(rng.sample(range(1, 40), slices_count - 1))
+    costs1 = [[rng.randint(1, 9) for _ in range(frozen.edges_count)] for _ in range(slices_count)]
+    costs2 = [[rng.randint(1, 9) for _ in range(frozen.edges_count)] for _ in range(slices_count)]
+    return starts, costs1, costs2
+
+def brute_force_fronts(frozen, start_node, slice_starts, costs1, costs2, departure_time):
+    # every node is left immediately or when any later slice starts, at the costs of the slice it is left in
+    labels = {}
+    def extend(index, g1, g2, visited):
+        labels.setdefault(frozen.node_ids[index], set()).add((g1, g2))
+        time = departure_time + g1
+        departures = [time] + [start for start in slice_starts if start > time]
+        for edge in range(frozen.offsets[index], frozen.offsets[index + 1]):
+            neighbour = frozen.targets[edge]
+            if neighbour in visited:
+                continue
+            for departure in departures:
+                time_slice = max(bisect_right(slice_starts, departure) - 1, 0)
+                arrival = departure + costs1[time_slice][edge]
+                extend(neighbour, arrival - departure_time, g2 + costs2[time_slice][edge], visited | {neighbour})
+    start = frozen.node_index[start_node]
+    extend(start, 0, 0, {start})
+    return {node: {(g1, g2) for g1, g2 in values
+                   if not any((o1 <= g1 and o2 < g2) or (o1 < g1 and o2 <= g2) for o1, o2 in values)}
+            for node, values in labels.items()}
+
+def test_static_provider_matches_bod(test_graph):
+    frozen = test_graph.freeze()
+    provider = StaticCostProvider(frozen)
+    for start in test_graph.vertices:
+        assert fronts(bod_dynamic(frozen, start, provider, departure_time=17)) == fronts(bod(test_graph, start))
+
+def test_single_slice_matches_bod(test_graph):
+    frozen = test_graph.freeze()
+    provider = TimeSlicedCostProvider(frozen, [0], [frozen.costs1], [frozen.costs2])
+    assert fronts(bod_dynamic(frozen, 0, provider)) == fronts(bod(test_graph, 0))
+
+def test_waiting_for_faster_slice():
+    graph = Graph()
+    graph.add_edge("a", "b", 10, 1)
+    graph.add_edge("b", "c", 1, 1)
+    frozen = graph.freeze()
+    edge_ab = frozen.offsets[frozen.node_index["a"]]
+    costs1 = [[10, 1], [1, 5]] if edge_ab == 0 else [[1, 10], [5, 1]]
+    provider = TimeSlicedCostProvider(frozen, [0, 2], costs1, [[1, 1], [2, 2]])
+    assert provider.edge_options(edge_ab, 0) == [(3, 2), (10, 1)]   # wait until t=2 and arrive at 3, or go now
+    assert provider.edge_options(edge_ab, 2.5) == [(1, 2)]
+    solutions = fronts(bod_dynamic(frozen, "a", provider))
+    assert solutions["b"] == {(3, 2), (10, 1)}
+    assert solutions["c"] == {(8, 4), (15, 3)}                      # b->c is in its slow slice either way
+    assert fronts(bod_dynamic(frozen, "a", provider, departure_time=-5))["b"] == {(8, 2), (10, 1)}
+
+def test_waiting_keeps_cheaper_immediate_option():
+    graph = Graph()
+    graph.add_edge("a", "b", 10, 1)
+    frozen = graph.freeze()
+    provider = TimeSlicedCostProvider(frozen, [0, 2], [[10], [1]], [[1], [5]])
+    assert provider.edge_options(0, 0) == [(3, 5), (10, 1)]
+    assert fronts(bod_dynamic(frozen, "a", provider))["b"] == {(3, 5), (10, 1)}
+
+def test_second_costs_may_decrease_over_time():
+    graph = Graph()
+    graph.add_edge("a", "b", 1, 5)
+    graph.add_edge("b", "c", 1, 5)
+    frozen = graph.freeze()
+    provider = TimeSlicedCostProvider(frozen, [0, 4, 8], [[1, 1], [1, 1], [1, 1]], [[5, 5], [3, 3], [1, 1]])
+    assert provider.edge_options(0, 0) == [(1, 5), (5, 3), (9, 1)]
+    assert fronts(bod_dynamic(frozen, "a", provider))["c"] == {(2, 10), (5, 8), (6, 6), (9, 4), (10, 2)}
+
+@pytest.mark.parametrize("seed", range(5))
+def test_time_sliced_arrivals_are_fifo(seed):
+    frozen = random_topology(nodes_count=6, edges_per_node=2, seed=seed, max_cost=9).to_graph().freeze()
+    provider = TimeSlicedCostProvider(frozen, *random_slices(frozen, 4, seed))
+    for edge in range(frozen.edges_count):
+        arrivals = [time / 4 + provider.edge_options(edge, time / 4)[0][0] for time in range(-8, 200)]
+        assert arrivals == sorted(arrivals)
+
+@pytest.mark.parametrize("seed", range(8))
+def test_time_sliced_matches_brute_force(seed):
+    graph = random_topology(nodes_count=7, edges_per_node=2, seed=seed, max_cost=9).to_graph()
+    frozen = graph.freeze()
+    slices = random_slices(frozen, 3, seed)
+    start = sorted(graph.vertices)[0]
+    provider = TimeSlicedCostProvider(frozen, *slices)
+    assert fronts(bod_dynamic(frozen, start, provider, departure_time=3)) == brute_force_fronts(frozen, start, *slices, 3)
+
+def test_slice_costs_are_cached_per_search(test_graph):
+    frozen = test_graph.freeze()
+
+    class CountingProvider(CostProvider):
+        calls = 0
+
+        def time_slice(self, time):
+            return int(time // 5)
+
+        def slice_costs(self, time_slice):
+            CountingProvider.calls += 1
+            return StaticCostProvider(frozen).slice_costs(time_slice)
+
+    solutions = bod_dynamic(frozen, 0, CountingProvider())
+    assert fronts(solutions) == fronts(bod(test_graph, 0))
+    slices = {int(solution.g1 // 5) for pareto_set in solutions.values() for solution in pareto_set.solutions}
+    assert CountingProvider.calls <= len(slices)
+
+def test_load_dependent_costs(test_graph):
+    frozen = test_graph.freeze()
+    capacities = [10.0] * frozen.edges_count
+    provider = LoadDependentCostProvider(frozen, [0.0] * frozen.edges_count, capacities)
+    assert fronts(bod_dynamic(frozen, 0, provider)) == fronts(bod(test_graph, 0))
+    provider.update_loads([10.0] * frozen.edges_count)
+    assert list(provider.slice_costs(0).costs1) == pytest.approx([cost * 1.15 for cost in frozen.costs1])
+    with pytest.raises(ValueError):
+        provider.update_loads([1.0])
+
+def test_time_sliced_validation(test_graph):
+    frozen = test_graph.freeze()
+    costs = [frozen.costs1, frozen.costs1]
+    with pytest.raises(ValueError):
+        TimeSlicedCostProvider(frozen, [0, 0], costs, costs)
+    with pytest.raises(ValueError):
+        TimeSlicedCostProvider(frozen, [0], costs, costs)
+    with pytest.raises(ValueError):
+        TimeSlicedCostProvider(frozen, [0], [[1.0]], [[1.0]])
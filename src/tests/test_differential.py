@@ -0,0 +1,79 @@
+import pytest
+from mosp_algo.bod import bod
+from mosp_algo.graph import Graph
+from mosp_algo.pareto_set import ParetoSet
+from tests.differential import (ENGINES, PARETO_SET_CLS_ENGINES, PARETO_SET_ENGINES, PARETO_SETS, SEARCH_TREES, compare_fronts, fuzz,
+                                random_case, register_engine, register_pareto_set, shrink, to_fronts)
+
+def test_registered_engines_match_reference():
+    report = fuzz(range(60))
+    assert report.cases == 60
+    assert [str(mismatch) for mismatch in report.mismatches] == []
+    assert set(engine for engine, _, _ in report.speed_ratios) == set(ENGINES)
+    assert set(tree for _, tree, _ in report.speed_ratios) == set(SEARCH_TREES)
+    assert set(pareto_set for _, _, pareto_set in report.speed_ratios) == set(PARETO_SETS)
+    assert ("partitioned", "spilling", "pareto_set") in report.speed_ratios
+
+def test_random_case_is_seeded():
+    first_graph, first_start = random_case(11)
+    second_graph, second_start = random_case(11)
+    assert first_start == second_start
+    assert first_graph.get_edges() == second_graph.get_edges()
+
+def test_compare_fronts():
+    assert compare_fronts({1: {(1, 2)}}, {1: {(1, 2)}}) is None
+    assert compare_fronts({1: {(1, 2)}}, {1: {(2, 1)}}) == "node 1: missing [(1, 2)], unexpected [(2, 1)]"
+    assert compare_fronts({}, {2: {(0, 0)}}) == "node 2: missing [], unexpected [(0, 0)]"
+
+@pytest.fixture
+def broken_engine():
+    def drop_worst_solution(graph, start_node, search_tree_cls, pareto_set_cls):
+        fronts = to_fronts(bod(graph, start_node))
+        for node, front in fronts.items():
+            if len(front) > 1:
+                front.discard(max(front))
+        return fronts
+
+    register_engine("broken", drop_worst_solution)
+    yield "broken"
+    del ENGINES["broken"]
+
+def test_fuzz_reports_and_shrinks_mismatches(broken_engine):
+    report = fuzz(range(30), engines=[broken_engine])
+    assert report.mismatches
+    for mismatch in report.mismatches:
+        assert mismatch.difference.startswith("node")
+        # The shrunk graph is minimal: removing any single edge makes the case pass
+        edges = [(v1, v2, c1, c2) for v1, v2, costs in mismatch.graph.get_edges() for c1, c2 in costs]
+        for position in range(len(edges)):
+            smaller = Graph()
+            for v1, v2, c1, c2 in edges[:position] + edges[position + 1:]:
+                smaller.add_edge(v1, v2, c1, c2)
+            assert compare_fronts(to_fronts(bod(smaller, mismatch.start_node)), to_fronts(ENGINES[broken_engine](smaller, mismatch.start_node, None, None))) is None
+
+class FirstSolutionOnly(ParetoSet):
+    def add_solution(self, solution) -> bool:
+        if self.solutions:
+            return False
+        return super().add_solution(solution)
+
+@pytest.fixture
+def broken_pareto_set():
+    register_pareto_set("first_only", FirstSolutionOnly)
+    yield "first_only"
+    del PARETO_SETS["first_only"], PARETO_SET_ENGINES["first_only"]
+
+def test_fuzz_cross_checks_pareto_sets(broken_pareto_set):
+    report = fuzz(range(30), search_trees=["pqd"])
+    assert report.mismatches
+    assert {mismatch.pareto_set for mismatch in report.mismatches} == {broken_pareto_set}
+    assert {mismatch.engine for mismatch in report.mismatches} == set(PARETO_SET_CLS_ENGINES)
+
+def test_shrink_keeps_failure():
+    graph, start_node = random_case(3)
+    target = max(bod(graph, start_node), key=lambda node: len(bod(graph, start_node)[node].solutions))
+    is_failing = lambda candidate, candidate_start: len(bod(candidate, candidate_start)[target].solutions) > 1
+    assert is_failing(graph, start_node)
+    shrunk = shrink(graph, start_node, is_failing)
+    assert is_failing(shrunk, start_node)
+    assert len(bod(shrunk, start_node)[target].solutions) == 2
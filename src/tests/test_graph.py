@@ -0,0 +1,47 @@
+import pytest
+from mosp_algo.graph import Graph, non_dominated_costs
+
+def test_non_dominated_costs():
+    assert non_dominated_costs([(3, 1), (1, 3), (2, 2), (1, 3), (2, 3), (4, 4)]) == [(1, 3), (2, 2), (3, 1)]
+    assert non_dominated_costs([]) == []
+
+def test_add_edge_keeps_parallel_edges_by_default():
+    graph = Graph()
+    graph.add_edge(0, 1, 1, 1)
+    graph.add_edge(0, 1, 1, 1)
+    graph.add_edge(0, 1, 2, 2)
+    assert graph.adjacency_list[0][1] == [(1, 1), (1, 1), (2, 2)]
+
+def test_add_edge_prune_dominated():
+    graph = Graph()
+    graph.add_edge(0, 1, 2, 2, prune_dominated=True)
+    graph.add_edge(0, 1, 2, 2, prune_dominated=True)
+    graph.add_edge(0, 1, 3, 3, prune_dominated=True)
+    graph.add_edge(0, 1, 1, 4, prune_dominated=True)
+    assert graph.adjacency_list[0][1] == [(2, 2), (1, 4)]
+    graph.add_edge(0, 1, 1, 1, prune_dominated=True)
+    assert graph.adjacency_list[0][1] == [(1, 1)]
+
+def test_normalize():
+    graph = Graph()
+    for cost in [(5, 1), (1, 5), (5, 5), (1, 5), (3, 3)]:
+        graph.add_edge(0, 1, *cost)
+    graph.add_edge(1, 0, 1, 1)
+    graph.normalize()
+    assert graph.adjacency_list[0][1] == [(1, 5), (3, 3), (5, 1)]
+    assert graph.adjacency_list[1][0] == [(1, 1)]
+
+def test_read_from_file_prune_dominated(tmp_path):
+    graph_file = tmp_path / "graph.txt"
+    graph_file.write_text("0 1 1 2\n0 1 2 2\n0 1 1 2\n1 2 1 1\n")
+    graph = Graph()
+    graph.read_from_file(str(graph_file), prune_dominated=True)
+    assert graph.adjacency_list[0][1] == [(1.0, 2.0)]
+
+def test_remove_edge():
+    graph = Graph()
+    graph.add_edge(0, 1, 1, 1)
+    graph.remove_edge(0, 1)
+    assert graph.get_neighbors(0) == []
+    with pytest.raises(KeyError):
+        graph.remove_edge(0, 1)
@@ -0,0 +1,65 @@
+import pytest
+from mosp_algo.bod import bod
+from mosp_algo.graph import Graph
+from mosp_algo.graph_reduction import contract_chains, expand_path
+from mosp_algo.search_tree_pqd import construct_path
+
+@pytest.fixture
+def chain_graph():
+    # 0 <-> 1 <-> 2 <-> 3 is a two-way chain, 3 -> 4 -> 5 a one-way chain, 0 -> 5 and 3 -> 6 -> 0 close the loops
+    test_graph = Graph()
+    for vertex1, vertex2, cost1, cost2 in [(0, 1, 1, 4), (1, 2, 2, 1), (2, 3, 1, 1)]:
+        test_graph.add_edge(vertex1, vertex2, cost1, cost2)
+        test_graph.add_edge(vertex2, vertex1, cost1, cost2)
+    test_graph.add_edge(1, 2, 1, 3)
+    test_graph.add_edge(3, 4, 1, 1)
+    test_graph.add_edge(4, 5, 2, 2)
+    test_graph.add_edge(0, 5, 9, 3)
+    test_graph.add_edge(3, 6, 1, 1)
+    test_graph.add_edge(6, 0, 1, 1)
+    test_graph.add_edge(6, 5, 5, 1)
+    return test_graph
+
+def test_contract_chains_removes_chain_vertices(chain_graph):
+    contracted, expansions = contract_chains(chain_graph, keep=[0, 5])
+    assert set(contracted.vertices) == {0, 3, 6}
+    assert contracted.adjacency_list[0][3] == [(3, 8), (4, 6)]
+    assert expansions[(0, 3)] == {(3, 8): [(0, 1, 1, 4), (1, 2, 1, 3), (2, 3, 1, 1)], (4, 6): [(0, 1, 1, 4), (1, 2, 2, 1), (2, 3, 1, 1)]}
+    assert contracted.adjacency_list[3][5] == [(3, 3)]
+    assert expansions[(3, 5)] == {(3, 3): [(3, 4, 1, 1), (4, 5, 2, 2)]}
+    assert 1 in chain_graph.adjacency_list[0]
+
+@pytest.mark.parametrize("source", [0, 3, 6])
+def test_contraction_keeps_fronts(chain_graph, source):
+    keep = [0, 3, 5, 6]
+    contracted, _ = contract_chains(chain_graph, keep=keep)
+    solutions = bod(chain_graph, source)
+    contracted_solutions = bod(contracted, source)
+    for target in keep:
+        assert contracted_solutions[target].get_solutions(values=True) == solutions[target].get_solutions(values=True)
+
+def test_expand_path(chain_graph):
+    contracted, expansions = contract_chains(chain_graph, keep=[0, 5])
+    solutions = bod(contracted, 0)
+    paths = {solution.solution_values: expand_path(construct_path(solution.solution_state), expansions)
+             for solution in solutions[5].get_solutions()}
+    assert paths == {(6, 11): [0, 1, 2, 3, 4, 5], (7, 9): [0, 1, 2, 3, 4, 5], (9, 3): [0, 5]}
+
+def test_keep_everything(chain_graph):
+    contracted, expansions = contract_chains(chain_graph, keep=chain_graph.vertices)
+    assert expansions == {}
+    assert contracted.get_edges() == [(v1, v2, sorted(set(costs))) for v1, v2, costs in chain_graph.get_edges()]
+
+def test_expand_path_next_to_close_parallel_edge():
+    # 1 -> 3 -> 2 is contracted next to a direct edge 1 -> 2 whose costs differ from the chain's by less
+    # than the rounding error of the large g-values
+    graph = Graph()
+    graph.add_edge(0, 1, 1e9, 1e9)
+    graph.add_edge(1, 3, 5e-4, 1e-3)
+    graph.add_edge(3, 2, 5e-4, 1e-3)
+    graph.add_edge(1, 2, 0.5, 5e-4)
+    contracted, expansions = contract_chains(graph, keep=[0, 1, 2])
+    assert 3 not in contracted.vertices
+    solutions = bod(contracted, 0)
+    paths = [expand_path(construct_path(solution.solution_state), expansions) for solution in solutions[2].get_solutions()]
+    assert sorted(paths) == [[0, 1, 2], [0, 1, 3, 2]]
@@ -0,0 +1,31 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+# Core search modules must import quickly and without the optional plotting / compiled extras,
+# since every worker process and CLI invocation pays for them.
+IMPORT_BUDGET_MS = 100
+OPTIONAL_MODULES = ("matplotlib", "networkx", "numpy", "numba")
+
+MEASURE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({{"elapsed_ms": elapsed_ms, "loaded": sorted(name for name in {optional!r} if name in sys.modules)}}))
+"""
+
+def measure_import(module):
+    source_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", MEASURE.format(module=module, optional=OPTIONAL_MODULES)],
+                            cwd=source_dir, capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+@pytest.mark.parametrize("module", ["mosp_algo.bod", "routing.bod_optimizations", "routing.greedy_routing"])
+def test_core_import_budget(module):
+    # best of three runs: the first one may pay for writing bytecode caches
+    results = [measure_import(module) for _ in range(3)]
+    assert results[0]["loaded"] == []
+    assert min(result["elapsed_ms"] for result in results) < IMPORT_BUDGET_MS
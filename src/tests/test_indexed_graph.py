@@ -0,0 +1,35 @@
+import pytest
+from mosp_algo.graph import Graph
+from mosp_algo.indexed_graph import IndexedGraph
+
+@pytest.fixture
+def named_graph():
+    test_graph = Graph()
+    test_graph.add_edge("a", "b", 1, 2)
+    test_graph.add_edge("a", "b", 2, 1)
+    test_graph.add_edge("a", "c", 4, 4)
+    test_graph.add_edge("b", "c", 1, 1)
+    return test_graph
+
+def test_freeze_interns_all_vertices(named_graph):
+    indexed_graph = named_graph.freeze()
+    assert isinstance(indexed_graph, IndexedGraph)
+    assert len(indexed_graph) == 3
+    assert indexed_graph.edges_count == 4
+    for node, index in indexed_graph.node_index.items():
+        assert indexed_graph.node_ids[index] == node
+
+def test_csr_layout(named_graph):
+    indexed_graph = named_graph.freeze()
+    a = indexed_graph.node_index["a"]
+    edges = range(indexed_graph.offsets[a], indexed_graph.offsets[a + 1])
+    assert sorted((indexed_graph.node_ids[indexed_graph.targets[e]], indexed_graph.costs1[e], indexed_graph.costs2[e]) for e in edges) == \
+        [("b", 1, 2), ("b", 2, 1), ("c", 4, 4)]
+    c = indexed_graph.node_index["c"]
+    assert indexed_graph.offsets[c] == indexed_graph.offsets[c + 1]
+
+def test_get_neighbors_matches_graph(named_graph):
+    indexed_graph = named_graph.freeze()
+    for node in named_graph.vertices:
+        assert dict(indexed_graph.get_neighbors(node)) == dict(named_graph.get_neighbors(node))
+    assert indexed_graph.get_neighbors("missing") == []
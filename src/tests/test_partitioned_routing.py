@@ -0,0 +1,82 @@
+import pytest
+from mosp_algo.bod import bod
+from routing.bod_optimizations import bod_limited
+from mosp_task_generator.topologies import corridor_topology, random_topology, ring_topology
+from routing.partitioned_routing import RegionOverlay, bfs_partition
+from tests.helpers import fronts
+
+def test_bfs_partition_covers_all_vertices(test_graph):
+    partition = bfs_partition(test_graph, 4)
+    vertices = {vertex for edge in test_graph.get_edges() for vertex in edge[:2]}
+    assert partition.keys() == vertices
+    region_sizes = {}
+    for region in partition.values():
+        region_sizes[region] = region_sizes.get(region, 0) + 1
+    assert max(region_sizes.values()) <= 4
+    assert len(region_sizes) > 1
+
+def test_bfs_partition_invalid_size(test_graph):
+    with pytest.raises(ValueError):
+        bfs_partition(test_graph, 0)
+
+@pytest.mark.parametrize("region_size", [1, 3, 5, 100])
+def test_next_hop_fronts_match_bod(test_graph, region_size):
+    overlay = RegionOverlay.build(test_graph, region_size)
+    for source in test_graph.vertices:
+        expected = bod(test_graph, source)
+        solutions = overlay.next_hop_fronts(source)
+        assert solutions.keys() == expected.keys()
+        for target in expected:
+            assert solutions[target].get_solutions(values=True) == expected[target].get_solutions(values=True)
+
+def test_next_hop_fronts_bounded(test_graph):
+    overlay = RegionOverlay.build(test_graph, 4)
+    C1, C2 = 4, 5
+    for source in test_graph.vertices:
+        expected = bod_limited(test_graph, source, C1, C2)
+        solutions = overlay.next_hop_fronts(source, C1, C2)
+        assert {target: pareto_set.get_solutions(values=True) for target, pareto_set in solutions.items()} == \
+            {target: pareto_set.get_solutions(values=True) for target, pareto_set in expected.items()}
+
+def test_next_hops_are_neighbours(test_graph):
+    overlay = RegionOverlay.build(test_graph, 3)
+    for source in test_graph.vertices:
+        neighbours = {neighbour for neighbour, _ in test_graph.get_neighbors(source)}
+        for target, pareto_set in overlay.next_hop_fronts(source).items():
+            for solution in pareto_set.get_solutions():
+                if target == source:
+                    assert solution.solution_state is None
+                else:
+                    assert solution.solution_state in neighbours
+
+def test_next_hop_front_single_target(test_graph):
+    overlay = RegionOverlay.build(test_graph, 3)
+    for source in test_graph.vertices:
+        solutions = overlay.next_hop_fronts(source, 6, 6)
+        for target in test_graph.vertices:
+            pareto_set = overlay.next_hop_front(source, target, 6, 6)
+            expected = solutions[target].get_solutions(values=True) if target in solutions else set()
+            assert pareto_set.get_solutions(values=True) == expected
+
+@pytest.mark.parametrize("seed", range(6))
+def test_next_hop_fronts_match_bod_on_generated_topologies(seed):
+    edges = [random_topology(nodes_count=40, edges_per_node=2, seed=seed, max_cost=5),
+             ring_topology(rings=4, ring_size=8, seed=seed, max_cost=5),
+             corridor_topology(corridors=3, length=12, cross_step=3, seed=seed, max_cost=5)][seed % 3]
+    graph = edges.to_graph()
+    overlay = RegionOverlay.build(graph, 2 + seed)
+    for source in sorted(graph.vertices)[::5]:
+        assert fronts(overlay.next_hop_fronts(source)) == fronts(bod(graph, source))
+        assert fronts(overlay.next_hop_fronts(source, 12, 12)) == fronts(bod_limited(graph, source, 12, 12))
+
+def test_remote_fronts_are_expanded_on_lookup():
+    graph = corridor_topology(corridors=2, length=30, cross_step=10, seed=1, max_cost=5).to_graph()
+    overlay = RegionOverlay.build(graph, 6)
+    solutions = overlay.next_hop_fronts(0)
+    expected = bod(graph, 0)
+    remote = [vertex for vertex in expected if vertex not in solutions.fronts]
+    assert remote # interior vertices of other regions are not searched
+    assert all(solutions[vertex].get_solutions(values=True) == expected[vertex].get_solutions(values=True) for vertex in remote)
+    assert "missing" not in solutions
+    with pytest.raises(KeyError):
+        solutions["missing"]
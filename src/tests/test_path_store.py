@@ -0,0 +1,52 @@
+import pytest
+from mosp_algo.path_store import ROOT, PathStore
+from mosp_algo.search_tree_pqd import construct_path
+from routing.bod_optimizations import bod_limited, bod_limited_iter, bod_limited_path_store, bod_limited_path_store_settled_states, bod_stage_1
+
+def test_path_store_shares_prefixes():
+    store = PathStore("s")
+    a = store.add(ROOT, "a", 1, 2)
+    b = store.add(a, "b", 2, 3)
+    c = store.add(a, "c", 4, 1)
+    d = store.add(ROOT, "d", 1, 1)
+    assert len(store) == 5
+    assert store.source == "s"
+    assert store.path(b) == ["s", "a", "b"]
+    assert store.path(c) == ["s", "a", "c"]
+    assert list(store.iter_reversed(c)) == ["c", "a", "s"]
+    assert [store.first_hop(entry) for entry in (ROOT, a, b, c, d)] == [None, "a", "a", "a", "d"]
+    assert (store.g1[c], store.g2[c]) == (4, 1)
+
+@pytest.mark.parametrize("C1, C2", [(float('inf'), float('inf')), (10, 10)])
+def test_path_store_search_matches_bod_limited(test_graph, C1, C2):
+    for start in test_graph.vertices:
+        expected = bod_limited(test_graph, start, C1, C2)
+        solutions, store = bod_limited_path_store(test_graph, start, C1, C2)
+        assert {node: front.get_solutions(values=True) for node, front in solutions.items()} == \
+               {node: front.get_solutions(values=True) for node, front in expected.items()}
+        expected_paths = {(node, solution.solution_values): [state.node for state in construct_path(solution.solution_state)]
+                          for node, front in expected.items() for solution in front.solutions}
+        for node, front in solutions.items():
+            for solution in front.solutions:
+                path_entry = solution.solution_state
+                path = path_entry.path()
+                assert path == expected_paths[(node, solution.solution_values)]
+                assert [state.node for state in construct_path(path_entry)] == path
+                assert path_entry.next_node_in_path == store.first_hop(path_entry.entry) == (path[1] if len(path) > 1 else None)
+
+def test_path_store_first_hops_match_stage_1(test_graph):
+    solutions, _ = bod_limited_path_store(test_graph, 0, 10, 10)
+    stage_1 = bod_stage_1(test_graph, 0, 10, 10)
+    for node, front in stage_1.items():
+        expected = {solution.solution_values: solution.solution_state.next_node_in_path for solution in front.solutions}
+        assert {solution.solution_values: solution.solution_state.next_node_in_path for solution in solutions[node].solutions} == expected
+
+def test_settled_states_stream_into_store(test_graph):
+    store = PathStore(0)
+    entries = list(bod_limited_path_store_settled_states(test_graph, 0, 10, 10, store))
+    assert len(entries) == len(store)
+    assert entries[0].entry == ROOT and entries[0].parent is None
+    assert {(entry.node, entry.g1, entry.g2) for entry in entries} == \
+           {(node, g1, g2) for node, g1, g2, _ in bod_limited_iter(test_graph, 0, 10, 10)}
+    with pytest.raises(ValueError):
+        next(bod_limited_path_store_settled_states(test_graph, 0, 10, 10, store))
@@ -0,0 +1,54 @@
+import pytest
+from routing.bod_optimizations import bod_stage_2
+from routing.modeling_routing import make_routing_table, reverse_graph
+from routing.reachability import ReachabilityIndex
+
+@pytest.mark.parametrize("C1, C2", [(float('inf'), float('inf')), (10, 10), (4, 6)])
+def test_index_matches_bounded_searches(test_graph, C1, C2):
+    index = ReachabilityIndex.build(test_graph, C1, C2)
+    reversed_graph = reverse_graph(test_graph)
+    for node in test_graph.vertices:
+        assert set(index.reachable_from(node)) == set(bod_stage_2(test_graph, node, C1, C2).keys())
+        assert set(index.senders_to(node)) == set(bod_stage_2(reversed_graph, node, C1, C2).keys())
+        for other in test_graph.vertices:
+            assert index.can_reach(node, other) == (other in index.reachable_from(node))
+
+def test_unknown_nodes_reach_nothing(test_graph):
+    index = ReachabilityIndex.build(test_graph, 10, 10)
+    assert not index.can_reach(0, "missing")
+    assert index.reachable_from("missing") == []
+    assert index.senders_to("missing") == []
+
+def test_save_load_roundtrip(test_graph, tmp_path):
+    index = ReachabilityIndex.build(test_graph, 10, 10)
+    file_path = str(tmp_path / "reach.idx")
+    index.save(file_path)
+    with ReachabilityIndex.load(file_path) as loaded:
+        assert (loaded.C1, loaded.C2) == (10, 10)
+        assert loaded.pairs_count == index.pairs_count
+        for node in test_graph.vertices:
+            assert loaded.reachable_from(node) == index.reachable_from(node)
+            assert loaded.senders_to(node) == index.senders_to(node)
+            for other in test_graph.vertices:
+                assert loaded.can_reach(node, other) == index.can_reach(node, other)
+    assert loaded._mmap is None
+    assert loaded.reachable_from(0) == []
+
+def test_load_rejects_other_files(tmp_path):
+    file_path = tmp_path / "other.bin"
+    file_path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        ReachabilityIndex.load(str(file_path))
+
+def test_modeling_table_with_index(test_graph):
+    index = ReachabilityIndex.build(test_graph, 10, 10)
+    for node in test_graph.vertices:
+        assert make_routing_table(test_graph, node, 10, 10, reachability_index=index) == make_routing_table(test_graph, node, 10, 10)
+    with pytest.raises(ValueError):
+        make_routing_table(test_graph, 0, 5, 5, reachability_index=index)
+
+def test_size_follows_reachable_pairs(test_graph):
+    bounded = ReachabilityIndex.build(test_graph, 4, 6)
+    unbounded = ReachabilityIndex.build(test_graph, float('inf'), float('inf'))
+    assert bounded.pairs_count == sum(len(bounded.reachable_from(node)) for node in test_graph.vertices)
+    assert bounded.pairs_count < unbounded.pairs_count
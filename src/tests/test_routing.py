@@ -1,6 +1,7 @@
 import pytest
 from mosp_algo.graph import Graph
 from mosp_algo.pareto_set import BiObjSolution, ParetoSet
+from routing.bod_optimizations import bod_limited, bod_limited_iter, bod_stage_1_iter, bod_stage_2_iter
 
 @pytest.fixture
 def test_graph():
@@ -17,3 +18,20 @@ def test_bi_obj_solution():
     assert solution1.is_dominated_by(solution2) is True
     assert solution2.is_dominated_by(solution1) is False
     assert solution1 != solution2
+
+def test_bod_limited_iter_matches_bod_limited(simple_graph):
+    solutions = bod_limited(simple_graph, 0, 6, 8)
+    streamed = {}
+    for node, g1, g2, _ in bod_limited_iter(simple_graph, 0, 6, 8):
+        streamed.setdefault(node, set()).add((g1, g2))
+    assert streamed == {node: solutions[node].get_solutions(values=True) for node in solutions}
+    assert streamed[1] == {(4, 7), (3, 8)}
+
+def test_bod_stage_1_iter_next_hop(simple_graph):
+    next_hops = {(node, g1, g2): next_hop for node, g1, g2, next_hop in bod_stage_1_iter(simple_graph, 0, 10, 10)}
+    assert next_hops[(0, 0, 0)] is None
+    assert next_hops[(1, 7, 2)] == 4
+    assert next_hops[(1, 3, 8)] == 2
+
+def test_bod_stage_2_iter_reachable(simple_graph):
+    assert {node for node, _, _, _ in bod_stage_2_iter(simple_graph, 0, 1, 5)} == {0, 2}
@@ -0,0 +1,188 @@
+import os
+import random
+import pytest
+from mosp_algo.bod import bod, bod_settled_states
+from mosp_algo.search_tree_pqd import SearchTreePQD, State, construct_path
+from mosp_algo.search_tree_spilling import SpillingSearchTree
+from mosp_task_generator.topologies import random_topology
+from routing.bod_optimizations import StateStage_1, bod_limited, bod_limited_path_store, bod_stage_1, bod_stage_2, bod_stage_3
+from tests.helpers import fronts
+
+def recording(search_tree_cls):
+    class RecordingSearchTree(search_tree_cls):
+        instances = []
+
+        def __init__(self):
+            super().__init__()
+            RecordingSearchTree.instances.append(self)
+
+    return RecordingSearchTree
+
+def test_pops_in_priority_order(tmp_path):
+    rng = random.Random(0)
+    search_tree = SpillingSearchTree.configured(10, tmp_dir=str(tmp_path), max_runs=3)()
+    parent = State(node="root", g1=0, g2=0)
+    keys = []
+    for node in range(500):
+        key = (rng.randint(0, 50), rng.randint(0, 50))
+        keys.append(key)
+        search_tree.add_to_open(State(node=node, g1=key[0], g2=key[1], parent=parent if node % 2 else None))
+    assert len(search_tree.open) <= 10 and search_tree.spilled_states > 0
+    assert len(search_tree) == 500
+    popped = []
+    while not search_tree.open_is_empty():
+        state = search_tree.get_best_node_from_open()
+        assert state.parent is (parent if state.node % 2 else None)
+        popped.append((state.f1, state.f2))
+    assert popped == sorted(keys)
+    assert search_tree.get_best_node_from_open() is None
+    assert not search_tree.runs
+    assert search_tree.interned_values == 0
+
+def test_interned_values_are_dropped_when_read_back():
+    search_tree = SpillingSearchTree(max_states_in_memory=4)
+    parents = [State(node=f"parent{index}", g1=0, g2=0) for index in range(10)]
+    for value in range(40):
+        search_tree.add_to_open(State(node=value % 5, g1=value, g2=value, parent=parents[value % 10]))
+    assert search_tree.spilled_states > 0
+    assert search_tree.interned_values <= 5 + 10
+    while not search_tree.open_is_empty():
+        search_tree.get_best_node_from_open()
+        spilled = sum(len(run) for run in search_tree.runs.values())
+        assert search_tree.interned_values <= 2 * spilled
+    assert search_tree.interned_values == 0
+
+def test_close_drops_runs_and_interned_values():
+    with SpillingSearchTree(max_states_in_memory=4) as search_tree:
+        for value in range(20):
+            search_tree.add_to_open(State(node=value, g1=value, g2=value, parent=State(node="root", g1=0, g2=0)))
+        assert search_tree.runs and search_tree.interned_values
+    assert not search_tree.runs and search_tree.interned_values == 0
+
+def test_searches_close_their_search_tree():
+    graph = random_topology(nodes_count=150, edges_per_node=3, seed=5, max_cost=20).to_graph()
+    search_tree_cls = recording(SpillingSearchTree.configured(16, max_runs=2, block_records=2))
+    states = bod_settled_states(graph, 0, search_tree_cls)
+    next(states)
+    search_tree = search_tree_cls.instances[0]
+    while not search_tree.runs:
+        next(states)
+    states.close()
+    assert not search_tree.runs and search_tree.interned_values == 0
+
+def test_remove_worse_states_filters_spilled():
+    search_tree = SpillingSearchTree(max_states_in_memory=4)
+    for value in range(20):
+        search_tree.add_to_open(State(node=value, g1=value, g2=value))
+    search_tree.remove_worse_states(5, 5)
+    popped = []
+    while not search_tree.open_is_empty():
+        state = search_tree.get_best_node_from_open()
+        if state is not None:
+            popped.append(state.node)
+    assert popped == [0, 1, 2, 3, 4, 5]
+
+def test_bod_limited_with_spilling_matches(test_graph, tmp_path):
+    search_tree_cls = recording(SpillingSearchTree.configured(4, tmp_dir=str(tmp_path)))
+    for start in test_graph.vertices:
+        assert fronts(bod_limited(test_graph, start, 10, 10, search_tree_cls)) == fronts(bod_limited(test_graph, start, 10, 10))
+    assert any(search_tree.spilled_states for search_tree in search_tree_cls.instances)
+    assert os.listdir(str(tmp_path)) == []
+
+def test_bod_with_spilling_and_merged_runs():
+    graph = random_topology(nodes_count=150, edges_per_node=3, seed=5, max_cost=20).to_graph()
+    search_tree_cls = recording(SpillingSearchTree.configured(16, max_runs=2, block_records=2))
+    solutions = bod(graph, 0, search_tree_cls)
+    assert fronts(solutions) == fronts(bod(graph, 0))
+    assert search_tree_cls.instances[0].spilled_states > 0
+    for pareto_set in solutions.values():
+        for solution in pareto_set.solutions:
+            assert construct_path(solution.solution_state)[0].node == 0
+
+def test_stage_states_keep_their_links():
+    search_tree = SpillingSearchTree(max_states_in_memory=4)
+    for value in range(20):
+        search_tree.add_to_open(StateStage_1(node=value, g1=value, g2=value, next_node_in_path=None if value == 0 else f"hop{value % 3}"))
+        search_tree.add_to_open(State(node=value, g1=value, g2=value + 0.5))
+    assert search_tree.spilled_states > 0
+    popped = []
+    while not search_tree.open_is_empty():
+        popped.append(search_tree.get_best_node_from_open())
+    assert [type(state) for state in popped] == [StateStage_1, State] * 20
+    assert [state.next_node_in_path for state in popped[::2]] == [None] + [f"hop{value % 3}" for value in range(1, 20)]
+    assert search_tree.interned_values == 0
+
+def test_unregistered_states_are_rejected():
+    class UnknownState(State):
+        pass
+
+    search_tree = SpillingSearchTree(max_states_in_memory=4)
+    with pytest.raises(TypeError):
+        for value in range(5):
+            search_tree.add_to_open(UnknownState(node=value, g1=value, g2=value))
+
+def first_hops(solutions):
+    # next hop kept by the state classes that keep one (next_node of stage #3 is the hop after its target)
+    return {node: {(solution.g1, solution.g2, getattr(solution.solution_state, "next_node_in_path", None),
+                    getattr(solution.solution_state, "next_node", None)) for solution in pareto_set.solutions}
+            for node, pareto_set in solutions.items()}
+
+@pytest.mark.parametrize("search", [
+    lambda graph, search_tree_cls: bod_stage_1(graph, 0, 60, 60, search_tree_cls),
+    lambda graph, search_tree_cls: bod_stage_2(graph, 0, 60, 60, search_tree_cls),
+    lambda graph, search_tree_cls: bod_stage_3(graph, 0, 60, 60, 1, search_tree_cls),
+    lambda graph, search_tree_cls: bod_limited_path_store(graph, 0, 60, 60, search_tree_cls)[0],
+])
+def test_stage_searches_with_spilling_match(search):
+    graph = random_topology(nodes_count=150, edges_per_node=3, seed=5, max_cost=20).to_graph()
+    search_tree_cls = recording(SpillingSearchTree.configured(16, max_runs=2, block_records=2))
+    solutions, expected = search(graph, search_tree_cls), search(graph, SearchTreePQD)
+    assert search_tree_cls.instances[0].spilled_states > 0
+    assert first_hops(solutions) == first_hops(expected)
+
+def test_memory_cap_validation():
+    with pytest.raises(ValueError):
+        SpillingSearchTree(max_states_in_memory=3)
+    with pytest.raises(ValueError):
+        SpillingSearchTree.configured(100, block_records=30)()
+    with pytest.raises(TypeError):
+        SpillingSearchTree.configured(100, block_size=30)
+
+def capped(search_tree_cls):
+    class CappedSearchTree(search_tree_cls):
+        peak_resident_states = 0
+
+        def _track(self):
+            CappedSearchTree.peak_resident_states = max(CappedSearchTree.peak_resident_states, self.resident_states)
+
+        def add_to_open(self, state):
+            super().add_to_open(state)
+            self._track()
+
+        def get_best_node_from_open(self):
+            state = super().get_best_node_from_open()
+            self._track()
+            return state
+
+    return CappedSearchTree
+
+@pytest.mark.parametrize("cap", [4, 20, 200])
+def test_resident_states_stay_within_cap(cap):
+    graph = random_topology(nodes_count=600, edges_per_node=4, seed=3, max_cost=50).to_graph()
+    search_tree_cls = recording(capped(SpillingSearchTree.configured(cap)))
+    assert fronts(bod(graph, 0, search_tree_cls)) == fronts(bod(graph, 0))
+    search_tree = search_tree_cls.instances[0]
+    assert search_tree.spilled_states > 0
+    assert 0 < search_tree_cls.peak_resident_states <= cap
+
+def test_runs_are_not_read_before_needed():
+    search_tree = SpillingSearchTree(max_states_in_memory=8)
+    for value in range(40):
+        search_tree.add_to_open(State(node=value, g1=value, g2=value))
+        assert search_tree.resident_states <= 8
+    assert search_tree.runs and all(run.buffered == 0 for run in search_tree.runs.values())
+    popped = []
+    while not search_tree.open_is_empty():
+        popped.append(search_tree.get_best_node_from_open().node)
+        assert search_tree.resident_states <= 8
+    assert popped == list(range(40))
@@ -0,0 +1,81 @@
+import pytest
+from mosp_algo.bod import bod
+from mosp_algo.graph import Graph
+from mosp_task_generator.builders import (Node, RandomTestsBuilder, TestBuildDirector, TopologyTestBuilder,
+                                          format_solutions, reference_pareto_set)
+from mosp_task_generator.topologies import TOPOLOGIES, bridge_topology, corridor_topology, random_topology, ring_topology
+
+def test_ring_topology():
+    edges = ring_topology(3, 4, seed=1)
+    assert edges.nodes_count == 12
+    assert len(edges) == 2 * (12 + 8)
+    graph = edges.to_graph()
+    assert {neighbour for neighbour, _ in graph.get_neighbors(5)} == {4, 6, 1, 9}
+    assert graph.adjacency_list[5][6] == graph.adjacency_list[6][5]
+
+def test_corridor_topology():
+    edges = corridor_topology(3, 5, cross_step=2, seed=1)
+    assert edges.nodes_count == 15
+    assert len(edges) == 2 * (3 * 4 + 2 * 3)
+
+def test_random_topology_has_no_self_loops():
+    edges = random_topology(50, 3, seed=7)
+    assert len(edges) == 150
+    assert all(source != target for source, target in zip(edges.sources, edges.targets))
+    assert all(1 <= cost <= 100 for cost in edges.costs1)
+
+def test_bridge_topology_connects_clusters():
+    edges = bridge_topology(20, 2, bridges=2, seed=3)
+    crossing = [(s, t) for s, t in zip(edges.sources, edges.targets) if (s < 20) != (t < 20)]
+    assert len(crossing) == 4
+
+@pytest.mark.parametrize("topology", list(TOPOLOGIES))
+def test_topologies_are_seeded(topology):
+    params = {"ring": dict(rings=2, ring_size=5), "corridor": dict(corridors=2, length=5),
+              "bridge": dict(cluster_size=5, edges_per_node=2), "random": dict(nodes_count=10, edges_per_node=2)}[topology]
+    first, second = TOPOLOGIES[topology](seed=5, **params), TOPOLOGIES[topology](seed=5, **params)
+    assert (first.sources, first.targets, first.costs1, first.costs2) == (second.sources, second.targets, second.costs1, second.costs2)
+
+def test_text_and_binary_files_match(tmp_path):
+    edges = ring_topology(2, 6, seed=2)
+    edges.write_text(str(tmp_path / "map.txt"))
+    edges.write_binary(str(tmp_path / "map.bin"))
+    text_graph, binary_graph = Graph(), Graph()
+    text_graph.read_from_file(str(tmp_path / "map.txt"))
+    binary_graph.read_from_binary_file(str(tmp_path / "map.bin"))
+    assert text_graph.get_edges() == binary_graph.get_edges() == edges.to_graph().get_edges()
+
+def test_reference_pareto_set_matches_bod():
+    graph = ring_topology(3, 5, seed=4).to_graph()
+    assert reference_pareto_set(graph, 0, 12).get_solutions(values=True) == bod(graph, 0)[12].get_solutions(values=True)
+    assert reference_pareto_set(graph, 0, 100).solutions == set()
+
+def test_format_solutions():
+    graph = Graph()
+    graph.add_edge(0, 1, 1, 2)
+    graph.add_edge(1, 2, 1, 2)
+    graph.add_edge(0, 2, 5, 1)
+    assert format_solutions(0, 2, reference_pareto_set(graph, 0, 2)) == "0 2 2\n2 4 0 1 2\n5 1 0 2"
+
+def test_random_tests_builder():
+    builder = RandomTestsBuilder(None, 8, 3, seed=1)
+    text = TestBuildDirector(builder).construct_test()
+    start, stop, solutions_count = map(int, text.splitlines()[0].split())
+    graph = builder.nodes_group.to_graph()
+    assert solutions_count == len(bod(graph, start)[stop].solutions)
+    assert builder.get_test() == text
+    with pytest.raises(ValueError):
+        builder.nodes_group.add_edge(Node(100), Node(0), 1, 1)
+
+def test_topology_test_builder(tmp_path):
+    output_file = str(tmp_path / "corridor.txt")
+    builder = TopologyTestBuilder(output_file, "corridor", dict(corridors=3, length=6), solutions_count=2, seed=9)
+    TestBuildDirector(builder).construct_test()
+    graph = Graph()
+    graph.read_from_file(output_file)
+    assert len(graph.get_edges()) == len(builder.edges)
+    lines = open(f"{output_file}.solutions").read().splitlines()
+    start, stop, solutions_count = map(int, lines[0].split())
+    assert solutions_count == len(bod(graph, start)[stop].solutions)
+    with pytest.raises(ValueError):
+        TopologyTestBuilder(output_file, "unknown", {})
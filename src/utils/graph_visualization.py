@@ -1,5 +1,9 @@
-import matplotlib.pyplot as plt
-import networkx as nx
+# Optional visualization extra: needs matplotlib and networkx, which the search modules never import.
+try:
+    import matplotlib.pyplot as plt
+    import networkx as nx
+except ImportError as e:
+    raise ImportError("utils.graph_visualization requires matplotlib and networkx") from e
 
 
 def visualize_graph(graph: dict):